@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, fields
+from typing import AsyncIterator
+
+
+class Overloaded(Exception):
+    pass
+
+
+@dataclass(kw_only=True)
+class AdmissionController:
+    """Webhook write limiter: `max_concurrent` at a time, `max_queue` waiting, then Overloaded."""
+
+    max_concurrent: int
+    max_queue: int
+    queue_timeout_seconds: float
+    in_flight: int = 0
+    waiting: int = 0
+    admitted: int = 0
+    queued: int = 0
+    shed_queue_full: int = 0
+    shed_timeout: int = 0
+    _slots: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.max_concurrent = max(1, int(self.max_concurrent))
+        self.max_queue = max(0, int(self.max_queue))
+        self.queue_timeout_seconds = max(0.0, float(self.queue_timeout_seconds))
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+
+    async def _wait_for_slot(self) -> None:
+        if self.waiting >= self.max_queue:
+            self.shed_queue_full += 1
+            raise Overloaded()
+        self.waiting += 1
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.shed_timeout += 1
+            raise Overloaded() from None
+        finally:
+            self.waiting -= 1
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self._slots.locked():
+            await self._wait_for_slot()
+        else:
+            await self._slots.acquire()
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def snapshot(self) -> dict[str, int]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.type == "int"}
@@ -1,32 +1,37 @@
 from __future__ import annotations
 
+import math
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 from passlib.context import CryptContext
 
-from lib.db import create_user, get_user_by_username, init_db, log_event, set_last_login
+from lib.db import (
+    create_user,
+    create_users_bulk,
+    get_user_by_username,
+    init_db,
+    log_event,
+    set_last_login,
+)
+from lib.env import env_int
 
 
 _pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
 
-JWT_SECRET=4ZLLHrpUTb0Bm6I7ffhHRYdFMzjHvwL7KJdWJ_YKz0A
-JWT_ALGORITHM=HS256
-ACCESS_TOKEN_EXPIRE_MINUTES=720
+ADMIN_USERNAME = (os.getenv("ADMIN_USERNAME") or "admin").strip().lower()
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD") or ""
+# Processes used to hash passwords for bulk user creation; 0 means one per CPU.
+PASSWORD_HASH_WORKERS = env_int("PASSWORD_HASH_WORKERS", 0)
 
-# ---- Backend ----
-DATABASE_URL=sqlite:///./data/app.db
-ENFORCE_TWILIO_SIGNATURE=true
-TWILIO_AUTH_TOKEN=bad654727fb4fe072b957622e98cd5ce
-OTP_VISIBILITY_MINUTES=10
+_ROLES = {"user", "admin"}
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
 
-# Bootstrap initial admin on first backend start
-ADMIN_USERNAME=admin
-ADMIN_PASSWORD=admin123!CHANGE-ME
-ADMIN_EMAIL=
 
-# Optional: if you want Streamlit to know where the API is
-API_BASE_URL=http://127.0.0.1:8000
 def hash_password(password: str) -> str:
     return _pwd_context.hash(password)
 
@@ -35,6 +40,71 @@ def verify_password(password: str, password_hash: str) -> bool:
     return _pwd_context.verify(password, password_hash)
 
 
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hashes in input order; batches go to a process pool."""
+    global _hash_pool
+    workers = PASSWORD_HASH_WORKERS if PASSWORD_HASH_WORKERS > 0 else (os.cpu_count() or 1)
+    if len(passwords) < 2 or workers <= 1:
+        return [hash_password(p) for p in passwords]
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Spawned, not forked: Streamlit's server process runs many threads.
+            _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    chunksize = max(1, math.ceil(len(passwords) / (workers * 4)))
+    return list(_hash_pool.map(hash_password, passwords, chunksize=chunksize))
+
+
+def bulk_create_users(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """One result per row (created/exists/duplicate/invalid); all inserts in one transaction."""
+    results: list[dict[str, Any]] = []
+    pending: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for i, r in enumerate(rows, start=1):
+        username = str(r.get("username") or "").strip().lower()
+        password = str(r.get("password") or "")
+        role = str(r.get("role") or "user").strip().lower()
+        result = {"row": i, "username": username, "status": "invalid", "id": None, "detail": None}
+        results.append(result)
+        if not username or not password:
+            result["detail"] = "Username and password are required"
+        elif role not in _ROLES:
+            result["detail"] = f"Unknown role '{role}'"
+        elif username in seen:
+            result["status"] = "duplicate"
+            result["detail"] = "Repeated in this upload"
+        elif get_user_by_username(username) is not None:
+            result["status"] = "exists"
+            result["detail"] = "Username already taken"
+        else:
+            seen.add(username)
+            pending.append(
+                {"result": result, "username": username, "email": r.get("email"), "role": role, "password": password}
+            )
+
+    hashes = hash_passwords([p["password"] for p in pending])
+    ids = create_users_bulk(
+        [
+            {"username": p["username"], "email": p["email"], "role": p["role"], "password_hash": h}
+            for p, h in zip(pending, hashes)
+        ]
+    )
+    for p, user_id in zip(pending, ids):
+        if user_id is None:
+            # Created by someone else since the check above.
+            p["result"].update(status="exists", detail="Username already taken")
+        else:
+            p["result"].update(status="created", id=user_id)
+
+    created = [r["username"] for r in results if r["status"] == "created"]
+    log_event(
+        level="info",
+        event_type="bulk_create_users",
+        message=f"Created {len(created)} of {len(rows)} users.",
+        context={"requested": len(rows), "created": len(created), "usernames": created},
+    )
+    return results
+
+
 def ensure_bootstrap_admin() -> None:
     init_db()
 
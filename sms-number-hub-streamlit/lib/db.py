@@ -3,11 +3,15 @@ from __future__ import annotations
 import json
 import re
 import sqlite3
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
+import pandas as pd
+
 
 DB_PATH = Path(__file__).resolve().parent.parent / "data" / "app.db"
 
@@ -133,6 +137,8 @@ def init_db() -> None:
                 is_read INTEGER NOT NULL DEFAULT 0,
                 otp_code TEXT,
                 raw_payload TEXT,
+                store_tag TEXT,
+                purpose_tag TEXT,
                 FOREIGN KEY(number_id) REFERENCES numbers(id) ON DELETE SET NULL,
                 UNIQUE(provider, provider_message_sid)
             )
@@ -151,13 +157,51 @@ def init_db() -> None:
             """
         )
 
+        sms_columns = {r["name"] for r in conn.execute("PRAGMA table_info(sms_messages)")}
+        if "store_tag" not in sms_columns:
+            conn.execute("ALTER TABLE sms_messages ADD COLUMN store_tag TEXT")
+            conn.execute("ALTER TABLE sms_messages ADD COLUMN purpose_tag TEXT")
+            conn.execute(
+                """
+                UPDATE sms_messages
+                SET
+                    store_tag = (SELECT t.store_tag FROM phone_number_tags t WHERE t.number_id = sms_messages.number_id),
+                    purpose_tag = (SELECT t.purpose_tag FROM phone_number_tags t WHERE t.number_id = sms_messages.number_id)
+                WHERE number_id IS NOT NULL
+                """
+            )
+
+        # Foreign keys are only enforced on the init connection, so a deleted number's messages
+        # are detached, and their tags cleared, by trigger rather than by ON DELETE SET NULL.
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_numbers_delete_detach_messages
+            AFTER DELETE ON numbers
+            BEGIN
+                UPDATE sms_messages SET number_id = NULL, store_tag = NULL, purpose_tag = NULL
+                WHERE number_id = OLD.id;
+                DELETE FROM phone_number_tags WHERE number_id = OLD.id;
+            END
+            """
+        )
+        conn.execute(
+            """
+            UPDATE sms_messages SET number_id = NULL, store_tag = NULL, purpose_tag = NULL
+            WHERE number_id IS NOT NULL AND number_id NOT IN (SELECT id FROM numbers)
+            """
+        )
+
         conn.execute("CREATE INDEX IF NOT EXISTS idx_sms_received_at ON sms_messages(received_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_sms_to_number ON sms_messages(to_number)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_sms_number_id ON sms_messages(number_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sms_store_tag ON sms_messages(store_tag, received_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sms_purpose_tag ON sms_messages(purpose_tag, received_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_user_numbers_user_id ON user_phone_numbers(user_id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_user_numbers_number_id ON user_phone_numbers(number_id)")
         conn.commit()
 
+    _column_dtypes.cache_clear()
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -170,6 +214,66 @@ def fetch_all(query: str, params: Iterable[Any] | None = None) -> list[dict[str,
         return [dict(r) for r in rows]
 
 
+@lru_cache(maxsize=1)
+def _column_dtypes() -> dict[str, str]:
+    """Map column names to pandas dtypes from the declared SQLite schema.
+
+    Names declared with conflicting storage types across tables are left out so
+    pandas infers them; a column nullable in any table gets a nullable dtype.
+    """
+    declared: dict[str, tuple[str, bool] | None] = {}
+    with _connect() as conn:
+        tables = [
+            r["name"]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        for table in tables:
+            for col in conn.execute(f"PRAGMA table_info({table})"):
+                decl = str(col["type"] or "").upper()
+                base = "INTEGER" if "INT" in decl else "REAL" if decl in {"REAL", "FLOAT", "DOUBLE"} else "TEXT"
+                nullable = not (int(col["notnull"]) or int(col["pk"]))
+                prev = declared.get(col["name"], (base, nullable))
+                if prev is None or prev[0] != base:
+                    declared[col["name"]] = None
+                else:
+                    declared[col["name"]] = (base, prev[1] or nullable)
+
+    dtypes: dict[str, str] = {}
+    for name, spec in declared.items():
+        if spec is None:
+            continue
+        base, nullable = spec
+        if base == "INTEGER":
+            dtypes[name] = "Int64" if nullable else "int64"
+        elif base == "REAL":
+            dtypes[name] = "float64"
+        else:
+            dtypes[name] = "object"
+    return dtypes
+
+
+def fetch_frame(query: str, params: Iterable[Any] | None = None) -> pd.DataFrame:
+    """Run a query and build a DataFrame column-wise from the raw cursor tuples."""
+    with _connect() as conn:
+        conn.row_factory = None
+        cur = conn.execute(query, tuple(params or ()))
+        names = [d[0] for d in cur.description or ()]
+        rows = cur.fetchall()
+
+    dtypes = _column_dtypes()
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    data: dict[str, pd.Series] = {}
+    for name, values in zip(names, columns):
+        dtype = dtypes.get(name)
+        try:
+            data[name] = pd.Series(values, dtype=dtype)
+        except (TypeError, ValueError):
+            data[name] = pd.Series(values)
+    return pd.DataFrame(data, columns=names)
+
+
 def execute(query: str, params: Iterable[Any] | None = None) -> int:
     with _connect() as conn:
         cur = conn.execute(query, tuple(params or ()))
@@ -264,27 +368,57 @@ def delete_row(table: str, row_id: int) -> None:
         "app_events",
     }:
         raise ValueError("Invalid table")
+    tagged_number_id = None
+    if table == "phone_number_tags":
+        rows = fetch_all("SELECT number_id FROM phone_number_tags WHERE id = ?", (int(row_id),))
+        tagged_number_id = rows[0]["number_id"] if rows else None
     execute(f"DELETE FROM {table} WHERE id = ?", (int(row_id),))
+    if tagged_number_id is not None:
+        _start_tag_fan_out(int(tagged_number_id))
+
+
+_PEOPLE_QUERY = "SELECT * FROM people ORDER BY name"
+_NUMBERS_QUERY = "SELECT * FROM numbers ORDER BY e164"
+_STORE_ACCOUNTS_QUERY = (
+    "SELECT * FROM store_accounts ORDER BY platform, COALESCE(store_name, ''), COALESCE(store_id, '')"
+)
 
 
 def get_people() -> list[dict[str, Any]]:
-    return fetch_all("SELECT * FROM people ORDER BY name")
+    return fetch_all(_PEOPLE_QUERY)
+
+
+def get_people_frame() -> pd.DataFrame:
+    return fetch_frame(_PEOPLE_QUERY)
 
 
 def get_numbers() -> list[dict[str, Any]]:
-    return fetch_all("SELECT * FROM numbers ORDER BY e164")
+    return fetch_all(_NUMBERS_QUERY)
+
+
+def get_numbers_frame() -> pd.DataFrame:
+    return fetch_frame(_NUMBERS_QUERY)
 
 
 def get_store_accounts() -> list[dict[str, Any]]:
-    return fetch_all(
-        "SELECT * FROM store_accounts ORDER BY platform, COALESCE(store_name, ''), COALESCE(store_id, '')"
-    )
+    return fetch_all(_STORE_ACCOUNTS_QUERY)
+
+
+def get_store_accounts_frame() -> pd.DataFrame:
+    return fetch_frame(_STORE_ACCOUNTS_QUERY)
 
 
 def get_assignments(active_only: bool = True) -> list[dict[str, Any]]:
+    return fetch_all(_assignments_query(active_only))
+
+
+def get_assignments_frame(active_only: bool = True) -> pd.DataFrame:
+    return fetch_frame(_assignments_query(active_only))
+
+
+def _assignments_query(active_only: bool) -> str:
     where = "WHERE a.is_active = 1" if active_only else ""
-    return fetch_all(
-        f"""
+    return f"""
         SELECT
             a.id,
             a.purpose,
@@ -305,7 +439,6 @@ def get_assignments(active_only: bool = True) -> list[dict[str, Any]]:
         {where}
         ORDER BY a.is_active DESC, p.name, s.platform
         """
-    )
 
 
 def export_all() -> dict[str, list[dict[str, Any]]]:
@@ -406,6 +539,38 @@ def import_table(table: str, rows: list[dict[str, Any]]) -> None:
 
         conn.commit()
 
+    if table == "numbers":
+        # Messages already pointing at an imported id take that number's current tags.
+        for number_id in {int(r["id"]) for r in rows if r.get("id") is not None}:
+            _start_tag_fan_out(number_id)
+
+
+def apply_number_sync(inserts: list[dict[str, Any]], updates: list[dict[str, Any]]) -> tuple[int, int]:
+    """Apply a provider inventory diff in one transaction. Returns (inserted, updated).
+
+    Inserts skip numbers that appeared since the diff was computed.
+    """
+    now = _now_iso()
+    with _connect() as conn:
+        cur = conn.executemany(
+            """
+            INSERT OR IGNORE INTO numbers (e164, provider, country, capabilities, status, notes, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (r["e164"], r.get("provider"), r.get("country"), r.get("capabilities"), r["status"], r.get("notes"), now)
+                for r in inserts
+            ],
+        )
+        inserted = max(cur.rowcount, 0)
+        cur = conn.executemany(
+            "UPDATE numbers SET e164 = ?, provider = ?, capabilities = ?, status = ? WHERE id = ?",
+            [(r["e164"], r["provider"], r.get("capabilities"), r["status"], int(r["id"])) for r in updates],
+        )
+        updated = max(cur.rowcount, 0)
+        conn.commit()
+    return inserted, updated
+
 
 def log_event(level: str, event_type: str, message: str, context: dict[str, Any] | None = None) -> int:
     return execute(
@@ -428,6 +593,11 @@ def get_events(limit: int = 200) -> list[dict[str, Any]]:
     return fetch_all("SELECT * FROM app_events ORDER BY id DESC LIMIT ?", (limit,))
 
 
+def get_events_frame(limit: int = 200) -> pd.DataFrame:
+    limit = max(1, min(int(limit), 2000))
+    return fetch_frame("SELECT * FROM app_events ORDER BY id DESC LIMIT ?", (limit,))
+
+
 def create_user(username: str, email: str | None, role: str, password_hash: str) -> int:
     return execute(
         """
@@ -444,6 +614,30 @@ def create_user(username: str, email: str | None, role: str, password_hash: str)
     )
 
 
+def create_users_bulk(users: list[dict[str, Any]]) -> list[int | None]:
+    """Insert users in one transaction; returns each new id, or None where the username exists."""
+    now = _now_iso()
+    ids: list[int | None] = []
+    with _connect() as conn:
+        for u in users:
+            cur = conn.execute(
+                """
+                INSERT OR IGNORE INTO users (username, email, role, password_hash, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    u["username"].strip().lower(),
+                    (u.get("email") or "").strip() or None,
+                    u["role"].strip().lower(),
+                    u["password_hash"],
+                    now,
+                ),
+            )
+            ids.append(int(cur.lastrowid) if cur.rowcount == 1 else None)
+        conn.commit()
+    return ids
+
+
 def get_user_by_username(username: str) -> dict[str, Any] | None:
     rows = fetch_all(
         "SELECT * FROM users WHERE username = ? LIMIT 1", (username.strip().lower(),)
@@ -461,6 +655,13 @@ def list_users(active_only: bool = True) -> list[dict[str, Any]]:
     return fetch_all(f"SELECT * FROM users {where} ORDER BY username")
 
 
+def list_users_frame(active_only: bool = True) -> pd.DataFrame:
+    where = "WHERE is_active = 1" if active_only else ""
+    return fetch_frame(
+        f"SELECT id, username, email, role, is_active, created_at, last_login_at FROM users {where} ORDER BY username"
+    )
+
+
 def set_user_active(user_id: int, is_active: bool) -> None:
     execute("UPDATE users SET is_active = ? WHERE id = ?", (1 if is_active else 0, int(user_id)))
 
@@ -521,6 +722,8 @@ def get_number_users(number_id: int, active_only: bool = True) -> list[dict[str,
 
 
 def set_number_tags(number_id: int, store_tag: str | None, purpose_tag: str | None) -> None:
+    store_tag = (store_tag or "").strip() or None
+    purpose_tag = (purpose_tag or "").strip() or None
     execute(
         """
         INSERT INTO phone_number_tags (number_id, store_tag, purpose_tag, created_at)
@@ -529,13 +732,78 @@ def set_number_tags(number_id: int, store_tag: str | None, purpose_tag: str | No
             store_tag = excluded.store_tag,
             purpose_tag = excluded.purpose_tag
         """,
-        (
-            int(number_id),
-            (store_tag or "").strip() or None,
-            (purpose_tag or "").strip() or None,
-            _now_iso(),
-        ),
+        (int(number_id), store_tag, purpose_tag, _now_iso()),
     )
+    _start_tag_fan_out(int(number_id))
+
+
+class _TagFanOut:
+    """One background thread copying tags onto messages; edits queued for a number coalesce."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._pending: set[int] = set()
+        self._busy = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, number_id: int) -> None:
+        with self._cond:
+            self._pending.add(number_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tag-fan-out", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                while not self._pending:
+                    self._cond.wait()
+                number_id = self._pending.pop()
+                self._busy = True
+            _fan_out_number_tags(number_id)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+
+_tag_fan_out = _TagFanOut()
+
+
+def _start_tag_fan_out(number_id: int) -> None:
+    _tag_fan_out.submit(number_id)
+
+
+def _fan_out_number_tags(number_id: int) -> None:
+    """Copy a number's current tags onto its stored messages (sms_messages keeps them denormalized).
+
+    Tags are read from phone_number_tags inside the UPDATE, so fan-outs that finish out
+    of order, or race an ingest, still leave the messages matching the latest tags.
+    """
+    try:
+        execute(
+            """
+            UPDATE sms_messages
+            SET store_tag = (SELECT t.store_tag FROM phone_number_tags t WHERE t.number_id = sms_messages.number_id),
+                purpose_tag = (SELECT t.purpose_tag FROM phone_number_tags t WHERE t.number_id = sms_messages.number_id)
+            WHERE number_id = ?
+              AND (
+                store_tag IS NOT (SELECT t.store_tag FROM phone_number_tags t WHERE t.number_id = sms_messages.number_id)
+                OR purpose_tag IS NOT (SELECT t.purpose_tag FROM phone_number_tags t WHERE t.number_id = sms_messages.number_id)
+              )
+            """,
+            (number_id,),
+        )
+    except Exception as e:
+        log_event(
+            level="error",
+            event_type="tag_fan_out",
+            message="Failed to update message tags for number.",
+            context={"number_id": number_id, "error": str(e)},
+        )
 
 
 def _extract_otp_code(body: str | None) -> str | None:
@@ -563,8 +831,16 @@ def upsert_sms_message(
         return execute(
             """
             INSERT INTO sms_messages
-                (provider, provider_message_sid, to_number, from_number, body, received_at, number_id, otp_code, raw_payload)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (
+                    provider, provider_message_sid, to_number, from_number, body, received_at,
+                    number_id, otp_code, raw_payload, store_tag, purpose_tag
+                )
+            VALUES (
+                ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                -- Tags are read in the same statement so a concurrent tag edit is never half-seen.
+                (SELECT store_tag FROM phone_number_tags WHERE number_id = ?),
+                (SELECT purpose_tag FROM phone_number_tags WHERE number_id = ?)
+            )
             """,
             (
                 provider.strip().lower(),
@@ -576,6 +852,8 @@ def upsert_sms_message(
                 number_id,
                 otp,
                 json.dumps(raw_payload or {}, ensure_ascii=False),
+                number_id,
+                number_id,
             ),
         )
     except sqlite3.IntegrityError:
@@ -611,6 +889,71 @@ def query_sms_messages(
     until_iso: str | None = None,
     limit: int = 500,
 ) -> list[dict[str, Any]]:
+    built = _sms_messages_query(
+        viewer_user_id=viewer_user_id,
+        viewer_role=viewer_role,
+        assigned_only=assigned_only,
+        to_number=to_number,
+        from_number=from_number,
+        store_tag=store_tag,
+        purpose_tag=purpose_tag,
+        unread_only=unread_only,
+        since_iso=since_iso,
+        until_iso=until_iso,
+        limit=limit,
+    )
+    if built is None:
+        return []
+    return fetch_all(*built)
+
+
+def query_sms_messages_frame(
+    *,
+    viewer_user_id: int | None,
+    viewer_role: str | None,
+    assigned_only: bool,
+    to_number: str | None = None,
+    from_number: str | None = None,
+    store_tag: str | None = None,
+    purpose_tag: str | None = None,
+    unread_only: bool = False,
+    since_iso: str | None = None,
+    until_iso: str | None = None,
+    limit: int = 500,
+) -> pd.DataFrame:
+    """Same filters as query_sms_messages, returned as a DataFrame."""
+    built = _sms_messages_query(
+        viewer_user_id=viewer_user_id,
+        viewer_role=viewer_role,
+        assigned_only=assigned_only,
+        to_number=to_number,
+        from_number=from_number,
+        store_tag=store_tag,
+        purpose_tag=purpose_tag,
+        unread_only=unread_only,
+        since_iso=since_iso,
+        until_iso=until_iso,
+        limit=limit,
+    )
+    if built is None:
+        return pd.DataFrame()
+    return fetch_frame(*built)
+
+
+def _sms_messages_query(
+    *,
+    viewer_user_id: int | None,
+    viewer_role: str | None,
+    assigned_only: bool,
+    to_number: str | None = None,
+    from_number: str | None = None,
+    store_tag: str | None = None,
+    purpose_tag: str | None = None,
+    unread_only: bool = False,
+    since_iso: str | None = None,
+    until_iso: str | None = None,
+    limit: int = 500,
+) -> tuple[str, list[Any]] | None:
     limit = max(1, min(int(limit), 5000))
     params: list[Any] = []
     where: list[str] = []
@@ -618,8 +961,8 @@ def query_sms_messages(
 
     if assigned_only and (viewer_role or "").lower() != "admin":
         if viewer_user_id is None:
-            return []
-        join_user_numbers = "JOIN user_phone_numbers upn ON upn.number_id = n.id AND upn.user_id = ? AND upn.is_active = 1"
+            return None
+        join_user_numbers = "JOIN user_phone_numbers upn ON upn.number_id = m.number_id AND upn.user_id = ? AND upn.is_active = 1"
         params.append(int(viewer_user_id))
 
     if to_number:
@@ -637,15 +980,14 @@ def query_sms_messages(
         where.append("m.received_at <= ?")
         params.append(until_iso)
     if store_tag:
-        where.append("t.store_tag = ?")
+        where.append("m.store_tag = ?")
         params.append(store_tag.strip())
     if purpose_tag:
-        where.append("t.purpose_tag = ?")
+        where.append("m.purpose_tag = ?")
         params.append(purpose_tag.strip())
 
     where_sql = ("WHERE " + " AND ".join(where)) if where else ""
-    return fetch_all(
-        f"""
+    query = f"""
         SELECT
             m.id,
             m.provider,
@@ -656,20 +998,16 @@ def query_sms_messages(
             m.received_at,
             m.is_read,
             m.otp_code,
-            n.id AS number_id,
-            n.e164 AS number_e164,
-            t.store_tag AS store_tag,
-            t.purpose_tag AS purpose_tag
+            m.number_id,
+            m.store_tag,
+            m.purpose_tag
         FROM sms_messages m
-        LEFT JOIN numbers n ON n.id = m.number_id
-        LEFT JOIN phone_number_tags t ON t.number_id = n.id
         {join_user_numbers}
         {where_sql}
         ORDER BY m.received_at DESC
         LIMIT {limit}
-        """,
-        params,
-    )
+        """
+    return query, params
 
 
 def get_dashboard_stats(viewer_user_id: int | None, viewer_role: str | None) -> dict[str, Any]:
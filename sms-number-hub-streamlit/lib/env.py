@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+
+from lib.db import apply_number_sync, fetch_all, log_event
+
+
+PROVIDER = "twilio"
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+_MAX_ATTEMPTS = 4
+
+
+@dataclass
+class SyncPlan:
+    inserts: list[dict[str, Any]] = field(default_factory=list)
+    updates: list[dict[str, Any]] = field(default_factory=list)
+    unchanged: int = 0
+    fetched: int = 0
+    pages: int = 0
+    seconds: float = 0.0
+    applied: bool = False
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "fetched": self.fetched,
+            "pages": self.pages,
+            "new": len(self.inserts),
+            "updated": sum(1 for u in self.updates if u["status"] != "released"),
+            "released": sum(1 for u in self.updates if u["status"] == "released"),
+            "unchanged": self.unchanged,
+            "seconds": round(self.seconds, 2),
+            "applied": self.applied,
+        }
+
+
+def twilio_configured() -> bool:
+    return bool((os.getenv("TWILIO_ACCOUNT_SID") or "").strip() and (os.getenv("TWILIO_AUTH_TOKEN") or "").strip())
+
+
+def normalize_e164(value: str | None) -> str:
+    """'+1 (555) 000-1234' and '15550001234' both become '+15550001234'."""
+    digits = re.sub(r"\D", "", value or "")
+    return f"+{digits}" if digits else ""
+
+
+def _capabilities(resource: dict[str, Any]) -> str | None:
+    caps = resource.get("capabilities") or {}
+    enabled = sorted(str(k).lower() for k, v in caps.items() if v)
+    return ", ".join(enabled) or None
+
+
+def _get_page(client: httpx.Client, uri: str) -> dict[str, Any]:
+    for attempt in range(_MAX_ATTEMPTS):
+        r = client.get(uri)
+        if r.status_code not in _RETRY_STATUS_CODES or attempt + 1 >= _MAX_ATTEMPTS:
+            r.raise_for_status()
+            return r.json()
+        retry_after = r.headers.get("Retry-After", "")
+        time.sleep(float(retry_after) if retry_after.isdigit() else 2**attempt)
+    raise RuntimeError("unreachable")
+
+
+def _list_partition(client: httpx.Client, account_sid: str, prefix: str | None, page_size: int) -> tuple[list[dict[str, Any]], int]:
+    params: dict[str, Any] = {"PageSize": page_size}
+    if prefix:
+        params["PhoneNumber"] = prefix
+    uri: str | None = f"/2010-04-01/Accounts/{account_sid}/IncomingPhoneNumbers.json?{urlencode(params)}"
+    resources: list[dict[str, Any]] = []
+    pages = 0
+    while uri:
+        page = _get_page(client, uri)
+        resources.extend(page.get("incoming_phone_numbers") or [])
+        pages += 1
+        uri = page.get("next_page_uri") or None
+    return resources, pages
+
+
+def fetch_incoming_numbers(
+    *,
+    partitions: list[str] | None = None,
+    page_size: int = 1000,
+    concurrency: int = 8,
+) -> tuple[dict[str, dict[str, Any]], int]:
+    """All IncomingPhoneNumbers on the account, keyed by E.164, plus the page count.
+
+    Twilio pages are cursor-linked, so a single listing is sequential. Passing number
+    prefixes (e.g. ["+1201", "+1202", "+44"]) lists each partition concurrently; results
+    are merged, so overlapping prefixes are harmless.
+    """
+    account_sid = (os.getenv("TWILIO_ACCOUNT_SID") or "").strip()
+    auth_token = (os.getenv("TWILIO_AUTH_TOKEN") or "").strip()
+    base_url = (os.getenv("TWILIO_API_BASE_URL") or "https://api.twilio.com").strip().rstrip("/")
+    prefixes: list[str | None] = [p.strip() for p in (partitions or []) if p.strip()] or [None]
+    page_size = max(1, min(int(page_size), 1000))
+
+    with httpx.Client(
+        base_url=base_url,
+        auth=(account_sid, auth_token),
+        timeout=httpx.Timeout(30, connect=10),
+        limits=httpx.Limits(max_connections=max(1, concurrency)),
+    ) as client, ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(prefixes)))) as pool:
+        results = list(pool.map(lambda p: _list_partition(client, account_sid, p, page_size), prefixes))
+
+    by_number: dict[str, dict[str, Any]] = {}
+    for resources, _ in results:
+        for r in resources:
+            e164 = normalize_e164(r.get("phone_number"))
+            if e164:
+                by_number[e164] = r
+    return by_number, sum(pages for _, pages in results)
+
+
+def plan_sync(
+    twilio_numbers: dict[str, dict[str, Any]],
+    existing: list[dict[str, Any]],
+    partitions: list[str] | None = None,
+) -> SyncPlan:
+    """Diff the Twilio inventory against the numbers table.
+
+    - Numbers on the account but not in the table are inserted as active Twilio numbers.
+    - Known numbers get provider/capabilities refreshed and their e164 rewritten to E.164;
+      released ones come back active (paused numbers stay paused).
+    - Twilio numbers in the table that are no longer on the account are marked released.
+      When only some prefixes were listed, only numbers under those prefixes can be released.
+
+    Numbers are matched on their normalized E.164 form, so rows typed by hand with spaces
+    or dashes are updated rather than duplicated.
+    """
+    plan = SyncPlan(fetched=len(twilio_numbers))
+    by_e164: dict[str, dict[str, Any]] = {}
+    for row in existing:
+        key = normalize_e164(row["e164"])
+        # Prefer a row already stored in canonical form when several normalize alike.
+        if key and (key not in by_e164 or row["e164"] == key):
+            by_e164[key] = row
+
+    for e164, resource in twilio_numbers.items():
+        caps = _capabilities(resource)
+        row = by_e164.get(e164)
+        if row is None:
+            friendly = (resource.get("friendly_name") or "").strip()
+            plan.inserts.append(
+                {
+                    "e164": e164,
+                    "provider": PROVIDER,
+                    "capabilities": caps,
+                    "status": "active",
+                    "notes": friendly if friendly and friendly != e164 else None,
+                }
+            )
+            continue
+        status = "active" if row["status"] == "released" else row["status"]
+        if (
+            row["e164"] != e164
+            or (row.get("provider") or "").lower() != PROVIDER
+            or row.get("capabilities") != caps
+            or status != row["status"]
+        ):
+            plan.updates.append(
+                {"id": row["id"], "e164": e164, "provider": PROVIDER, "capabilities": caps, "status": status}
+            )
+        else:
+            plan.unchanged += 1
+
+    prefixes = [normalize_e164(p) for p in (partitions or []) if normalize_e164(p)]
+    matched_ids = {row["id"] for key, row in by_e164.items() if key in twilio_numbers}
+    for row in existing:
+        key = normalize_e164(row["e164"])
+        if (
+            (row.get("provider") or "").lower() == PROVIDER
+            and row["id"] not in matched_ids
+            and key not in twilio_numbers
+            and row["status"] != "released"
+            and (not prefixes or any(key.startswith(p) for p in prefixes))
+        ):
+            plan.updates.append(
+                {
+                    "id": row["id"],
+                    "e164": row["e164"],
+                    "provider": row["provider"],
+                    "capabilities": row.get("capabilities"),
+                    "status": "released",
+                }
+            )
+    return plan
+
+
+def sync_twilio_numbers(*, dry_run: bool = True, partitions: list[str] | None = None) -> SyncPlan:
+    started = time.perf_counter()
+    twilio_numbers, pages = fetch_incoming_numbers(partitions=partitions)
+    existing = fetch_all("SELECT id, e164, provider, capabilities, status FROM numbers")
+    plan = plan_sync(twilio_numbers, existing, partitions)
+    plan.pages = pages
+
+    if not dry_run and (plan.inserts or plan.updates):
+        apply_number_sync(plan.inserts, plan.updates)
+        plan.applied = True
+    plan.seconds = time.perf_counter() - started
+
+    if not dry_run:
+        log_event(level="info", event_type="twilio_number_sync", message="Twilio number inventory synced.", context=plan.summary())
+    return plan
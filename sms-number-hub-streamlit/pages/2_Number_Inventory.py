@@ -1,6 +1,5 @@
 import json
 
-import pandas as pd
 import streamlit as st
 
 from lib.db import (
@@ -11,10 +10,10 @@ from lib.db import (
     deactivate_assignment,
     delete_row,
     export_all,
-    get_assignments,
-    get_numbers,
-    get_people,
-    get_store_accounts,
+    get_assignments_frame,
+    get_numbers_frame,
+    get_people_frame,
+    get_store_accounts_frame,
     import_table,
     init_db,
 )
@@ -30,11 +29,15 @@ auth_sidebar()
 
 st.title("Number Inventory")
 
-people_tab, numbers_tab, accounts_tab, assignments_tab, import_export_tab = st.tabs(
-    ["People", "Numbers", "Store Accounts", "Assignments", "Import/Export"]
+section = st.radio(
+    "Section",
+    options=["People", "Numbers", "Store Accounts", "Assignments", "Import/Export"],
+    horizontal=True,
+    label_visibility="collapsed",
+    key="inventory_section",
 )
 
-with people_tab:
+if section == "People":
     st.subheader("People")
     with st.form("add_person"):
         name = st.text_input("Name")
@@ -49,16 +52,17 @@ with people_tab:
         except Exception as e:
             st.error(str(e))
 
-    people = get_people()
-    st.dataframe(pd.DataFrame(people), use_container_width=True, hide_index=True)
+    people = get_people_frame()
+    st.dataframe(people, use_container_width=True, hide_index=True)
 
-    if people:
+    if not people.empty:
+        person_labels = dict(zip(people["id"].tolist(), people["name"].tolist()))
         col1, col2 = st.columns([2, 1])
         with col1:
             person_to_delete = st.selectbox(
                 "Delete person (danger)",
-                options=[p["id"] for p in people],
-                format_func=lambda pid: next(p["name"] for p in people if p["id"] == pid),
+                options=list(person_labels),
+                format_func=person_labels.__getitem__,
             )
         with col2:
             if st.button("Delete", type="secondary"):
@@ -68,7 +72,7 @@ with people_tab:
                 except Exception as e:
                     st.error(str(e))
 
-with numbers_tab:
+elif section == "Numbers":
     st.subheader("Numbers")
 
     with st.form("add_number"):
@@ -95,16 +99,17 @@ with numbers_tab:
         except Exception as e:
             st.error(str(e))
 
-    numbers = get_numbers()
-    st.dataframe(pd.DataFrame(numbers), use_container_width=True, hide_index=True)
+    numbers = get_numbers_frame()
+    st.dataframe(numbers, use_container_width=True, hide_index=True)
 
-    if numbers:
+    if not numbers.empty:
+        number_labels = dict(zip(numbers["id"].tolist(), numbers["e164"].tolist()))
         col1, col2 = st.columns([2, 1])
         with col1:
             number_to_delete = st.selectbox(
                 "Delete number (danger)",
-                options=[n["id"] for n in numbers],
-                format_func=lambda nid: next(n["e164"] for n in numbers if n["id"] == nid),
+                options=list(number_labels),
+                format_func=number_labels.__getitem__,
             )
         with col2:
             if st.button("Delete number", type="secondary"):
@@ -114,7 +119,7 @@ with numbers_tab:
                 except Exception as e:
                     st.error(str(e))
 
-with accounts_tab:
+elif section == "Store Accounts":
     st.subheader("Store Accounts")
 
     with st.form("add_store_account"):
@@ -147,16 +152,25 @@ with accounts_tab:
         except Exception as e:
             st.error(str(e))
 
-    accounts = get_store_accounts()
-    st.dataframe(pd.DataFrame(accounts), use_container_width=True, hide_index=True)
-
-    if accounts:
+    accounts = get_store_accounts_frame()
+    st.dataframe(accounts, use_container_width=True, hide_index=True)
+
+    if not accounts.empty:
+        account_labels = {
+            aid: f"{platform} | {store_name or ''} | {store_id or ''}"
+            for aid, platform, store_name, store_id in zip(
+                accounts["id"].tolist(),
+                accounts["platform"].tolist(),
+                accounts["store_name"].tolist(),
+                accounts["store_id"].tolist(),
+            )
+        }
         col1, col2 = st.columns([2, 1])
         with col1:
             acc_to_delete = st.selectbox(
                 "Delete store account (danger)",
-                options=[a["id"] for a in accounts],
-                format_func=lambda aid: f"{next(a['platform'] for a in accounts if a['id'] == aid)} | {next((a['store_name'] or '') for a in accounts if a['id'] == aid)} | {next((a['store_id'] or '') for a in accounts if a['id'] == aid)}",
+                options=list(account_labels),
+                format_func=account_labels.__getitem__,
             )
         with col2:
             if st.button("Delete store account", type="secondary"):
@@ -166,31 +180,42 @@ with accounts_tab:
                 except Exception as e:
                     st.error(str(e))
 
-with assignments_tab:
+elif section == "Assignments":
     st.subheader("Assignments")
 
-    people = get_people()
-    numbers = get_numbers()
-    accounts = get_store_accounts()
+    people = get_people_frame()
+    numbers = get_numbers_frame()
+    accounts = get_store_accounts_frame()
 
-    if not people or not numbers or not accounts:
+    if people.empty or numbers.empty or accounts.empty:
         st.warning("Add at least one person, number, and store account first.")
     else:
+        person_labels = dict(zip(people["id"].tolist(), people["name"].tolist()))
+        number_labels = dict(zip(numbers["id"].tolist(), numbers["e164"].tolist()))
+        account_labels = {
+            aid: f"{platform} | {store_name or ''} | {store_id or ''}"
+            for aid, platform, store_name, store_id in zip(
+                accounts["id"].tolist(),
+                accounts["platform"].tolist(),
+                accounts["store_name"].tolist(),
+                accounts["store_id"].tolist(),
+            )
+        }
         with st.form("add_assignment"):
             person_id = st.selectbox(
                 "Person",
-                options=[p["id"] for p in people],
-                format_func=lambda pid: next(p["name"] for p in people if p["id"] == pid),
+                options=list(person_labels),
+                format_func=person_labels.__getitem__,
             )
             number_id = st.selectbox(
                 "Number",
-                options=[n["id"] for n in numbers],
-                format_func=lambda nid: next(n["e164"] for n in numbers if n["id"] == nid),
+                options=list(number_labels),
+                format_func=number_labels.__getitem__,
             )
             store_account_id = st.selectbox(
                 "Store account",
-                options=[a["id"] for a in accounts],
-                format_func=lambda aid: f"{next(a['platform'] for a in accounts if a['id'] == aid)} | {next((a['store_name'] or '') for a in accounts if a['id'] == aid)} | {next((a['store_id'] or '') for a in accounts if a['id'] == aid)}",
+                options=list(account_labels),
+                format_func=account_labels.__getitem__,
             )
             purpose = st.selectbox("Purpose", options=["2fa", "recovery", "ops"], index=0)
             submitted = st.form_submit_button("Assign", type="primary")
@@ -211,16 +236,25 @@ with assignments_tab:
     st.divider()
 
     active_only = st.checkbox("Show active only", value=True)
-    assignments = get_assignments(active_only=active_only)
-    st.dataframe(pd.DataFrame(assignments), use_container_width=True, hide_index=True)
-
-    if assignments:
+    assignments = get_assignments_frame(active_only=active_only)
+    st.dataframe(assignments, use_container_width=True, hide_index=True)
+
+    if not assignments.empty:
+        assignment_labels = {
+            aid: f"{person_name} | {number_e164} | {platform}"
+            for aid, person_name, number_e164, platform in zip(
+                assignments["id"].tolist(),
+                assignments["person_name"].tolist(),
+                assignments["number_e164"].tolist(),
+                assignments["platform"].tolist(),
+            )
+        }
         col1, col2 = st.columns([2, 1])
         with col1:
             to_deactivate = st.selectbox(
                 "Deactivate assignment",
-                options=[a["id"] for a in assignments],
-                format_func=lambda aid: f"{next(a['person_name'] for a in assignments if a['id'] == aid)} | {next(a['number_e164'] for a in assignments if a['id'] == aid)} | {next(a['platform'] for a in assignments if a['id'] == aid)}",
+                options=list(assignment_labels),
+                format_func=assignment_labels.__getitem__,
             )
         with col2:
             if st.button("Deactivate", type="secondary"):
@@ -230,16 +264,20 @@ with assignments_tab:
                 except Exception as e:
                     st.error(str(e))
 
-with import_export_tab:
+else:
     st.subheader("Export")
-    export = export_all()
-    export_json = json.dumps(export, indent=2)
-    st.download_button(
-        "Download JSON export",
-        data=export_json,
-        file_name="sms_number_hub_export.json",
-        mime="application/json",
-    )
+    if st.button("Prepare JSON export"):
+        st.session_state["inventory_export_json"] = json.dumps(export_all(), indent=2)
+
+    export_json = st.session_state.get("inventory_export_json")
+    if export_json is not None:
+        st.download_button(
+            "Download JSON export",
+            data=export_json,
+            file_name="sms_number_hub_export.json",
+            mime="application/json",
+            on_click=lambda: st.session_state.pop("inventory_export_json", None),
+        )
 
     st.divider()
     st.subheader("Import")
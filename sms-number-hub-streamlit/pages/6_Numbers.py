@@ -11,6 +11,7 @@ from lib.db import (
     set_number_tags,
 )
 from lib.session import auth_sidebar, is_admin, require_login
+from lib.twilio_sync import sync_twilio_numbers
 
 
 st.set_page_config(page_title="Numbers", page_icon="📱", layout="wide")
@@ -99,4 +100,56 @@ if not (os.getenv("TWILIO_ACCOUNT_SID") and os.getenv("TWILIO_AUTH_TOKEN")):
     st.info("Set TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN to enable Twilio number management.")
     st.stop()
 
-st.warning("Twilio number buying/listing UI is not implemented yet; webhook ingest works once Twilio is configured.")
+st.caption(
+    "Sync imports every number on the Twilio account into the inventory, refreshes capabilities, "
+    "and marks Twilio numbers that left the account as released. Buying numbers is not implemented."
+)
+
+if not admin:
+    st.info("Twilio sync is admin-only.")
+    st.stop()
+
+partitions_text = st.text_input(
+    "Number prefixes to list in parallel (optional)",
+    value=os.getenv("TWILIO_SYNC_PARTITIONS", ""),
+    help=(
+        "Comma-separated, e.g. +1201, +1202, +44. Only numbers under these prefixes are listed, "
+        "and only those can be marked released. Leave empty to sync the whole account."
+    ),
+)
+partitions = [p.strip() for p in partitions_text.split(",") if p.strip()]
+
+c1, c2 = st.columns(2)
+if c1.button("Preview sync (dry run)"):
+    try:
+        with st.spinner("Listing Twilio numbers..."):
+            st.session_state["twilio_sync_plan"] = sync_twilio_numbers(dry_run=True, partitions=partitions)
+    except Exception as e:
+        st.error(f"Twilio sync failed: {e}")
+if c2.button("Apply sync", type="primary"):
+    try:
+        with st.spinner("Syncing Twilio numbers..."):
+            st.session_state["twilio_sync_plan"] = sync_twilio_numbers(dry_run=False, partitions=partitions)
+    except Exception as e:
+        st.error(f"Twilio sync failed: {e}")
+
+plan = st.session_state.get("twilio_sync_plan")
+if plan is not None:
+    summary = plan.summary()
+    if summary["applied"]:
+        st.success("Sync applied.")
+    else:
+        st.info("Dry run: nothing was written. Apply sync to make these changes.")
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("On Twilio", summary["fetched"])
+    m2.metric("New", summary["new"])
+    m3.metric("Updated", summary["updated"])
+    m4.metric("Released", summary["released"])
+    m5.metric("Unchanged", summary["unchanged"])
+    st.caption(f"{summary['pages']} page(s) in {summary['seconds']}s")
+    if plan.inserts:
+        st.markdown("**New numbers**")
+        st.dataframe(pd.DataFrame(plan.inserts), use_container_width=True, hide_index=True)
+    if plan.updates:
+        st.markdown("**Changed numbers**")
+        st.dataframe(pd.DataFrame(plan.updates), use_container_width=True, hide_index=True)
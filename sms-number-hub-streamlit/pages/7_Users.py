@@ -1,8 +1,8 @@
 import pandas as pd
 import streamlit as st
 
-from lib.auth import hash_password
-from lib.db import create_user, list_users, set_user_active
+from lib.auth import bulk_create_users, hash_password
+from lib.db import create_user, list_users_frame, set_user_active
 from lib.session import auth_sidebar, require_admin
 
 
@@ -33,18 +33,39 @@ if submitted:
     except Exception as e:
         st.error(str(e))
 
+with st.expander("Bulk create users"):
+    st.caption("CSV with a header row: username,password[,email][,role]. Role defaults to user.")
+    upload = st.file_uploader("Users CSV", type=["csv"], key="bulk_users_csv")
+    if upload is not None:
+        bulk = pd.read_csv(upload, dtype=str, keep_default_na=False)
+        bulk.columns = [str(c).strip().lower() for c in bulk.columns]
+        missing = {"username", "password"} - set(bulk.columns)
+        if missing:
+            st.error(f"Missing column(s): {', '.join(sorted(missing))}")
+        else:
+            st.caption(f"{len(bulk)} row(s)")
+            if st.button("Create users", type="primary", key="bulk_users_submit"):
+                with st.spinner(f"Creating {len(bulk)} users..."):
+                    results = bulk_create_users(bulk.to_dict(orient="records"))
+                created = sum(1 for r in results if r["status"] == "created")
+                st.success(f"Created {created} user(s); skipped {len(results) - created}.")
+                skipped = [r for r in results if r["status"] != "created"]
+                if skipped:
+                    st.dataframe(pd.DataFrame(skipped), use_container_width=True, hide_index=True)
+
 st.divider()
 
-users = list_users(active_only=False)
-st.dataframe(pd.DataFrame(users).drop(columns=["password_hash"], errors="ignore"), use_container_width=True, hide_index=True)
+users = list_users_frame(active_only=False)
+st.dataframe(users, use_container_width=True, hide_index=True)
 
-if users:
+if not users.empty:
+    user_labels = dict(zip(users["id"].tolist(), users["username"].tolist()))
     col1, col2 = st.columns([2, 1])
     with col1:
         user_id = st.selectbox(
             "User",
-            options=[u["id"] for u in users],
-            format_func=lambda uid: next(u["username"] for u in users if u["id"] == uid),
+            options=list(user_labels),
+            format_func=user_labels.__getitem__,
         )
     with col2:
         active = st.checkbox("Active", value=True)
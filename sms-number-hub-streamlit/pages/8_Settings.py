@@ -1,6 +1,6 @@
 import streamlit as st
 
-from lib.db import get_events
+from lib.db import get_events_frame
 from lib.session import auth_sidebar, require_admin
 
 
@@ -14,9 +14,9 @@ st.title("Settings")
 st.subheader("Event logs")
 
 limit = st.slider("Rows", 50, 2000, 200)
-rows = get_events(limit=int(limit))
+rows = get_events_frame(limit=int(limit))
 
-if not rows:
+if rows.empty:
     st.info("No events logged yet.")
     st.stop()
 
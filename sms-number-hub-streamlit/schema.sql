@@ -87,6 +87,8 @@ CREATE TABLE IF NOT EXISTS sms_messages (
     is_read INTEGER NOT NULL DEFAULT 0,
     otp_code TEXT,
     raw_payload TEXT,
+    store_tag TEXT,
+    purpose_tag TEXT,
     FOREIGN KEY(number_id) REFERENCES numbers(id) ON DELETE SET NULL,
     UNIQUE(provider, provider_message_sid)
 );
@@ -103,5 +105,7 @@ CREATE TABLE IF NOT EXISTS app_events (
 CREATE INDEX IF NOT EXISTS idx_sms_received_at ON sms_messages(received_at);
 CREATE INDEX IF NOT EXISTS idx_sms_to_number ON sms_messages(to_number);
 CREATE INDEX IF NOT EXISTS idx_sms_number_id ON sms_messages(number_id);
+CREATE INDEX IF NOT EXISTS idx_sms_store_tag ON sms_messages(store_tag, received_at);
+CREATE INDEX IF NOT EXISTS idx_sms_purpose_tag ON sms_messages(purpose_tag, received_at);
 CREATE INDEX IF NOT EXISTS idx_user_numbers_user_id ON user_phone_numbers(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_numbers_number_id ON user_phone_numbers(number_id);
@@ -0,0 +1,89 @@
+"""Compare pd.DataFrame(query_sms_messages(...)) with query_sms_messages_frame(...).
+
+Run from the project root:  python scripts/bench_fetch_frame.py --rows 5000
+
+Seeds a temporary database, then times the Messages page query both ways and records
+the tracemalloc peak of each. "arrow" is the pyarrow conversion st.dataframe does
+before sending a frame to the browser.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib import db  # noqa: E402
+
+
+def _seed(rows: int) -> None:
+    number_id = db.add_number("+15550004444", "twilio", "US", "sms", "active", None)
+    db.set_number_tags(number_id, "store-1", "otp")
+    with db._connect() as conn:
+        conn.executemany(
+            """
+            INSERT INTO sms_messages (
+                provider, provider_message_sid, to_number, from_number, body, received_at,
+                number_id, is_read, otp_code, raw_payload, store_tag, purpose_tag
+            )
+            VALUES ('twilio', ?, '+15550004444', '+15559990000', ?, ?, ?, ?, ?, '{}', 'store-1', 'otp')
+            """,
+            [
+                (
+                    f"SMbench{i}",
+                    f"Your code is {100000 + i}",
+                    f"2026-01-01T00:{i // 3600 % 60:02d}:{i % 60:02d}+00:00",
+                    number_id,
+                    i % 2,
+                    str(100000 + i),
+                )
+                for i in range(rows)
+            ],
+        )
+
+
+def _measure(fn, repeat: int) -> tuple[float, float, pd.DataFrame]:
+    tracemalloc.start()
+    frame = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000, peak / 1024 / 1024, frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000, help="messages returned by the query")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-frame-") as tmp:
+        db.DB_PATH = Path(tmp) / "app.db"
+        db.init_db()
+        _seed(args.rows)
+
+        query = dict(viewer_user_id=None, viewer_role="admin", assigned_only=False, limit=args.rows)
+        paths = {
+            "list[dict]": lambda: pd.DataFrame(db.query_sms_messages(**query)),
+            "fetch_frame": lambda: db.query_sms_messages_frame(**query),
+        }
+        print(f"{args.rows} rows")
+        print(f"{'path':<12} {'ms':>8} {'peak MiB':>9} {'frame MiB':>10} {'arrow ms':>9}")
+        for label, fn in paths.items():
+            ms, peak, frame = _measure(fn, args.repeat)
+            arrow_ms = _measure(lambda: pa.Table.from_pandas(frame), args.repeat)[0]
+            frame_mib = frame.memory_usage(deep=True).sum() / 1024 / 1024
+            print(f"{label:<12} {ms:>8.2f} {peak:>9.2f} {frame_mib:>10.2f} {arrow_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import lib.db
+
+# Never touch data/app.db: every test session gets its own database file.
+_data_dir = Path(tempfile.mkdtemp(prefix="sms-hub-tests-"))
+lib.db.DB_PATH = _data_dir / "app.db"
+os.environ["ENFORCE_TWILIO_SIGNATURE"] = "false"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> Path:
+    lib.db.init_db()
+    return lib.db.DB_PATH
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+import webhook
+from lib.admission import AdmissionController, Overloaded
+
+
+def test_full_queue_is_shed():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_seconds=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.admit():
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold()), asyncio.create_task(hold())]
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            async with admission.admit():
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+        return admission.snapshot()
+
+    snap = asyncio.run(run())
+    assert (snap["admitted"], snap["queued"], snap["shed_queue_full"], snap["in_flight"]) == (2, 1, 1, 0)
+
+
+def test_queue_timeout_is_shed():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout_seconds=0.05)
+        async with admission.admit():
+            with pytest.raises(Overloaded):
+                async with admission.admit():
+                    pass
+        return admission.snapshot()
+
+    snap = asyncio.run(run())
+    assert (snap["shed_timeout"], snap["waiting"], snap["in_flight"]) == (1, 0, 0)
+
+
+def test_saturated_webhook_answers_503_with_retry_after(monkeypatch):
+    saturated = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout_seconds=1)
+    monkeypatch.setattr(webhook, "admission", saturated)
+
+    async def run():
+        transport = httpx.ASGITransport(app=webhook.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://hub") as client:
+            async with saturated.admit():
+                return await client.post(
+                    "/twilio/sms", data={"To": "+15550001000", "From": "+1999", "Body": "x", "MessageSid": "SMshed"}
+                )
+
+    r = asyncio.run(run())
+    assert r.status_code == 503
+    assert int(r.headers["Retry-After"]) >= 1
+    assert saturated.shed_queue_full == 1
+
+
+def test_admission_stats_need_the_token(monkeypatch):
+    async def get(headers):
+        transport = httpx.ASGITransport(app=webhook.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://hub") as client:
+            return await client.get("/stats/admission", headers=headers)
+
+    monkeypatch.delenv("WEBHOOK_STATS_TOKEN", raising=False)
+    assert asyncio.run(get({})).status_code == 404
+    monkeypatch.setenv("WEBHOOK_STATS_TOKEN", "s3cret")
+    assert asyncio.run(get({"Authorization": "Bearer nope"})).status_code == 401
+    r = asyncio.run(get({"Authorization": "Bearer s3cret"}))
+    assert r.status_code == 200 and r.json()["max_concurrent"] >= 1
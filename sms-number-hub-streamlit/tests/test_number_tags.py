@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+
+from lib import db
+
+
+def _message(number: str, sid: str) -> int:
+    return db.upsert_sms_message(
+        provider="twilio",
+        provider_message_sid=sid,
+        to_number=number,
+        from_number="+15559990000",
+        body="Your code is 123456",
+        received_at=None,
+        raw_payload={},
+    )
+
+
+def _tags(message_id: int) -> tuple:
+    row = db.fetch_all("SELECT number_id, store_tag, purpose_tag FROM sms_messages WHERE id = ?", (message_id,))[0]
+    return row["number_id"], row["store_tag"], row["purpose_tag"]
+
+
+def test_tag_edits_fan_out_through_one_coalescing_worker():
+    number_id = db.add_number("+15550006001", "manual", "US", "sms", "active", None)
+    message_id = _message("+15550006001", "SMtags1")
+
+    for i in range(50):
+        db.set_number_tags(number_id, f"store-{i}", "otp")
+    assert db._tag_fan_out.wait_idle(timeout=10)
+    assert _tags(message_id) == (number_id, "store-49", "otp")
+    workers = [t for t in threading.enumerate() if t.name.startswith("tag-fan-out")]
+    assert len(workers) == 1
+
+
+def test_deleting_a_number_detaches_its_messages_and_clears_tags():
+    number_id = db.add_number("+15550006002", "manual", "US", "sms", "active", None)
+    db.set_number_tags(number_id, "store-x", "login")
+    message_id = _message("+15550006002", "SMtags2")
+    assert _tags(message_id) == (number_id, "store-x", "login")
+
+    db.delete_row("numbers", number_id)
+    assert _tags(message_id) == (None, None, None)
+    assert not db.fetch_all("SELECT id FROM phone_number_tags WHERE number_id = ?", (number_id,))
+
+    # Re-importing the same id must not bring the old tags back onto anything.
+    db.import_table("numbers", [{"id": number_id, "e164": "+15550006002", "provider": "manual"}])
+    assert db._tag_fan_out.wait_idle(timeout=10)
+    assert _tags(message_id) == (None, None, None)
+    assert db.query_sms_messages(viewer_user_id=None, viewer_role="admin", assigned_only=False, store_tag="store-x") == []
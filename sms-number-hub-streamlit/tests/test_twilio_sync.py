@@ -0,0 +1,158 @@
+"""Number sync against a local stand-in for the Twilio IncomingPhoneNumbers API."""
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+
+from lib import twilio_sync
+from lib.db import add_number, fetch_all
+
+ACCOUNT_SID = "ACtest"
+PAGE_SIZE = 2
+INVENTORY = [f"+1201555{i:04d}" for i in range(1, 6)] + ["+447700900001", "+447700900002"]
+
+
+class _Stub:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str | None, int]] = []
+        self.throttle_next = False
+
+
+stub = _Stub()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != f"/2010-04-01/Accounts/{ACCOUNT_SID}/IncomingPhoneNumbers.json":
+            return self._send(404, {"code": 20404})
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        prefix, page, size = q.get("PhoneNumber"), int(q.get("Page", 0)), int(q["PageSize"])
+        with stub.lock:
+            if stub.throttle_next:
+                stub.throttle_next = False
+                return self._send(429, {"code": 20429}, {"Retry-After": "0"})
+            stub.requests.append((prefix, page))
+
+        matching = [n for n in INVENTORY if not prefix or n.startswith(prefix)]
+        start = page * size
+        numbers = [
+            {"phone_number": n, "friendly_name": f"Store {n[-4:]}", "capabilities": {"sms": True, "voice": n.startswith("+1"), "mms": False}}
+            for n in matching[start : start + size]
+        ]
+        next_page_uri = None
+        if start + size < len(matching):
+            params = {"PageSize": size, "Page": page + 1, **({"PhoneNumber": prefix} if prefix else {})}
+            next_page_uri = f"{url.path}?{urlencode(params)}"
+        self._send(200, {"incoming_phone_numbers": numbers, "next_page_uri": next_page_uri, "page": page})
+
+
+@pytest.fixture(scope="module")
+def twilio_stub():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    mp = pytest.MonkeyPatch()
+    mp.setenv("TWILIO_ACCOUNT_SID", ACCOUNT_SID)
+    mp.setenv("TWILIO_AUTH_TOKEN", "test-token")
+    mp.setenv("TWILIO_API_BASE_URL", f"http://127.0.0.1:{port}")
+    yield stub
+    mp.undo()
+    server.shutdown()
+    server.server_close()
+
+
+def _numbers() -> dict[str, dict]:
+    return {r["e164"]: r for r in fetch_all("SELECT id, e164, provider, capabilities, status FROM numbers")}
+
+
+def test_fetch_follows_next_page_uri_and_retries_429(twilio_stub):
+    twilio_stub.requests.clear()
+    twilio_stub.throttle_next = True
+    numbers, pages = twilio_sync.fetch_incoming_numbers(page_size=PAGE_SIZE)
+
+    assert not twilio_stub.throttle_next
+    assert sorted(numbers) == sorted(INVENTORY)
+    assert pages == 4
+    assert twilio_stub.requests == [(None, 0), (None, 1), (None, 2), (None, 3)]
+
+    twilio_stub.requests.clear()
+    numbers, pages = twilio_sync.fetch_incoming_numbers(partitions=["+1201", "+44"], page_size=PAGE_SIZE)
+    assert sorted(numbers) == sorted(INVENTORY)
+    assert pages == 3 + 1
+    assert sorted(twilio_stub.requests, key=str) == sorted(
+        [("+1201", 0), ("+1201", 1), ("+1201", 2), ("+44", 0)], key=str
+    )
+
+
+def test_sync_dry_run_then_apply(twilio_stub, monkeypatch):
+    fetch = twilio_sync.fetch_incoming_numbers
+    monkeypatch.setattr(
+        twilio_sync, "fetch_incoming_numbers", lambda partitions=None: fetch(partitions=partitions, page_size=PAGE_SIZE)
+    )
+    # Typed by hand with punctuation and no provider: matched, not duplicated, stays paused.
+    hand_typed = add_number("+1 (201) 555-0001", None, "US", None, "paused", None)
+    # Released earlier but back on the account.
+    returned = add_number("+12015550002", "twilio", "US", "sms", "released", None)
+    # Gone from the account, in the +1202 range.
+    gone = add_number("+12025550099", "twilio", "US", "sms", "active", None)
+    # Gone from the account but under another provider, so never released.
+    other = add_number("+12025550100", "acme", "US", "sms", "active", None)
+    before = _numbers()
+
+    plan = twilio_sync.sync_twilio_numbers(dry_run=True)
+    assert plan.summary() | {"seconds": 0} == {
+        "fetched": len(INVENTORY),
+        "pages": 4,
+        "new": len(INVENTORY) - 2,
+        "updated": 2,
+        "released": 1,
+        "unchanged": 0,
+        "seconds": 0,
+        "applied": False,
+    }
+    assert _numbers() == before
+
+    # Listing only +1201 must not release +1202 numbers that were never asked about.
+    plan = twilio_sync.sync_twilio_numbers(dry_run=True, partitions=["+1201"])
+    assert plan.summary()["released"] == 0
+
+    plan = twilio_sync.sync_twilio_numbers(dry_run=False)
+    assert plan.applied
+    after = _numbers()
+    assert set(INVENTORY) <= set(after)
+    assert "+1 (201) 555-0001" not in after
+    row = after["+12015550001"]
+    assert (row["id"], row["provider"], row["capabilities"], row["status"]) == (hand_typed, "twilio", "sms, voice", "paused")
+    assert (after["+12015550002"]["id"], after["+12015550002"]["status"]) == (returned, "active")
+    assert after["+447700900001"]["capabilities"] == "sms"
+    assert (after["+12025550099"]["id"], after["+12025550099"]["status"]) == (gone, "released")
+    assert (after["+12025550100"]["id"], after["+12025550100"]["status"]) == (other, "active")
+
+    # A second run finds nothing to do.
+    plan = twilio_sync.sync_twilio_numbers(dry_run=False)
+    assert (plan.summary()["new"], plan.summary()["updated"], plan.summary()["released"]) == (0, 0, 0)
+    assert plan.summary()["unchanged"] == len(INVENTORY)
+    assert not plan.applied
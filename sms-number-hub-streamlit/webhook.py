@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import hmac
 import json
 import os
 from datetime import datetime, timezone
 from typing import Any
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
 from twilio.request_validator import RequestValidator
 
+from lib.admission import AdmissionController, Overloaded
 from lib.db import init_db, log_event, upsert_sms_message
+from lib.env import env_int
 
 
 load_dotenv()
@@ -18,6 +22,17 @@ load_dotenv()
 app = FastAPI(title="SMS Number Hub Webhook", version="1.0.0")
 
 
+# Bursts beyond WEBHOOK_MAX_CONCURRENT wait in a bounded queue; past that (or after
+# WEBHOOK_QUEUE_TIMEOUT_SECONDS) they are shed with 503 + Retry-After instead of piling
+# onto SQLite until every request times out.
+WEBHOOK_QUEUE_TIMEOUT_SECONDS = env_int("WEBHOOK_QUEUE_TIMEOUT_SECONDS", 5)
+admission = AdmissionController(
+    max_concurrent=env_int("WEBHOOK_MAX_CONCURRENT", 4),
+    max_queue=env_int("WEBHOOK_MAX_QUEUE", 100),
+    queue_timeout_seconds=WEBHOOK_QUEUE_TIMEOUT_SECONDS,
+)
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -44,10 +59,49 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.post("/twilio/sms")
-async def twilio_inbound_sms(request: Request) -> Response:
+@app.get("/stats/admission")
+def admission_stats(authorization: str = Header(default="")) -> dict[str, int]:
+    # Not public: without WEBHOOK_STATS_TOKEN configured the endpoint does not exist.
+    token = (os.getenv("WEBHOOK_STATS_TOKEN") or "").strip()
+    if not token:
+        raise HTTPException(status_code=404)
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return admission.snapshot()
+
+
+def _store_inbound_sms(form: dict[str, Any]) -> None:
+    msg_sid = form.get("MessageSid")
+    to_number = (form.get("To") or "").strip()
+    from_number = (form.get("From") or "").strip() or None
+    body = form.get("Body")
+    received_at = _now_iso()
+
+    message_id = upsert_sms_message(
+        provider="twilio",
+        provider_message_sid=str(msg_sid) if msg_sid else None,
+        to_number=to_number,
+        from_number=from_number,
+        body=str(body) if body is not None else None,
+        received_at=received_at,
+        raw_payload={k: (str(v) if v is not None else None) for k, v in form.items()},
+    )
+
+    log_event(
+        level="info",
+        event_type="twilio_inbound_sms",
+        message="Inbound SMS stored.",
+        context={"message_id": message_id, "to": to_number, "from": from_number, "sid": msg_sid},
+    )
+
+
+@app.on_event("startup")
+def _startup() -> None:
     init_db()
 
+
+@app.post("/twilio/sms")
+async def twilio_inbound_sms(request: Request) -> Response:
     try:
         form = dict(await request.form())
     except Exception as e:
@@ -77,30 +131,16 @@ async def twilio_inbound_sms(request: Request) -> Response:
             return Response(content="", media_type="text/xml", status_code=403)
 
     try:
-        msg_sid = form.get("MessageSid")
-        to_number = (form.get("To") or "").strip()
-        from_number = (form.get("From") or "").strip() or None
-        body = form.get("Body")
-        received_at = _now_iso()
-
-        message_id = upsert_sms_message(
-            provider="twilio",
-            provider_message_sid=str(msg_sid) if msg_sid else None,
-            to_number=to_number,
-            from_number=from_number,
-            body=str(body) if body is not None else None,
-            received_at=received_at,
-            raw_payload={k: (str(v) if v is not None else None) for k, v in form.items()},
-        )
-
-        log_event(
-            level="info",
-            event_type="twilio_inbound_sms",
-            message="Inbound SMS stored.",
-            context={"message_id": message_id, "to": to_number, "from": from_number, "sid": msg_sid},
-        )
-
+        async with admission.admit():
+            await run_in_threadpool(_store_inbound_sms, form)
         return Response(content="<?xml version=\"1.0\" encoding=\"UTF-8\"?><Response></Response>", media_type="text/xml")
+    except Overloaded:
+        return Response(
+            content="",
+            media_type="text/xml",
+            status_code=503,
+            headers={"Retry-After": str(max(1, WEBHOOK_QUEUE_TIMEOUT_SECONDS))},
+        )
     except Exception as e:
         log_event(
             level="error",
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.config import INGEST_MAX_CONCURRENT, INGEST_MAX_QUEUE, INGEST_QUEUE_TIMEOUT_SECONDS
+
+
+class Overloaded(Exception):
+    pass
+
+
+class AdmissionController:
+    """Caps concurrent work, with a bounded wait queue in front of it.
+
+    Requests beyond `max_concurrent` wait for a slot; once `max_queue` are already waiting,
+    or a slot does not free up within `queue_timeout_seconds`, admit() raises Overloaded
+    so the caller can shed the request with a retryable status. Runs on the event loop.
+    """
+
+    def __init__(self, *, max_concurrent: int, max_queue: int, queue_timeout_seconds: float) -> None:
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout_seconds = max(0.0, float(queue_timeout_seconds))
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                self.shed_queue_full += 1
+                raise Overloaded()
+            self.waiting += 1
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                raise Overloaded() from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+ingest_admission = AdmissionController(
+    max_concurrent=INGEST_MAX_CONCURRENT,
+    max_queue=INGEST_MAX_QUEUE,
+    queue_timeout_seconds=INGEST_QUEUE_TIMEOUT_SECONDS,
+)
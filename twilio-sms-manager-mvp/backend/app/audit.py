@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.config import AUDIT_BATCH_SIZE, AUDIT_BUFFER_MAX, AUDIT_FLUSH_SECONDS, AUDIT_PER_MESSAGE_INBOUND
+from app.database import SessionLocal
+from app.models import AuditLog
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Buffers audit events in memory and writes them in batches from a background thread.
+
+    The buffer is bounded: when it is full the oldest events are dropped and the drop count
+    is recorded with the next batch. Inbound SMS are collapsed into one aggregate entry per
+    flush unless per-message entries are enabled.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_buffer: int,
+        flush_seconds: float,
+        batch_size: int,
+        per_message_inbound: bool,
+    ) -> None:
+        self.max_buffer = max(1, int(max_buffer))
+        self.flush_seconds = max(0.1, float(flush_seconds))
+        self.batch_size = max(1, int(batch_size))
+        self.per_message_inbound = per_message_inbound
+
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._dropped = 0
+        self._inbound_count = 0
+        self._inbound_first_at: datetime | None = None
+        self._inbound_last_at: datetime | None = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def emit(self, action: str, *, user_id: int | None = None, meta: dict[str, Any] | None = None) -> None:
+        row = {
+            "user_id": user_id,
+            "action": action,
+            "timestamp": datetime.utcnow(),
+            "meta_json": json.dumps(meta) if meta is not None else None,
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._buffer.popleft()
+                self._dropped += 1
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def record_inbound_sms(self, *, message_id: int, to_number: str) -> None:
+        if self.per_message_inbound:
+            self.emit("twilio_inbound_sms", meta={"message_id": message_id, "to": to_number})
+            return
+        now = datetime.utcnow()
+        with self._lock:
+            self._inbound_count += 1
+            self._inbound_first_at = self._inbound_first_at or now
+            self._inbound_last_at = now
+
+    def _drain(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+            if self._inbound_count:
+                rows.append(
+                    {
+                        "user_id": None,
+                        "action": "twilio_inbound_sms",
+                        "timestamp": self._inbound_last_at,
+                        "meta_json": json.dumps(
+                            {
+                                "count": self._inbound_count,
+                                "first_at": self._inbound_first_at.isoformat(),
+                                "last_at": self._inbound_last_at.isoformat(),
+                            }
+                        ),
+                    }
+                )
+                self._inbound_count = 0
+                self._inbound_first_at = self._inbound_last_at = None
+        if dropped:
+            rows.append(
+                {
+                    "user_id": None,
+                    "action": "audit_events_dropped",
+                    "timestamp": datetime.utcnow(),
+                    "meta_json": json.dumps({"count": dropped}),
+                }
+            )
+        return rows
+
+    def flush(self) -> int:
+        rows = self._drain()
+        if not rows:
+            return 0
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to write %d audit events", len(rows))
+            with self._lock:
+                room = self.max_buffer - len(self._buffer)
+                self._dropped += max(0, len(rows) - room)
+                self._buffer.extendleft(reversed(rows[: max(0, room)]))
+            return 0
+        finally:
+            db.close()
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+
+audit_writer = AuditWriter(
+    max_buffer=AUDIT_BUFFER_MAX,
+    flush_seconds=AUDIT_FLUSH_SECONDS,
+    batch_size=AUDIT_BATCH_SIZE,
+    per_message_inbound=AUDIT_PER_MESSAGE_INBOUND,
+)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+from sqlalchemy import select
+
+from app.audit import audit_writer
+from app.cache import dashboard_stats_cache
+from app.config import (
+    BACKFILL_CONCURRENCY,
+    BACKFILL_PAGE_SIZE,
+    TWILIO_ACCOUNT_SID,
+    TWILIO_API_BASE_URL,
+    TWILIO_AUTH_TOKEN,
+)
+from app.database import SessionLocal, insert_ignoring_conflicts
+from app.leases import acquire_lease, keep_lease, lease_held, release_lease
+from app.models import BackfillCursor, Message, PhoneNumber
+from app.number_stats import reconcile_number_stats
+from app.utils import canonical_phone_number, extract_otp_code, normalize_phone_number, safe_json_dumps
+
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+_MAX_ATTEMPTS = 4
+_LEASE = "twilio_backfill"
+
+
+class BackfillUnavailable(Exception):
+    pass
+
+
+def _parse_twilio_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _message_row(number_id: int, m: dict[str, Any]) -> dict[str, Any] | None:
+    sid = (m.get("sid") or "").strip()
+    if not sid or not str(m.get("direction") or "").startswith("inbound"):
+        return None
+    to_number = normalize_phone_number(m.get("to"))
+    body = m.get("body")
+    return {
+        "phone_number_id": number_id,
+        "to_number": to_number,
+        "to_number_normalized": canonical_phone_number(to_number) or None,
+        "from_number": normalize_phone_number(m.get("from")) or None,
+        "message_body": body,
+        "otp_code": extract_otp_code(body),
+        # History is imported as read so it does not flood the unread badges.
+        "is_read": True,
+        "backfilled": True,
+        "provider_message_sid": sid,
+        "raw_payload": safe_json_dumps(m),
+        "received_at": _parse_twilio_date(m.get("date_sent"))
+        or _parse_twilio_date(m.get("date_created"))
+        or datetime.utcnow(),
+    }
+
+
+class TwilioBackfill:
+    """Imports historical inbound messages from the Twilio Messages list API.
+
+    Numbers are paged concurrently. Each page is inserted (SID conflicts skipped) in the
+    same transaction that advances that number's stored next_page_uri, so an interrupted
+    run resumes exactly where it stopped. A job lease keeps it to one worker at a time.
+    """
+
+    def __init__(self, *, concurrency: int, page_size: int) -> None:
+        self.concurrency = max(1, int(concurrency))
+        self.page_size = max(1, min(int(page_size), 1000))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def _running_here(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def running(self) -> bool:
+        """Whether a backfill is running in any worker."""
+        return self._running_here() or lease_held(_LEASE)
+
+    def _first_page_uri(self, twilio_number: str) -> str:
+        query = urlencode({"To": canonical_phone_number(twilio_number), "PageSize": self.page_size})
+        return f"/2010-04-01/Accounts/{TWILIO_ACCOUNT_SID}/Messages.json?{query}"
+
+    def start(self, *, number_ids: list[int] | None = None, restart: bool = False, user_id: int | None = None) -> bool:
+        """Queue the given numbers (default: all) and start the job. False if already running."""
+        if not TWILIO_ACCOUNT_SID or not TWILIO_AUTH_TOKEN:
+            raise BackfillUnavailable("TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set")
+        with self._lock:
+            if self._running_here() or not acquire_lease(_LEASE):
+                return False
+            try:
+                queued = self._prepare(number_ids=number_ids, restart=restart)
+            except Exception:
+                release_lease(_LEASE)
+                raise
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(queued, user_id), name="twilio-backfill", daemon=True
+            )
+            self._thread.start()
+        audit_writer.emit("backfill_started", user_id=user_id, meta={"number_ids": queued, "restart": restart})
+        return True
+
+    def _prepare(self, *, number_ids: list[int] | None, restart: bool) -> list[int]:
+        db = SessionLocal()
+        try:
+            q = select(PhoneNumber.id, PhoneNumber.twilio_number)
+            if number_ids is not None:
+                q = q.where(PhoneNumber.id.in_(number_ids))
+            numbers = db.execute(q).all()
+            cursors = {c.phone_number_id: c for c in db.scalars(select(BackfillCursor)).all()}
+            queued = []
+            for number_id, twilio_number in numbers:
+                c = cursors.get(number_id)
+                if c is None or restart:
+                    c = c or BackfillCursor(phone_number_id=number_id)
+                    c.next_page_uri = self._first_page_uri(twilio_number)
+                    c.pages = c.fetched = c.inserted = 0
+                elif c.status == "done":
+                    continue
+                # Anything else (pending, running after a crash, error) resumes from its cursor.
+                c.status = "pending"
+                c.error = None
+                c.updated_at = datetime.utcnow()
+                db.add(c)
+                queued.append(number_id)
+            db.commit()
+            return queued
+        finally:
+            db.close()
+
+    def _run(self, number_ids: list[int], user_id: int | None) -> None:
+        with keep_lease(_LEASE):
+            self._run_leased(number_ids, user_id)
+
+    def _run_leased(self, number_ids: list[int], user_id: int | None) -> None:
+        started = time.monotonic()
+        with httpx.Client(
+            base_url=TWILIO_API_BASE_URL,
+            auth=(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN),
+            timeout=httpx.Timeout(30, connect=10),
+            limits=httpx.Limits(max_connections=self.concurrency),
+        ) as client, ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="backfill") as pool:
+            results = list(pool.map(lambda number_id: self._backfill_number(client, number_id), number_ids))
+        dashboard_stats_cache.clear()
+        audit_writer.emit(
+            "backfill_finished",
+            user_id=user_id,
+            meta={
+                "numbers": len(number_ids),
+                "inserted": sum(results),
+                "seconds": round(time.monotonic() - started, 1),
+                "stopped": self._stopping.is_set(),
+            },
+        )
+
+    def _get_page(self, client: httpx.Client, uri: str) -> dict[str, Any]:
+        for attempt in range(_MAX_ATTEMPTS):
+            r = client.get(uri)
+            if r.status_code not in _RETRY_STATUS_CODES or attempt + 1 >= _MAX_ATTEMPTS:
+                r.raise_for_status()
+                return r.json()
+            retry_after = r.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else 2**attempt)
+        raise RuntimeError("unreachable")
+
+    def _backfill_number(self, client: httpx.Client, number_id: int) -> int:
+        inserted_total = 0
+        db = SessionLocal()
+        try:
+            cursor = db.get(BackfillCursor, number_id)
+            cursor.status = "running"
+            db.commit()
+            while cursor.next_page_uri and not self._stopping.is_set():
+                page = self._get_page(client, cursor.next_page_uri)
+                messages = page.get("messages") or []
+                rows = [row for row in (_message_row(number_id, m) for m in messages) if row is not None]
+                inserted = 0
+                if rows:
+                    inserted = len(
+                        insert_ignoring_conflicts(
+                            db, Message, rows, index_elements=[Message.provider_message_sid], returning=(Message.id,)
+                        )
+                    )
+                if inserted:
+                    # Counters move with each page so the message-list ETag changes as
+                    # history lands, not only once the number is finished.
+                    reconcile_number_stats(db, [number_id])
+                cursor.next_page_uri = page.get("next_page_uri") or None
+                cursor.pages += 1
+                cursor.fetched += len(messages)
+                cursor.inserted += inserted
+                cursor.updated_at = datetime.utcnow()
+                db.commit()
+                inserted_total += inserted
+
+            if not cursor.next_page_uri:
+                cursor.status = "done"
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception("Backfill failed for number %s", number_id)
+            cursor = db.get(BackfillCursor, number_id)
+            if cursor is not None:
+                cursor.status = "error"
+                cursor.error = str(e)[:500]
+                cursor.updated_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+        return inserted_total
+
+    def stop(self) -> None:
+        """Stop after the pages in flight; cursors stay resumable."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+
+
+twilio_backfill = TwilioBackfill(concurrency=BACKFILL_CONCURRENCY, page_size=BACKFILL_PAGE_SIZE)
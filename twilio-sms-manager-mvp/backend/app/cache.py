@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Hashable
+
+from sqlalchemy import delete, func, insert, select
+
+from app.config import (
+    BACKEND_WORKERS,
+    CACHE_SYNC_INTERVAL_MS,
+    DASHBOARD_STATS_CACHE_SECONDS,
+    RECENT_SID_CACHE_SECONDS,
+    RECENT_SID_CACHE_SIZE,
+    USER_CACHE_SECONDS,
+)
+from app.database import engine, read_engine
+from app.models import CacheInvalidation
+
+
+logger = logging.getLogger(__name__)
+
+_SHARED = BACKEND_WORKERS > 1
+_RETENTION = timedelta(hours=1)
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl_seconds``.
+
+    A cache created with a ``name`` is shared across worker processes: its invalidations
+    are published to the cache_invalidations table and replayed by the other workers
+    (see sync_invalidations). Full clears are coalesced to at most one published row per
+    CACHE_SYNC_INTERVAL_MS, so a burst of writes (e.g. webhook ingest) adds one extra
+    write per interval rather than one per message. In single-worker mode this costs nothing.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024, *, name: str | None = None) -> None:
+        self.ttl_seconds = float(ttl_seconds)
+        self.maxsize = max(1, int(maxsize))
+        self.name = name
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._clear_published_at = 0.0
+        self._clear_timer: threading.Timer | None = None
+        if name is not None:
+            _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if self.name is not None and _SHARED:
+            sync_invalidations()
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        if self.ttl_seconds <= 0 and ttl_seconds is None:
+            return
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else float(ttl_seconds))
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._drop(key)
+        if self.name is not None and _SHARED:
+            _publish(self.name, key)
+
+    def clear(self) -> None:
+        self._drop(None)
+        if self.name is not None and _SHARED:
+            self._publish_clear()
+
+    def _publish_clear(self) -> None:
+        # Leading publish, then at most one trailing publish per interval, so the last
+        # clear in a burst always reaches the other workers.
+        with self._lock:
+            wait = self._clear_published_at + CACHE_SYNC_INTERVAL_MS / 1000 - time.monotonic()
+            if wait > 0:
+                if self._clear_timer is None:
+                    self._clear_timer = threading.Timer(wait, self._flush_clear)
+                    self._clear_timer.daemon = True
+                    self._clear_timer.start()
+                return
+            self._clear_published_at = time.monotonic()
+        _publish(self.name, None)
+
+    def _flush_clear(self) -> None:
+        with self._lock:
+            self._clear_timer = None
+            self._clear_published_at = time.monotonic()
+        _publish(self.name, None)
+
+    def _drop(self, key: Hashable | None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+_registry: dict[str, TTLCache] = {}
+_sync_lock = threading.Lock()
+_last_seen_id: int | None = None
+_next_sync_at = 0.0
+_next_prune_at = 0.0
+
+
+def _publish(name: str, key: Hashable | None) -> None:
+    global _next_prune_at
+    now = datetime.utcnow()
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                insert(CacheInvalidation).values(
+                    cache_name=name,
+                    cache_key=json.dumps(key) if key is not None else None,
+                    created_at=now,
+                )
+            )
+            if time.monotonic() >= _next_prune_at:
+                _next_prune_at = time.monotonic() + 600
+                conn.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < now - _RETENTION))
+    except Exception:
+        # Other workers fall back to TTL expiry for this change.
+        logger.exception("Failed to publish invalidation for cache %s", name)
+
+
+def _decode_key(raw: str) -> Hashable:
+    key = json.loads(raw)
+    return tuple(key) if isinstance(key, list) else key
+
+
+def sync_invalidations() -> None:
+    """Apply invalidations published by other workers since the last poll.
+
+    Polls at most every CACHE_SYNC_INTERVAL_MS, and only one thread polls at a time; the
+    query is a primary-key range scan, usually empty.
+    """
+    global _last_seen_id, _next_sync_at
+    if time.monotonic() < _next_sync_at or not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        _next_sync_at = time.monotonic() + CACHE_SYNC_INTERVAL_MS / 1000
+        with read_engine.connect() as conn:
+            if _last_seen_id is None:
+                # Caches start empty, so earlier changes are irrelevant to this process.
+                _last_seen_id = conn.execute(select(func.max(CacheInvalidation.id))).scalar() or 0
+                return
+            rows = conn.execute(
+                select(CacheInvalidation.id, CacheInvalidation.cache_name, CacheInvalidation.cache_key)
+                .where(CacheInvalidation.id > _last_seen_id)
+                .order_by(CacheInvalidation.id)
+            ).all()
+        for row_id, name, raw_key in rows:
+            cache = _registry.get(name)
+            if cache is not None:
+                cache._drop(_decode_key(raw_key) if raw_key is not None else None)
+            _last_seen_id = row_id
+    except Exception:
+        logger.exception("Failed to poll cache invalidations")
+    finally:
+        _sync_lock.release()
+
+
+dashboard_stats_cache = TTLCache(DASHBOARD_STATS_CACHE_SECONDS, name="dashboard_stats")
+user_cache = TTLCache(USER_CACHE_SECONDS, name="users")
+# Decoded JWT claims never change for a given token, so this one stays process-local.
+token_cache = TTLCache(300, maxsize=4096)
+# MessageSids already stored; Twilio retries are acknowledged from here without touching
+# the database. SIDs never change, so this one is process-local as well.
+recent_sid_cache = TTLCache(RECENT_SID_CACHE_SECONDS, maxsize=RECENT_SID_CACHE_SIZE)
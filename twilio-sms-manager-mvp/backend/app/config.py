@@ -29,15 +29,64 @@ if DATABASE_URL.startswith("sqlite:///"):
         abs_path = (repo_root / sqlite_path[2:]).resolve()
         DATABASE_URL = f"sqlite:///{abs_path}"
 
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT_SECONDS = _env_int("DB_POOL_TIMEOUT_SECONDS", 30)
+SQLITE_BUSY_TIMEOUT_MS = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_CACHE_SIZE_KIB = _env_int("SQLITE_CACHE_SIZE_KIB", 20000)
+SQLITE_MMAP_SIZE_MB = _env_int("SQLITE_MMAP_SIZE_MB", 128)
+
 JWT_SECRET = (os.getenv("JWT_SECRET") or "change-me").strip()
 JWT_ALGORITHM = (os.getenv("JWT_ALGORITHM") or "HS256").strip()
 ACCESS_TOKEN_EXPIRE_MINUTES = _env_int("ACCESS_TOKEN_EXPIRE_MINUTES", 12 * 60)
 
 ENFORCE_TWILIO_SIGNATURE = _env_bool("ENFORCE_TWILIO_SIGNATURE", True)
 TWILIO_AUTH_TOKEN = (os.getenv("TWILIO_AUTH_TOKEN") or "").strip()
+TWILIO_ACCOUNT_SID = (os.getenv("TWILIO_ACCOUNT_SID") or "").strip()
+TWILIO_API_BASE_URL = (os.getenv("TWILIO_API_BASE_URL") or "https://api.twilio.com").strip().rstrip("/")
+
+BACKFILL_CONCURRENCY = _env_int("BACKFILL_CONCURRENCY", 4)
+BACKFILL_PAGE_SIZE = _env_int("BACKFILL_PAGE_SIZE", 1000)
 
 OTP_VISIBILITY_MINUTES = _env_int("OTP_VISIBILITY_MINUTES", 10)
 
+INGEST_WORKERS = _env_int("INGEST_WORKERS", 1)
+# Admitted requests each occupy an ingest thread; more slots than threads would only
+# move the wait into the executor's unbounded queue.
+INGEST_MAX_CONCURRENT = max(1, min(_env_int("INGEST_MAX_CONCURRENT", INGEST_WORKERS), INGEST_WORKERS))
+INGEST_MAX_QUEUE = _env_int("INGEST_MAX_QUEUE", 200)
+INGEST_QUEUE_TIMEOUT_SECONDS = _env_int("INGEST_QUEUE_TIMEOUT_SECONDS", 5)
+RECENT_SID_CACHE_SECONDS = _env_int("RECENT_SID_CACHE_SECONDS", 3600)
+RECENT_SID_CACHE_SIZE = _env_int("RECENT_SID_CACHE_SIZE", 20000)
+
+OTP_WAIT_MAX_WAITERS = _env_int("OTP_WAIT_MAX_WAITERS", 500)
+OTP_WAIT_MAX_SECONDS = _env_int("OTP_WAIT_MAX_SECONDS", 30)
+OTP_WAIT_RECHECK_SECONDS = _env_int("OTP_WAIT_RECHECK_SECONDS", 2)
+
+RESPONSE_COMPRESSION_MIN_BYTES = _env_int("RESPONSE_COMPRESSION_MIN_BYTES", 1024)
+
+AUDIT_FLUSH_SECONDS = _env_int("AUDIT_FLUSH_SECONDS", 2)
+AUDIT_BATCH_SIZE = _env_int("AUDIT_BATCH_SIZE", 500)
+AUDIT_BUFFER_MAX = _env_int("AUDIT_BUFFER_MAX", 10000)
+AUDIT_PER_MESSAGE_INBOUND = _env_bool("AUDIT_PER_MESSAGE_INBOUND", False)
+
+DASHBOARD_STATS_CACHE_SECONDS = _env_int("DASHBOARD_STATS_CACHE_SECONDS", 5)
+USER_CACHE_SECONDS = _env_int("USER_CACHE_SECONDS", 60)
+
+# Set by run_backend.sh; with more than one worker, cache invalidations are shared through
+# the cache_invalidations table and polled at most every CACHE_SYNC_INTERVAL_MS.
+BACKEND_WORKERS = _env_int("BACKEND_WORKERS", 1)
+CACHE_SYNC_INTERVAL_MS = _env_int("CACHE_SYNC_INTERVAL_MS", 250)
+
+NUMBER_STATS_RECONCILE_SECONDS = _env_int("NUMBER_STATS_RECONCILE_SECONDS", 3600)
+# Background jobs (stats reconciler, backfill) hold a row in job_leases while they run, so
+# only one worker runs each; a lease left by a dead worker expires after JOB_LEASE_SECONDS.
+JOB_LEASE_SECONDS = _env_int("JOB_LEASE_SECONDS", 60)
+
+# Processes used to hash passwords for bulk user creation; 0 means one per CPU.
+PASSWORD_HASH_WORKERS = _env_int("PASSWORD_HASH_WORKERS", 0)
+BULK_USERS_MAX = _env_int("BULK_USERS_MAX", 5000)
+
 ADMIN_USERNAME = (os.getenv("ADMIN_USERNAME") or "admin").strip().lower()
 ADMIN_PASSWORD = (os.getenv("ADMIN_PASSWORD") or "").strip()
 ADMIN_EMAIL = (os.getenv("ADMIN_EMAIL") or "").strip() or None
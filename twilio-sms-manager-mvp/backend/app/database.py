@@ -1,21 +1,129 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert, make_url
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KIB,
+    SQLITE_MMAP_SIZE_MB,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
+_IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def _uses_queue_pool() -> bool:
+    """In-memory SQLite gets a singleton pool that rejects the QueuePool sizing options."""
+    url = make_url(DATABASE_URL)
+    if url.get_backend_name() != "sqlite":
+        return True
+    return url.database not in (None, "", ":memory:") and url.query.get("mode") != "memory"
+
+
+def _create_engine():
+    pool_options = {}
+    if _uses_queue_pool():
+        pool_options = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        }
+    return create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False} if _IS_SQLITE else {},
+        pool_pre_ping=not _IS_SQLITE,
+        **pool_options,
+    )
+
+
+def _apply_sqlite_pragmas(dbapi_conn, *, read_only: bool) -> None:
+    cur = dbapi_conn.cursor()
+    try:
+        # WAL lets readers run while the webhook writer holds the write lock.
+        cur.execute("PRAGMA journal_mode = WAL")
+        cur.execute("PRAGMA synchronous = NORMAL")
+        cur.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)}")
+        cur.execute("PRAGMA temp_store = MEMORY")
+        cur.execute(f"PRAGMA cache_size = -{int(SQLITE_CACHE_SIZE_KIB)}")
+        cur.execute(f"PRAGMA mmap_size = {int(SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+        if read_only:
+            cur.execute("PRAGMA query_only = ON")
+    finally:
+        cur.close()
+
+
+engine = _create_engine()
+
+# GET routes use a separate pool of query-only connections so reads never queue
+# behind (or take) the write lock.
+read_engine = _create_engine() if _IS_SQLITE else engine
+
+if _IS_SQLITE:
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record) -> None:
+        _apply_sqlite_pragmas(dbapi_conn, read_only=False)
+
+    @event.listens_for(read_engine, "connect")
+    def _on_read_connect(dbapi_conn, _record) -> None:
+        _apply_sqlite_pragmas(dbapi_conn, read_only=True)
+
+
+_ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def supports_on_conflict(db) -> bool:
+    """Whether the session's database accepts INSERT ... ON CONFLICT."""
+    return db.get_bind().dialect.name in _ON_CONFLICT_INSERTS
+
+
+def dialect_insert(db, entity):
+    """INSERT construct with on_conflict_* support; only call where supports_on_conflict(db)."""
+    return _ON_CONFLICT_INSERTS[db.get_bind().dialect.name](entity)
+
+
+def insert_ignoring_conflicts(db, entity, rows: list[dict], *, index_elements: list, returning: tuple = ()) -> list[tuple]:
+    """Insert `rows`, skipping any that collide on the unique `index_elements`.
+
+    Returns the `returning` columns of the rows actually inserted, in order. SQLite and
+    PostgreSQL use a single INSERT ... ON CONFLICT DO NOTHING. Other databases insert row
+    by row, each in a SAVEPOINT, and skip rows that raise IntegrityError; there `returning`
+    may only name the primary key and columns present in the rows.
+    """
+    if not rows:
+        return []
+    if supports_on_conflict(db):
+        stmt = dialect_insert(db, entity).on_conflict_do_nothing(index_elements=index_elements)
+        if not returning:
+            db.execute(stmt, rows)
+            return []
+        return [tuple(r) for r in db.execute(stmt.returning(*returning), rows)]
+
+    inserted = []
+    for row in rows:
+        try:
+            with db.begin_nested():
+                result = db.execute(insert(entity).values(**row))
+        except IntegrityError:
+            continue
+        pk = result.inserted_primary_key[0]
+        inserted.append(tuple(pk if col.expression.primary_key else row[col.key] for col in returning))
+    return inserted
+
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db():
@@ -24,3 +132,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
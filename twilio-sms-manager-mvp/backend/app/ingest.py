@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select
+
+from app.audit import audit_writer
+from app.cache import dashboard_stats_cache, recent_sid_cache
+from app.config import INGEST_WORKERS
+from app.database import SessionLocal, insert_ignoring_conflicts
+from app.models import Message, PhoneNumber
+from app.number_stats import record_inbound
+from app.utils import canonical_phone_number, extract_otp_code, normalize_phone_number, safe_json_dumps
+
+
+# Inbound messages are written on a small dedicated pool so the event loop never waits on
+# SQLite; a single worker (the default) also serializes writers instead of having them
+# contend for the database lock.
+_executor = ThreadPoolExecutor(max_workers=max(1, INGEST_WORKERS), thread_name_prefix="ingest")
+
+
+def store_inbound_message(form: dict[str, Any]) -> int:
+    """Store an inbound message and return its id.
+
+    A MessageSid that is already stored (a Twilio retry) is not an error: the existing
+    message id is returned and nothing is written.
+    """
+    to_number = normalize_phone_number((form.get("To") or "").strip())
+    from_number = normalize_phone_number((form.get("From") or "").strip()) or None
+    body = form.get("Body")
+    sid = (form.get("MessageSid") or "").strip() or None
+
+    db = SessionLocal()
+    try:
+        number = (
+            db.query(PhoneNumber)
+            .filter(PhoneNumber.normalized_number == canonical_phone_number(to_number))
+            .first()
+        )
+        otp = extract_otp_code(str(body) if body is not None else None)
+        received_at = datetime.utcnow()
+
+        row = {
+            "phone_number_id": number.id if number is not None else None,
+            "to_number": to_number,
+            "to_number_normalized": canonical_phone_number(to_number) or None,
+            "from_number": from_number,
+            "message_body": str(body) if body is not None else None,
+            "otp_code": otp,
+            "is_read": False,
+            "provider_message_sid": sid,
+            "raw_payload": safe_json_dumps({k: (str(v) if v is not None else None) for k, v in form.items()}),
+            "received_at": received_at,
+        }
+        inserted = insert_ignoring_conflicts(
+            db, Message, [row], index_elements=[Message.provider_message_sid], returning=(Message.id,)
+        )
+        message_id = inserted[0][0] if inserted else None
+
+        if message_id is None:
+            db.rollback()
+            message_id = db.execute(select(Message.id).where(Message.provider_message_sid == sid)).scalar_one()
+            recent_sid_cache.set(sid, message_id)
+            return message_id
+
+        if number is not None:
+            record_inbound(db, phone_number_id=number.id, received_at=received_at, has_otp=otp is not None)
+        db.commit()
+    finally:
+        db.close()
+    if sid is not None:
+        recent_sid_cache.set(sid, message_id)
+    dashboard_stats_cache.clear()
+    audit_writer.record_inbound_sms(message_id=message_id, to_number=to_number)
+    return message_id
+
+
+async def ingest_inbound_message(form: dict[str, Any]) -> int:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, store_inbound_message, form)
+
+
+def shutdown_ingest() -> None:
+    _executor.shutdown(wait=True)
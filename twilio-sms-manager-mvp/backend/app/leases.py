@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import or_, select, update
+
+from app.config import JOB_LEASE_SECONDS
+from app.database import SessionLocal, insert_ignoring_conflicts
+from app.models import JobLease
+
+
+# Identifies this worker process in job_leases.owner.
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(name: str, seconds: float = JOB_LEASE_SECONDS) -> bool:
+    """Take or renew the lease on `name` for `seconds`. False if another live worker holds it.
+
+    The check and the claim are one UPDATE, so two workers racing for a free or expired
+    lease cannot both win.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        insert_ignoring_conflicts(db, JobLease, [{"name": name}], index_elements=[JobLease.name])
+        claimed = db.execute(
+            update(JobLease)
+            .where(
+                JobLease.name == name,
+                or_(JobLease.owner.is_(None), JobLease.owner == OWNER, JobLease.expires_at < now),
+            )
+            .values(owner=OWNER, expires_at=now + timedelta(seconds=seconds))
+        ).rowcount
+        db.commit()
+        return claimed == 1
+    finally:
+        db.close()
+
+
+def release_lease(name: str) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(JobLease).where(JobLease.name == name, JobLease.owner == OWNER).values(owner=None, expires_at=None)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def lease_held(name: str) -> bool:
+    """Whether any worker, this one included, holds an unexpired lease on `name`."""
+    db = SessionLocal()
+    try:
+        expires_at = db.execute(
+            select(JobLease.expires_at).where(JobLease.name == name, JobLease.owner.is_not(None))
+        ).scalar()
+        return expires_at is not None and expires_at >= datetime.utcnow()
+    finally:
+        db.close()
+
+
+@contextmanager
+def keep_lease(name: str, seconds: float = JOB_LEASE_SECONDS) -> Iterator[None]:
+    """Renew an acquired lease in the background until the block exits, then release it."""
+    done = threading.Event()
+
+    def renew() -> None:
+        while not done.wait(seconds / 3):
+            acquire_lease(name, seconds)
+
+    thread = threading.Thread(target=renew, name=f"lease-{name}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join(timeout=10)
+        release_lease(name)
@@ -4,26 +4,56 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from fastapi import FastAPI
-
-from app.bootstrap import bootstrap_admin
-from app.database import Base, engine
-from app.routers import auth, dashboard, logs, messages, numbers, users, webhook
-
-app = FastAPI(title="Multi-Number SMS Manager", version="0.1.0")
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.audit import audit_writer
+from app.backfill import twilio_backfill
+from app.config import BACKEND_WORKERS, RESPONSE_COMPRESSION_MIN_BYTES
+from app.ingest import shutdown_ingest
+from app.number_stats import start_reconciler, stop_reconciler
+from app.passwords import shutdown_hash_pool
+from app.prestart import prestart
+from app.routers import auth, backfill, dashboard, inbox, logs, messages, numbers, users, webhook
+
+app = FastAPI(title="Multi-Number SMS Manager", version="0.1.0", default_response_class=ORJSONResponse)
+
+# Brotli when the optional brotli-asgi package is installed (it falls back to gzip for
+# clients that don't accept br), plain gzip otherwise. Small responses are left alone.
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_BYTES)
+else:
+    app.add_middleware(BrotliMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_BYTES, gzip_fallback=True)
 
 
 @app.on_event("startup")
 def _startup() -> None:
-    Base.metadata.create_all(bind=engine)
-    bootstrap_admin()
+    # With several workers run_backend.sh has already run prestart once, before forking.
+    if BACKEND_WORKERS <= 1:
+        prestart()
+    audit_writer.start()
+    start_reconciler()
+
+
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    twilio_backfill.stop()
+    stop_reconciler()
+    shutdown_ingest()
+    shutdown_hash_pool()
+    audit_writer.stop()
 
 
 app.include_router(auth.router)
 app.include_router(numbers.router)
 app.include_router(messages.router)
+app.include_router(inbox.router)
 app.include_router(users.router)
 app.include_router(dashboard.router)
 app.include_router(logs.router)
+app.include_router(backfill.router)
 app.include_router(webhook.router)
 
 
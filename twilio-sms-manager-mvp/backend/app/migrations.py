@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic import command, op
+from alembic.config import Config
+from sqlalchemy import Engine, inspect
+
+
+_BACKEND_DIR = Path(__file__).resolve().parents[1]
+BASELINE_REVISION = "0001"
+
+
+def _alembic_config() -> Config:
+    cfg = Config(str(_BACKEND_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(_BACKEND_DIR / "migrations"))
+    return cfg
+
+
+def run_migrations(engine: Engine) -> None:
+    """Upgrade the database to the latest revision (online, at startup).
+
+    Databases created by create_all before migrations existed have tables but no
+    alembic_version; they are stamped at the baseline first.
+    """
+    cfg = _alembic_config()
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        insp = inspect(conn)
+        if insp.has_table("users") and not insp.has_table("alembic_version"):
+            command.stamp(cfg, BASELINE_REVISION)
+        command.upgrade(cfg, "head")
+
+
+# Helpers for revisions that must tolerate databases already patched by the
+# pre-Alembic startup upgrade.
+
+
+def add_column_if_missing(table: str, column: sa.Column) -> None:
+    existing = {c["name"] for c in inspect(op.get_bind()).get_columns(table)}
+    if column.name not in existing:
+        op.add_column(table, column)
+
+
+def create_index_if_missing(name: str, table: str, columns: list[str], *, unique: bool = False) -> None:
+    existing = {ix["name"] for ix in inspect(op.get_bind()).get_indexes(table)}
+    if name not in existing:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def drop_index_if_exists(name: str, table: str) -> None:
+    existing = {ix["name"] for ix in inspect(op.get_bind()).get_indexes(table)}
+    if name in existing:
+        op.drop_index(name, table_name=table)
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, false
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.database import Base
+from app.utils import canonical_phone_number
 
 
 class User(Base):
@@ -16,6 +17,7 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String(255))
     role: Mapped[str] = mapped_column(String(20), default="user")
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
@@ -27,14 +29,31 @@ class PhoneNumber(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     twilio_number: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+    normalized_number: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)
     label: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="active")
+    read_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     assigned_user_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
     assigned_user: Mapped[User | None] = relationship("User", back_populates="numbers")
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    @validates("twilio_number")
+    def _set_normalized_number(self, _key: str, value: str) -> str:
+        self.normalized_number = canonical_phone_number(value) or None
+        return value
+
+
+class PhoneNumberStats(Base):
+    __tablename__ = "phone_number_stats"
+
+    phone_number_id: Mapped[int] = mapped_column(Integer, ForeignKey("phone_numbers.id"), primary_key=True)
+    unread_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    total_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    last_received_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_otp_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
 
 class Message(Base):
     __tablename__ = "messages"
@@ -43,17 +62,62 @@ class Message(Base):
 
     phone_number_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("phone_numbers.id"), nullable=True)
     to_number: Mapped[str] = mapped_column(String(50), index=True)
+    to_number_normalized: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)
     from_number: Mapped[str | None] = mapped_column(String(50), nullable=True)
 
     message_body: Mapped[str | None] = mapped_column(Text, nullable=True)
     otp_code: Mapped[str | None] = mapped_column(String(20), nullable=True)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Imported from Twilio history rather than delivered by the webhook.
+    backfilled: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
 
     provider_message_sid: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    raw_payload: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Only the admin debug endpoint needs the original webhook payload.
+    raw_payload: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
 
     received_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (
+        Index("ix_messages_number_received", "phone_number_id", "received_at"),
+        Index("ix_messages_number_unread", "phone_number_id", "is_read"),
+        Index("ix_messages_provider_message_sid", "provider_message_sid", unique=True),
+    )
+
+    @validates("to_number")
+    def _set_to_number_normalized(self, _key: str, value: str) -> str:
+        self.to_number_normalized = canonical_phone_number(value) or None
+        return value
+
+
+class BackfillCursor(Base):
+    __tablename__ = "backfill_cursors"
+
+    phone_number_id: Mapped[int] = mapped_column(Integer, ForeignKey("phone_numbers.id"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    next_page_uri: Mapped[str | None] = mapped_column(Text, nullable=True)
+    pages: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    fetched: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    inserted: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class JobLease(Base):
+    __tablename__ = "job_leases"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    owner: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class CacheInvalidation(Base):
+    __tablename__ = "cache_invalidations"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    cache_name: Mapped[str] = mapped_column(String(50))
+    cache_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
@@ -64,6 +128,7 @@ class AuditLog(Base):
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     meta_json: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-
-Index("idx_messages_to_number", Message.to_number)
-Index("idx_messages_received_at", Message.received_at)
+    __table_args__ = (
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp"),
+        Index("ix_audit_logs_user_timestamp", "user_id", "timestamp"),
+    )
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import case, exists, func, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import NUMBER_STATS_RECONCILE_SECONDS
+from app.database import SessionLocal, dialect_insert, supports_on_conflict
+from app.leases import acquire_lease, release_lease
+from app.models import Message, PhoneNumber, PhoneNumberStats
+
+
+logger = logging.getLogger(__name__)
+
+
+# Per-number counters are kept in step with `messages` by the writers themselves (ingest and
+# mark-read update them in the same transaction), so listing badges never has to count
+# messages. reconcile_number_stats() recomputes them from `messages` to repair any drift.
+
+
+def _latest(column, value: datetime):
+    return case((or_(column.is_(None), column < value), value), else_=column)
+
+
+def record_inbound(db: Session, *, phone_number_id: int, received_at: datetime, has_otp: bool) -> None:
+    S = PhoneNumberStats
+    row = {
+        "phone_number_id": phone_number_id,
+        "unread_count": 1,
+        "total_count": 1,
+        "last_received_at": received_at,
+        "last_otp_at": received_at if has_otp else None,
+    }
+    changes = {
+        "unread_count": S.unread_count + 1,
+        "total_count": S.total_count + 1,
+        "last_received_at": _latest(S.last_received_at, received_at),
+    }
+    if has_otp:
+        changes["last_otp_at"] = _latest(S.last_otp_at, received_at)
+
+    if supports_on_conflict(db):
+        stmt = dialect_insert(db, PhoneNumberStats).values(**row)
+        db.execute(stmt.on_conflict_do_update(index_elements=[S.phone_number_id], set_=changes))
+        return
+
+    # Portable upsert: update, else insert; a concurrent first insert surfaces as an
+    # IntegrityError inside the savepoint, after which the update applies.
+    bump = update(S).where(S.phone_number_id == phone_number_id).values(**changes)
+    if db.execute(bump).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(S).values(**row))
+    except IntegrityError:
+        db.execute(bump)
+
+
+def adjust_unread(db: Session, *, phone_number_id: int, delta: int) -> None:
+    S = PhoneNumberStats
+    db.execute(
+        update(S)
+        .where(S.phone_number_id == phone_number_id)
+        .values(unread_count=case((S.unread_count + delta < 0, 0), else_=S.unread_count + delta))
+    )
+
+
+def reconcile_number_stats(db: Session, number_ids: list[int] | None = None) -> int:
+    """Recompute counters from `messages` and fix rows that drifted. Returns rows repaired.
+
+    Each statement computes and writes in one step, so a message ingested concurrently
+    cannot be overwritten by a stale count.
+    """
+    S, M = PhoneNumberStats, Message
+    scope = [S.phone_number_id.in_(number_ids)] if number_ids is not None else []
+
+    missing = select(PhoneNumber.id, literal(0), literal(0)).where(
+        ~exists().where(S.phone_number_id == PhoneNumber.id)
+    )
+    if number_ids is not None:
+        missing = missing.where(PhoneNumber.id.in_(number_ids))
+    db.execute(insert(S).from_select(["phone_number_id", "unread_count", "total_count"], missing))
+
+    of_number = M.phone_number_id == S.phone_number_id
+    actual = {
+        S.unread_count: select(func.count()).where(of_number, M.is_read.is_(False)).scalar_subquery(),
+        S.total_count: select(func.count()).where(of_number).scalar_subquery(),
+        S.last_received_at: select(func.max(M.received_at)).where(of_number).scalar_subquery(),
+        S.last_otp_at: select(func.max(M.received_at)).where(of_number, M.otp_code.is_not(None)).scalar_subquery(),
+    }
+    drifted = or_(*(column.is_distinct_from(value) for column, value in actual.items()))
+    repaired = db.execute(
+        update(S).where(*scope, drifted).values({column.key: value for column, value in actual.items()})
+    ).rowcount
+    return max(repaired, 0)
+
+
+_LEASE = "number_stats_reconcile"
+
+
+def _reconcile_loop(stop: threading.Event, interval: float) -> None:
+    while not stop.wait(interval):
+        # One worker reconciles; the lease outlives the interval so the holder keeps it,
+        # and passes to another worker only if the holder stops renewing.
+        try:
+            if not acquire_lease(_LEASE, interval * 2):
+                continue
+        except Exception:
+            logger.exception("Could not take the number stats reconcile lease")
+            continue
+        db = SessionLocal()
+        try:
+            repaired = reconcile_number_stats(db)
+            db.commit()
+            if repaired:
+                logger.warning("Repaired unread counters for %d numbers", repaired)
+        except Exception:
+            db.rollback()
+            logger.exception("Number stats reconciliation failed")
+        finally:
+            db.close()
+
+
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def start_reconciler() -> None:
+    global _thread
+    if NUMBER_STATS_RECONCILE_SECONDS <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_reconcile_loop,
+        args=(_stop, float(NUMBER_STATS_RECONCILE_SECONDS)),
+        name="number-stats-reconciler",
+        daemon=True,
+    )
+    _thread.start()
+
+
+def stop_reconciler() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=10)
+        _thread = None
+        release_lease(_LEASE)
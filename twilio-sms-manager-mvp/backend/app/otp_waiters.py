@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+
+from app.config import OTP_WAIT_MAX_WAITERS
+
+
+class WaitersFull(Exception):
+    pass
+
+
+class OtpWaiters:
+    """Requests parked until a message arrives for a number, keyed by normalized number.
+
+    Lives on the event loop: register/release/notify must be called from async code.
+    The total number of parked requests is bounded.
+    """
+
+    def __init__(self, max_waiters: int) -> None:
+        self.max_waiters = max(1, int(max_waiters))
+        self._events: dict[str, set[asyncio.Event]] = defaultdict(set)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def register(self, number: str) -> asyncio.Event:
+        if self._count >= self.max_waiters:
+            raise WaitersFull()
+        event = asyncio.Event()
+        self._events[number].add(event)
+        self._count += 1
+        return event
+
+    def release(self, number: str, event: asyncio.Event) -> None:
+        events = self._events.get(number)
+        if events is None or event not in events:
+            return
+        events.discard(event)
+        self._count -= 1
+        if not events:
+            del self._events[number]
+
+    def notify(self, number: str) -> None:
+        for event in self._events.get(number, ()):
+            event.set()
+
+
+otp_waiters = OtpWaiters(OTP_WAIT_MAX_WAITERS)
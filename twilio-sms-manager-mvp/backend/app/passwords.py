@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.config import PASSWORD_HASH_WORKERS
+
+
+_pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def hash_password(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return _pwd_context.verify(password, password_hash)
+
+
+def _hash_workers() -> int:
+    return PASSWORD_HASH_WORKERS if PASSWORD_HASH_WORKERS > 0 else (os.cpu_count() or 1)
+
+
+def _hash_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned, not forked: the server process has live threads (audit writer,
+                # ingest, reconciler) and database connections that must not be copied.
+                _pool = ProcessPoolExecutor(
+                    max_workers=_hash_workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash many passwords, in order, spread over a process pool.
+
+    bcrypt is CPU-bound and holds the GIL for part of each hash, so threads do not
+    help; each worker process hashes a chunk. Small batches are hashed inline.
+    """
+    workers = _hash_workers()
+    if len(passwords) < 2 or workers <= 1:
+        return [hash_password(p) for p in passwords]
+    chunksize = max(1, math.ceil(len(passwords) / (workers * 4)))
+    return list(_hash_pool().map(hash_password, passwords, chunksize=chunksize))
+
+
+def shutdown_hash_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
@@ -0,0 +1,18 @@
+"""One-time setup run by run_backend.sh before uvicorn forks its workers."""
+from __future__ import annotations
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.bootstrap import bootstrap_admin
+from app.database import engine
+from app.migrations import run_migrations
+
+
+def prestart() -> None:
+    run_migrations(engine)
+    bootstrap_admin()
+
+
+if __name__ == "__main__":
+    prestart()
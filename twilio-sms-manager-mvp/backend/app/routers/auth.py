@@ -5,8 +5,9 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.audit import audit_writer
 from app.database import get_db
-from app.models import AuditLog, User
+from app.models import User
 from app.schemas import LoginRequest, LoginResponse, UserPublic
 from app.security import create_access_token, verify_password
 
@@ -25,10 +26,10 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     u.last_login_at = datetime.utcnow()
-    db.add(AuditLog(user_id=u.id, action="login"))
     db.commit()
+    audit_writer.emit("login", user_id=u.id)
 
-    token = create_access_token(sub=str(u.id))
+    token = create_access_token(sub=str(u.id), token_version=u.token_version or 0)
     return LoginResponse(
         access_token=token,
         user=UserPublic(id=u.id, username=u.username, role=u.role, is_active=u.is_active),
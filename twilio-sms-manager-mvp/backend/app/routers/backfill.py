@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.backfill import BackfillUnavailable, twilio_backfill
+from app.database import get_read_db
+from app.models import BackfillCursor, PhoneNumber, User
+from app.schemas import BackfillProgress, BackfillRequest, BackfillStatusOut
+from app.security import require_admin
+
+
+router = APIRouter(prefix="/backfill", tags=["backfill"])
+
+
+@router.get("", response_model=BackfillProgress)
+def backfill_progress(_: User = Depends(require_admin), db: Session = Depends(get_read_db)) -> BackfillProgress:
+    rows = db.execute(
+        select(BackfillCursor, PhoneNumber.twilio_number)
+        .join(PhoneNumber, PhoneNumber.id == BackfillCursor.phone_number_id)
+        .order_by(PhoneNumber.twilio_number.asc())
+    ).all()
+    return BackfillProgress(
+        running=twilio_backfill.running,
+        numbers=[
+            BackfillStatusOut(
+                phone_number_id=c.phone_number_id,
+                twilio_number=twilio_number,
+                status=c.status,
+                pages=c.pages,
+                fetched=c.fetched,
+                inserted=c.inserted,
+                error=c.error,
+                updated_at=c.updated_at,
+            )
+            for c, twilio_number in rows
+        ],
+    )
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+def start_backfill(payload: BackfillRequest, admin: User = Depends(require_admin)) -> dict[str, str]:
+    try:
+        started = twilio_backfill.start(number_ids=payload.number_ids, restart=payload.restart, user_id=admin.id)
+    except BackfillUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if not started:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Backfill already running")
+    return {"status": "started"}
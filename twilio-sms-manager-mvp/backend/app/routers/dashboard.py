@@ -1,56 +1,64 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import func, literal, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models import Message, PhoneNumber, User
+from app.cache import dashboard_stats_cache
+from app.database import get_read_db
+from app.models import Message, PhoneNumber, PhoneNumberStats, User
 from app.schemas import DashboardStats
 from app.security import get_current_user
-from app.utils import normalize_phone_number
 
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-@router.get("/stats", response_model=DashboardStats)
-def stats(u: User = Depends(get_current_user), db: Session = Depends(get_db)) -> DashboardStats:
-    is_admin = (u.role or "").lower() == "admin"
+def _stats_query(*, user_id: int, is_admin: bool):
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow_start = today_start + timedelta(days=1)
 
-    q_numbers = db.query(PhoneNumber).filter(PhoneNumber.status == "active")
+    numbers_filter = [PhoneNumber.status == "active"]
     if not is_admin:
-        q_numbers = q_numbers.filter(PhoneNumber.assigned_user_id == u.id)
-
-    active_phone_numbers = q_numbers.count()
+        numbers_filter.append(PhoneNumber.assigned_user_id == user_id)
 
-    q_messages = db.query(Message)
+    active_numbers = select(func.count(PhoneNumber.id)).where(*numbers_filter).scalar_subquery()
+    active_users = (
+        select(func.count(User.id)).where(User.is_active.is_(True)).scalar_subquery() if is_admin else literal(0)
+    )
+    # Unread comes from the per-number counters and today's count is a plain range on
+    # received_at, so neither aggregates the whole messages table.
+    unread = select(func.coalesce(func.sum(PhoneNumberStats.unread_count), 0))
+    today = select(func.count()).where(Message.received_at >= today_start, Message.received_at < tomorrow_start)
     if not is_admin:
-        assigned_numbers: set[str] = set()
-        for n in q_numbers.all():
-            v = normalize_phone_number(n.twilio_number)
-            if not v:
-                continue
-            assigned_numbers.add(v)
-            if v.startswith("+"):
-                assigned_numbers.add(v[1:])
-            else:
-                assigned_numbers.add("+" + v)
-        if not assigned_numbers:
-            return DashboardStats(active_phone_numbers=0, unread_sms=0, sms_today=0, active_users=0)
-        q_messages = q_messages.filter(Message.to_number.in_(sorted(assigned_numbers)))
-
-    unread_sms = q_messages.filter(Message.is_read.is_(False)).count()
-
-    today = datetime.utcnow().date().isoformat()
-    sms_today = q_messages.filter(Message.received_at.like(f"{today}%")).count()
-
-    active_users = db.query(User).filter(User.is_active.is_(True)).count() if is_admin else 0
-
-    return DashboardStats(
-        active_phone_numbers=active_phone_numbers,
-        unread_sms=unread_sms,
-        sms_today=sms_today,
-        active_users=active_users,
+        visible_ids = select(PhoneNumber.id).where(*numbers_filter)
+        unread = unread.where(PhoneNumberStats.phone_number_id.in_(visible_ids))
+        today = today.where(Message.phone_number_id.in_(visible_ids))
+
+    return select(
+        active_numbers.label("active_phone_numbers"),
+        unread.scalar_subquery().label("unread_sms"),
+        today.scalar_subquery().label("sms_today"),
+        active_users.label("active_users"),
+    )
+
+
+@router.get("/stats", response_model=DashboardStats)
+def stats(u: User = Depends(get_current_user), db: Session = Depends(get_read_db)) -> DashboardStats:
+    is_admin = (u.role or "").lower() == "admin"
+    cache_key = (u.id, is_admin)
+    cached = dashboard_stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    row = db.execute(_stats_query(user_id=u.id, is_admin=is_admin)).one()
+    out = DashboardStats(
+        active_phone_numbers=int(row.active_phone_numbers or 0),
+        unread_sms=int(row.unread_sms or 0),
+        sms_today=int(row.sms_today or 0),
+        active_users=int(row.active_users or 0),
     )
+    dashboard_stats_cache.set(cache_key, out)
+    return out
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.models import Message, PhoneNumber, PhoneNumberStats, User
+from app.routers.messages import select_message_out
+from app.schemas import InboxNumberOut, InboxResponse, MessageOut, MessagePreview
+from app.security import get_current_user
+from app.utils import otp_visibility_cutoff
+
+
+router = APIRouter(prefix="/inbox", tags=["inbox"])
+
+_PREVIEW_CHARS = 120
+
+
+def latest_message_ids(visible_ids: Select) -> Select:
+    """Newest message id per visible number, by (received_at, id).
+
+    Ordering by time rather than max(id) keeps backfilled history, which gets new ids but
+    old timestamps, from showing as the latest message. One index seek per number.
+    """
+    newest = (
+        select(Message.id)
+        .where(Message.phone_number_id == PhoneNumber.id)
+        .order_by(Message.received_at.desc(), Message.id.desc())
+        .limit(1)
+        .correlate(PhoneNumber)
+        .scalar_subquery()
+    )
+    return select(newest).where(PhoneNumber.id.in_(visible_ids))
+
+
+@router.get("", response_model=InboxResponse)
+def inbox(
+    u: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    feed_limit: int = 0,
+) -> InboxResponse:
+    """Everything the Inbox page needs in one round trip: the caller's numbers with unread
+    counts and latest-message previews, plus an optional feed across all of them."""
+    feed_limit = max(0, min(int(feed_limit), 1000))
+
+    visible_ids = select(PhoneNumber.id)
+    if (u.role or "").lower() != "admin":
+        visible_ids = visible_ids.where(PhoneNumber.assigned_user_id == u.id)
+
+    numbers = (
+        db.query(PhoneNumber)
+        .filter(PhoneNumber.id.in_(visible_ids))
+        .order_by(PhoneNumber.twilio_number.asc())
+        .all()
+    )
+    if not numbers:
+        return InboxResponse(numbers=[], feed=[])
+
+    unread = dict(
+        db.execute(
+            select(PhoneNumberStats.phone_number_id, PhoneNumberStats.unread_count).where(
+                PhoneNumberStats.phone_number_id.in_(visible_ids)
+            )
+        ).all()
+    )
+
+    latest = {
+        row.phone_number_id: MessagePreview(
+            id=row.id,
+            from_number=row.from_number,
+            preview=(row.message_body or "")[:_PREVIEW_CHARS] or None,
+            has_otp=row.otp_code is not None,
+            received_at=row.received_at,
+        )
+        for row in db.execute(
+            select(
+                Message.id,
+                Message.phone_number_id,
+                Message.from_number,
+                Message.message_body,
+                Message.otp_code,
+                Message.received_at,
+            ).where(Message.id.in_(latest_message_ids(visible_ids)))
+        ).all()
+    }
+
+    feed = []
+    if feed_limit:
+        feed = [
+            MessageOut.model_validate(row)
+            for row in db.execute(
+                select_message_out(otp_visibility_cutoff())
+                .where(Message.phone_number_id.in_(visible_ids))
+                .order_by(Message.received_at.desc(), Message.id.desc())
+                .limit(feed_limit)
+            ).mappings()
+        ]
+
+    return InboxResponse(
+        numbers=[
+            InboxNumberOut(
+                id=n.id,
+                twilio_number=n.twilio_number,
+                label=n.label,
+                status=n.status,
+                assigned_user_id=n.assigned_user_id,
+                unread_count=int(unread.get(n.id, 0)),
+                latest_message=latest.get(n.id),
+            )
+            for n in numbers
+        ],
+        feed=feed,
+    )
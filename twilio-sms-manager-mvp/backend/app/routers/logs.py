@@ -1,32 +1,93 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models import AuditLog, User
-from app.schemas import AuditLogOut
+from app.schemas import AuditActionCount, AuditLogOut
 from app.security import require_admin
 
 
 router = APIRouter(prefix="/logs", tags=["logs"])
 
+_AUDIT_LOGS = TypeAdapter(list[AuditLogOut])
+
+
+def _as_utc_naive(value: datetime | None) -> datetime | None:
+    # Audit timestamps are stored as naive UTC.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _filters(
+    *,
+    action: str | None,
+    user_id: int | None,
+    since: datetime | None,
+    until: datetime | None,
+) -> list:
+    clauses = []
+    if action:
+        clauses.append(AuditLog.action == action)
+    if user_id is not None:
+        clauses.append(AuditLog.user_id == int(user_id))
+    since, until = _as_utc_naive(since), _as_utc_naive(until)
+    if since is not None:
+        clauses.append(AuditLog.timestamp >= since)
+    if until is not None:
+        clauses.append(AuditLog.timestamp < until)
+    return clauses
+
 
 @router.get("", response_model=list[AuditLogOut])
 def list_logs(
     _: User = Depends(require_admin),
-    db: Session = Depends(get_db),
-    limit: int = 200,
-) -> list[AuditLogOut]:
-    limit = max(1, min(int(limit), 2000))
-    rows = db.query(AuditLog).order_by(AuditLog.id.desc()).limit(limit).all()
-    return [
-        AuditLogOut(
-            id=r.id,
-            user_id=r.user_id,
-            action=r.action,
-            timestamp=r.timestamp,
-            meta_json=r.meta_json,
-        )
-        for r in rows
-    ]
+    db: Session = Depends(get_read_db),
+    limit: int = 100,
+    before: int | None = None,
+    action: str | None = None,
+    user_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Response:
+    """Newest first. Pass the last id of a page as `before` to get the next (older) page."""
+    limit = max(1, min(int(limit), 500))
+    q = select(AuditLog.id, AuditLog.user_id, AuditLog.action, AuditLog.timestamp, AuditLog.meta_json).where(
+        *_filters(action=action, user_id=user_id, since=since, until=until)
+    )
+    if before is not None:
+        cursor = db.execute(
+            select(AuditLog.id, AuditLog.timestamp).where(AuditLog.id == int(before))
+        ).first()
+        if cursor is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown cursor")
+        q = q.where(tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(cursor.timestamp, cursor.id))
+    rows = db.execute(q.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit)).mappings()
+    # Validated and serialized in one pass by pydantic-core, rather than per-row model
+    # instances and a second encode in FastAPI's response-model handling.
+    return Response(_AUDIT_LOGS.dump_json(_AUDIT_LOGS.validate_python(rows)), media_type="application/json")
+
+
+@router.get("/summary", response_model=list[AuditActionCount])
+def logs_summary(
+    _: User = Depends(require_admin),
+    db: Session = Depends(get_read_db),
+    user_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[AuditActionCount]:
+    """Entry counts per action for the same filters as the list (action excluded)."""
+    rows = db.execute(
+        select(AuditLog.action, func.count())
+        .where(*_filters(action=None, user_id=user_id, since=since, until=until))
+        .group_by(AuditLog.action)
+        .order_by(func.count().desc())
+    ).all()
+    return [AuditActionCount(action=action, count=int(count)) for action, count in rows]
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import Select, case, func, not_, select, tuple_
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app.models import Message, PhoneNumber, User
-from app.schemas import MarkReadRequest, MessageOut
-from app.security import get_current_user
-from app.utils import normalize_phone_number, otp_is_visible
+from app.cache import dashboard_stats_cache
+from app.config import BACKEND_WORKERS, OTP_WAIT_MAX_SECONDS, OTP_WAIT_RECHECK_SECONDS
+from app.database import get_db, get_read_db
+from app.models import Message, PhoneNumber, PhoneNumberStats, User
+from app.number_stats import adjust_unread
+from app.otp_waiters import WaitersFull, otp_waiters
+from app.schemas import MarkReadRequest, MessageOut, MessageRawOut
+from app.security import get_current_user, require_admin
+from app.utils import canonical_phone_number, otp_visibility_cutoff
 
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
+_MESSAGES = TypeAdapter(list[MessageOut])
+
 
 def _can_view_number(*, u: User, number: PhoneNumber | None) -> bool:
     if (u.role or "").lower() == "admin":
@@ -23,45 +34,206 @@ def _can_view_number(*, u: User, number: PhoneNumber | None) -> bool:
     return number.assigned_user_id == u.id
 
 
+def select_message_out(cutoff: datetime) -> Select:
+    """Just the MessageOut columns, with OTP visibility decided in SQL against `cutoff`.
+
+    Rows already have MessageOut's fields and types, so list routes serialize them
+    directly without building ORM objects or loading raw_payload.
+    """
+    visible = Message.received_at >= cutoff
+    return select(
+        Message.id,
+        Message.to_number,
+        Message.from_number,
+        Message.message_body,
+        case((visible, Message.otp_code), else_=None).label("otp_code"),
+        not_(visible).label("otp_expired"),
+        Message.is_read,
+        Message.received_at,
+    )
+
+
+def _number_scope(db: Session, *, u: User, n_norm: str):
+    """Filter for the messages of one number, after checking the caller may see them."""
+    number = db.query(PhoneNumber).filter(PhoneNumber.normalized_number == n_norm).first()
+    if not _can_view_number(u=u, number=number):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    if number is not None:
+        return number, Message.phone_number_id == number.id
+    return None, Message.to_number_normalized == n_norm
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match") or ""
+    return any(tag.strip() in {etag, "*"} for tag in header.split(","))
+
+
 @router.get("/{twilio_number}", response_model=list[MessageOut])
 def list_messages(
     twilio_number: str,
+    request: Request,
     u: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 200,
-) -> list[MessageOut]:
+    before: int | None = None,
+    after: int | None = None,
+    since_id: int | None = None,
+) -> Response:
     limit = max(1, min(int(limit), 1000))
+    if sum(v is not None for v in (before, after, since_id)) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use only one of before, after or since_id",
+        )
 
-    n_norm = normalize_phone_number(twilio_number)
-    variants = {n_norm}
-    if n_norm.startswith("+"):
-        variants.add(n_norm[1:])
-    else:
-        variants.add("+" + n_norm)
+    n_norm = canonical_phone_number(twilio_number)
 
-    number = db.query(PhoneNumber).filter(PhoneNumber.twilio_number.in_(sorted(variants))).first()
-    if not _can_view_number(u=u, number=number):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    number, scope = _number_scope(db, u=u, n_norm=n_norm)
 
-    q = db.query(Message).filter(Message.to_number.in_(sorted(variants)))
-    rows = q.order_by(Message.received_at.desc()).limit(limit).all()
-
-    out: list[MessageOut] = []
-    for m in rows:
-        visible = otp_is_visible(m.received_at)
-        out.append(
-            MessageOut(
-                id=m.id,
-                to_number=m.to_number,
-                from_number=m.from_number,
-                message_body=m.message_body,
-                otp_code=m.otp_code if visible else None,
-                otp_expired=not visible,
-                is_read=bool(m.is_read),
-                received_at=m.received_at,
+    # The ETag covers everything that can change this response: new messages, read-state
+    # changes and OTPs expiring out of the visibility window. For a known number the first
+    # two come from phone_number_stats and read_version, and the visible-OTP count is an
+    # index range scan over the visibility window only, so polling never scans the history.
+    cutoff = otp_visibility_cutoff()
+    visible_otps = db.execute(
+        select(func.count()).where(scope, Message.received_at >= cutoff, Message.otp_code.is_not(None))
+    ).scalar()
+    if number is not None:
+        stats = db.get(PhoneNumberStats, number.id)
+        latest = f"{stats.total_count}:{stats.last_received_at}" if stats is not None else "0"
+        read_state = number.read_version
+    else:
+        latest_id, read_state = db.execute(
+            select(
+                func.max(Message.id),
+                func.coalesce(func.sum(case((Message.is_read.is_(True), 1), else_=0)), 0),
+            ).where(scope)
+        ).one()
+        latest = latest_id or 0
+    tag_source = f"{n_norm}|{latest}|{read_state}|{visible_otps}|{limit}|{before}|{after}|{since_id}"
+    etag = f'W/"{hashlib.sha1(tag_source.encode()).hexdigest()[:20]}"'
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    order = (Message.received_at.desc(), Message.id.desc())
+    q = select_message_out(cutoff).where(scope)
+    if since_id is not None:
+        # Oldest first, so a capped delta never skips messages: the client resumes from the
+        # highest id it received. Reversed below to the usual newest-first order. Backfilled
+        # history gets new ids but is not new, so it only appears in full listings.
+        q = q.where(Message.id > int(since_id), Message.backfilled.is_(False)).order_by(Message.id.asc())
+    elif before is not None or after is not None:
+        cursor = db.query(Message.id, Message.received_at).filter(scope, Message.id == int(before or after)).first()
+        if cursor is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown cursor")
+        key = tuple_(Message.received_at, Message.id)
+        if before is not None:
+            q = q.where(key < tuple_(cursor.received_at, cursor.id)).order_by(*order)
+        else:
+            q = q.where(key > tuple_(cursor.received_at, cursor.id)).order_by(
+                Message.received_at.asc(), Message.id.asc()
             )
+    else:
+        q = q.order_by(*order)
+    rows = [dict(r) for r in db.execute(q.limit(limit)).mappings()]
+    if after is not None or since_id is not None:
+        rows.reverse()
+
+    # Validated and serialized in one pass by pydantic-core; per-row model instances plus
+    # a second encode would dominate the cost of large pages.
+    return Response(
+        _MESSAGES.dump_json(_MESSAGES.validate_python(rows)),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+@router.get("/{twilio_number}/next-otp", response_model=MessageOut)
+async def next_otp(
+    twilio_number: str,
+    u: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    after_id: int = 0,
+    timeout: float = 25,
+) -> MessageOut | Response:
+    """Long-poll for the first visible OTP message with id > after_id.
+
+    Returns it as soon as it exists, or 204 after `timeout` seconds. The request parks on
+    an in-process event set by the webhook; with several workers the message may land in
+    another process, so the database is also re-checked every OTP_WAIT_RECHECK_SECONDS.
+    """
+    timeout = max(0.0, min(float(timeout), float(OTP_WAIT_MAX_SECONDS)))
+    n_norm = canonical_phone_number(twilio_number)
+
+    def _scope():
+        try:
+            return _number_scope(db, u=u, n_norm=n_norm)[1]
+        finally:
+            db.close()
+
+    def _first_otp():
+        # Closing after each check returns the connection to the pool while parked.
+        cutoff = otp_visibility_cutoff()
+        try:
+            row = db.execute(
+                select_message_out(cutoff)
+                .where(
+                    scope,
+                    Message.id > int(after_id),
+                    Message.otp_code.is_not(None),
+                    Message.received_at >= cutoff,
+                )
+                .order_by(Message.id.asc())
+                .limit(1)
+            ).mappings().first()
+            return dict(row) if row is not None else None
+        finally:
+            db.close()
+
+    scope = await run_in_threadpool(_scope)
+    try:
+        event = otp_waiters.register(n_norm)
+    except WaitersFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many waiting requests",
+            headers={"Retry-After": "5"},
         )
-    return out
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    recheck = float(OTP_WAIT_RECHECK_SECONDS) if BACKEND_WORKERS > 1 else timeout
+    try:
+        while True:
+            event.clear()
+            row = await run_in_threadpool(_first_otp)
+            if row is not None:
+                return MessageOut.model_validate(row)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return Response(status_code=status.HTTP_204_NO_CONTENT)
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, max(0.1, recheck)))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        otp_waiters.release(n_norm, event)
+
+
+@router.get("/{message_id}/raw", response_model=MessageRawOut)
+def message_raw(
+    message_id: int,
+    _: User = Depends(require_admin),
+    db: Session = Depends(get_read_db),
+) -> MessageRawOut:
+    """Original webhook payload, for debugging ingest."""
+    row = db.execute(
+        select(Message.id, Message.provider_message_sid, Message.raw_payload).where(Message.id == int(message_id))
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+    return MessageRawOut(id=row.id, provider_message_sid=row.provider_message_sid, raw_payload=row.raw_payload)
 
 
 @router.patch("/{message_id}/read")
@@ -75,11 +247,15 @@ def mark_read(
     if m is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
 
-    number = db.query(PhoneNumber).filter(PhoneNumber.twilio_number == m.to_number).first()
+    number = db.get(PhoneNumber, m.phone_number_id) if m.phone_number_id is not None else None
     if not _can_view_number(u=u, number=number):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
+    if bool(m.is_read) != bool(payload.is_read) and number is not None:
+        number.read_version = (number.read_version or 0) + 1
+        adjust_unread(db, phone_number_id=number.id, delta=-1 if payload.is_read else 1)
     m.is_read = bool(payload.is_read)
     db.add(m)
     db.commit()
+    dashboard_stats_cache.clear()
     return {"status": "ok"}
@@ -1,22 +1,36 @@
 from __future__ import annotations
 
-import json
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models import AuditLog, PhoneNumber, User
-from app.schemas import PhoneNumberOut, PhoneNumberUpdate
+from app.audit import audit_writer
+from app.cache import dashboard_stats_cache
+from app.database import get_db, get_read_db
+from app.models import Message, PhoneNumber, PhoneNumberStats, User
+from app.number_stats import reconcile_number_stats
+from app.schemas import NumberStatsOut, PhoneNumberOut, PhoneNumberUpdate
 from app.security import get_current_user, require_admin
 
 
 router = APIRouter(prefix="/numbers", tags=["numbers"])
 
 
+def _stats_out(s: PhoneNumberStats | None) -> NumberStatsOut:
+    if s is None:
+        return NumberStatsOut()
+    return NumberStatsOut(
+        unread_count=s.unread_count,
+        total_count=s.total_count,
+        last_received_at=s.last_received_at,
+        last_otp_at=s.last_otp_at,
+    )
+
+
 @router.get("", response_model=list[PhoneNumberOut])
-def list_numbers(u: User = Depends(get_current_user), db: Session = Depends(get_db)) -> list[PhoneNumberOut]:
-    q = db.query(PhoneNumber)
+def list_numbers(u: User = Depends(get_current_user), db: Session = Depends(get_read_db)) -> list[PhoneNumberOut]:
+    q = db.query(PhoneNumber, PhoneNumberStats).outerjoin(
+        PhoneNumberStats, PhoneNumberStats.phone_number_id == PhoneNumber.id
+    )
     if (u.role or "").lower() != "admin":
         q = q.filter(PhoneNumber.assigned_user_id == u.id)
     rows = q.order_by(PhoneNumber.twilio_number.asc()).all()
@@ -27,11 +41,22 @@ def list_numbers(u: User = Depends(get_current_user), db: Session = Depends(get_
             label=n.label,
             status=n.status,
             assigned_user_id=n.assigned_user_id,
+            stats=_stats_out(s),
         )
-        for n in rows
+        for n, s in rows
     ]
 
 
+@router.post("/stats/reconcile")
+def reconcile_stats(admin: User = Depends(require_admin), db: Session = Depends(get_db)) -> dict[str, int]:
+    repaired = reconcile_number_stats(db)
+    db.commit()
+    if repaired:
+        dashboard_stats_cache.clear()
+    audit_writer.emit("reconcile_number_stats", user_id=admin.id, meta={"repaired": repaired})
+    return {"repaired": repaired}
+
+
 @router.put("/{number_id}", response_model=PhoneNumberOut)
 def update_number(
     number_id: int,
@@ -50,14 +75,13 @@ def update_number(
     if payload.assigned_user_id is not None:
         n.assigned_user_id = payload.assigned_user_id
 
-    db.add(
-        AuditLog(
-            user_id=admin.id,
-            action="update_number",
-            meta_json=json.dumps({"number_id": n.id, "assigned_user_id": n.assigned_user_id, "status": n.status}),
-        )
-    )
     db.commit()
+    dashboard_stats_cache.clear()
+    audit_writer.emit(
+        "update_number",
+        user_id=admin.id,
+        meta={"number_id": n.id, "assigned_user_id": n.assigned_user_id, "status": n.status},
+    )
 
     return PhoneNumberOut(
         id=n.id,
@@ -83,8 +107,15 @@ def create_number(
     )
     db.add(n)
     db.flush()
-    db.add(AuditLog(user_id=admin.id, action="create_number", meta_json=json.dumps({"number_id": n.id})))
+    if n.normalized_number:
+        db.query(Message).filter(
+            Message.phone_number_id.is_(None),
+            Message.to_number_normalized == n.normalized_number,
+        ).update({Message.phone_number_id: n.id}, synchronize_session=False)
+    reconcile_number_stats(db, [n.id])
     db.commit()
+    dashboard_stats_cache.clear()
+    audit_writer.emit("create_number", user_id=admin.id, meta={"number_id": n.id})
     return PhoneNumberOut(
         id=n.id,
         twilio_number=n.twilio_number,
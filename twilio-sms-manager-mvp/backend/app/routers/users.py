@@ -1,21 +1,43 @@
 from __future__ import annotations
 
+import csv
+import io
 import json
+from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app.models import AuditLog, User
-from app.schemas import CreateUserRequest, UserPublic
-from app.security import hash_password, require_admin
+from app.audit import audit_writer
+from app.cache import dashboard_stats_cache
+from app.config import BULK_USERS_MAX
+from app.database import get_db, get_read_db, insert_ignoring_conflicts
+from app.models import User
+from app.passwords import hash_passwords
+from app.schemas import (
+    BulkCreateUsersOut,
+    BulkCreateUsersRequest,
+    BulkUserResult,
+    CreateUserRequest,
+    UpdateUserRequest,
+    UserPublic,
+)
+from app.security import hash_password, invalidate_user, require_admin
 
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+_ROLES = {"user", "admin"}
+# Rows per INSERT batch.
+_INSERT_CHUNK = 500
+
 
 @router.get("", response_model=list[UserPublic])
-def list_users(_: User = Depends(require_admin), db: Session = Depends(get_db)) -> list[UserPublic]:
+def list_users(_: User = Depends(require_admin), db: Session = Depends(get_read_db)) -> list[UserPublic]:
     users = db.query(User).order_by(User.username.asc()).all()
     return [UserPublic(id=u.id, username=u.username, role=u.role, is_active=u.is_active) for u in users]
 
@@ -33,15 +55,188 @@ def create_user(
         is_active=True,
     )
     db.add(u)
-    db.flush()
+    db.commit()
+    audit_writer.emit(
+        "create_user",
+        user_id=admin.id,
+        meta={"created_user_id": u.id, "username": u.username, "role": u.role},
+    )
+
+    return UserPublic(id=u.id, username=u.username, role=u.role, is_active=u.is_active)
+
+
+def _parse_bulk_users(content_type: str, body: bytes) -> list[Any]:
+    """Raw rows from a CSV or JSON body; each row is validated on its own later."""
+    if content_type.split(";", 1)[0].strip().lower() == "text/csv":
+        try:
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            return [
+                {(k or "").strip().lower() if k is not None else None: v for k, v in r.items()} for r in reader
+            ]
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {e}")
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {e}")
+    if not isinstance(payload, dict) or not isinstance(payload.get("users"), list):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail='Expected {"users": [...]}')
+    return payload["users"]
+
 
-    db.add(
-        AuditLog(
-            user_id=admin.id,
-            action="create_user",
-            meta_json=json.dumps({"created_user_id": u.id, "username": u.username, "role": u.role}),
+def _validate_bulk_row(raw: Any) -> CreateUserRequest:
+    if isinstance(raw, dict) and None in raw:
+        # csv.DictReader files fields beyond the header under the key None.
+        raise ValueError("Row has more fields than the header")
+    try:
+        row = CreateUserRequest.model_validate(raw)
+    except ValidationError as e:
+        err = e.errors(include_url=False)[0]
+        raise ValueError(f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}")
+    return row
+
+
+def _create_users_bulk(db: Session, raw_rows: list[Any], admin_id: int) -> BulkCreateUsersOut:
+    results: list[BulkUserResult | None] = [None] * len(raw_rows)
+    pending: list[tuple[int, str, str, str]] = []
+    seen: set[str] = set()
+    for i, raw in enumerate(raw_rows):
+        try:
+            r = _validate_bulk_row(raw)
+        except ValueError as e:
+            name = raw.get("username") if isinstance(raw, dict) else None
+            username = name.strip().lower() if isinstance(name, str) else ""
+            results[i] = BulkUserResult(row=i + 1, username=username, status="invalid", detail=str(e))
+            continue
+        username = r.username.strip().lower()
+        role = (r.role or "user").strip().lower()
+        if not username or not r.password:
+            results[i] = BulkUserResult(row=i + 1, username=username, status="invalid", detail="Username and password are required")
+        elif role not in _ROLES:
+            results[i] = BulkUserResult(row=i + 1, username=username, status="invalid", detail=f"Unknown role '{role}'")
+        elif username in seen:
+            results[i] = BulkUserResult(row=i + 1, username=username, status="duplicate", detail="Repeated in this request")
+        else:
+            seen.add(username)
+            pending.append((i, username, r.password, role))
+
+    existing = set(db.scalars(select(User.username).where(User.username.in_(seen)))) if seen else set()
+    to_create = []
+    for i, username, password, role in pending:
+        if username in existing:
+            results[i] = BulkUserResult(row=i + 1, username=username, status="exists", detail="Username already taken")
+        else:
+            to_create.append((i, username, password, role))
+
+    # Hashing dominates; it runs across processes before the transaction is opened.
+    hashes = hash_passwords([password for _, _, password, _ in to_create])
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "username": username,
+            "password_hash": password_hash,
+            "role": role,
+            "is_active": True,
+            "token_version": 0,
+            "created_at": now,
+        }
+        for (_, username, _, role), password_hash in zip(to_create, hashes)
+    ]
+    created_ids: dict[str, int] = {}
+    for start in range(0, len(rows), _INSERT_CHUNK):
+        inserted = insert_ignoring_conflicts(
+            db, User, rows[start : start + _INSERT_CHUNK], index_elements=[User.username], returning=(User.id, User.username)
         )
+        created_ids.update((username, user_id) for user_id, username in inserted)
+    db.commit()
+
+    for i, username, _, _ in to_create:
+        if username in created_ids:
+            results[i] = BulkUserResult(row=i + 1, username=username, status="created", id=created_ids[username])
+        else:
+            # Created by someone else since the existence check above.
+            results[i] = BulkUserResult(row=i + 1, username=username, status="exists", detail="Username already taken")
+
+    created = len(created_ids)
+    if created:
+        dashboard_stats_cache.clear()
+    audit_writer.emit(
+        "bulk_create_users",
+        user_id=admin_id,
+        meta={"requested": len(raw_rows), "created": created, "usernames": sorted(created_ids)},
     )
+    return BulkCreateUsersOut(created=created, skipped=len(raw_rows) - created, results=results)
+
+
+_BULK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": BulkCreateUsersRequest.model_json_schema(ref_template="#/components/schemas/{model}")},
+            "text/csv": {"schema": {"type": "string", "description": "Header row: username,password[,role]"}},
+        },
+    }
+}
+
+
+@router.post("/bulk", response_model=BulkCreateUsersOut, openapi_extra=_BULK_REQUEST_BODY)
+async def create_users_bulk(
+    request: Request,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+) -> BulkCreateUsersOut:
+    """Create many users from JSON ({"users": [...]}) or CSV (username,password[,role]).
+
+    Every row gets a result; invalid, repeated and existing usernames are skipped, not
+    fatal. Passwords are hashed in a process pool and all users are inserted in one
+    transaction with a single audit entry.
+    """
+    rows = _parse_bulk_users(request.headers.get("content-type") or "", await request.body())
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No users given")
+    if len(rows) > BULK_USERS_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_USERS_MAX} users per request",
+        )
+    return await run_in_threadpool(_create_users_bulk, db, rows, admin.id)
+
+
+@router.patch("/{user_id}", response_model=UserPublic)
+def update_user(
+    user_id: int,
+    payload: UpdateUserRequest,
+    admin: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+) -> UserPublic:
+    u = db.query(User).filter(User.id == int(user_id)).first()
+    if u is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    revoke_tokens = False
+    if payload.role is not None:
+        u.role = payload.role.strip().lower()
+    if payload.is_active is not None:
+        revoke_tokens = revoke_tokens or (bool(u.is_active) and not payload.is_active)
+        u.is_active = bool(payload.is_active)
+    if payload.password:
+        u.password_hash = hash_password(payload.password)
+        revoke_tokens = True
+    if revoke_tokens:
+        u.token_version = (u.token_version or 0) + 1
+
     db.commit()
+    invalidate_user(u.id)
+    audit_writer.emit(
+        "update_user",
+        user_id=admin.id,
+        meta={
+            "updated_user_id": u.id,
+            "role": u.role,
+            "is_active": bool(u.is_active),
+            "password_changed": bool(payload.password),
+        },
+    )
 
     return UserPublic(id=u.id, username=u.username, role=u.role, is_active=u.is_active)
@@ -1,20 +1,25 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import Response
 from twilio.request_validator import RequestValidator
 
-from app.config import ENFORCE_TWILIO_SIGNATURE, TWILIO_AUTH_TOKEN
-from app.database import SessionLocal
-from app.models import AuditLog, Message, PhoneNumber
-from app.utils import extract_otp_code, normalize_phone_number, safe_json_dumps
+from app.admission import Overloaded, ingest_admission
+from app.cache import recent_sid_cache
+from app.config import ENFORCE_TWILIO_SIGNATURE, INGEST_QUEUE_TIMEOUT_SECONDS, TWILIO_AUTH_TOKEN
+from app.ingest import ingest_inbound_message
+from app.models import User
+from app.otp_waiters import otp_waiters
+from app.security import require_admin
+from app.utils import canonical_phone_number, extract_otp_code
 
 
 router = APIRouter(tags=["webhook"])
 
+_EMPTY_TWIML = "<?xml version=\"1.0\" encoding=\"UTF-8\"?><Response></Response>"
+
 
 def _validator() -> RequestValidator | None:
     if not TWILIO_AUTH_TOKEN:
@@ -41,39 +46,27 @@ async def sms_webhook(request: Request) -> Response:
         if not _validate_sig(request, form):
             return Response(content="", media_type="text/xml", status_code=403)
 
-    to_number_raw = (form.get("To") or "").strip()
-    from_number_raw = (form.get("From") or "").strip()
-    to_number = normalize_phone_number(to_number_raw)
-    from_number = normalize_phone_number(from_number_raw) or None
-    body = form.get("Body")
-    sid = (form.get("MessageSid") or "").strip() or None
+    sid = str(form.get("MessageSid") or "").strip()
+    if sid and recent_sid_cache.get(sid) is not None:
+        return Response(content=_EMPTY_TWIML, media_type="text/xml")
 
-    db = SessionLocal()
     try:
-        to_variants = {to_number}
-        if to_number.startswith("+"):
-            to_variants.add(to_number[1:])
-        else:
-            to_variants.add("+" + to_number)
-
-        number = db.query(PhoneNumber).filter(PhoneNumber.twilio_number.in_(sorted(to_variants))).first()
-        otp = extract_otp_code(str(body) if body is not None else None)
-
-        msg = Message(
-            phone_number_id=number.id if number is not None else None,
-            to_number=to_number,
-            from_number=from_number,
-            message_body=str(body) if body is not None else None,
-            otp_code=otp,
-            is_read=False,
-            provider_message_sid=sid,
-            raw_payload=safe_json_dumps({k: (str(v) if v is not None else None) for k, v in form.items()}),
-            received_at=datetime.utcnow(),
+        async with ingest_admission.admit():
+            await ingest_inbound_message(form)
+    except Overloaded:
+        # Shed fast with a retryable status rather than letting the burst pile onto SQLite.
+        return Response(
+            content="",
+            media_type="text/xml",
+            status_code=503,
+            headers={"Retry-After": str(max(1, INGEST_QUEUE_TIMEOUT_SECONDS))},
         )
-        db.add(msg)
-        db.add(AuditLog(user_id=None, action="twilio_inbound_sms"))
-        db.commit()
-    finally:
-        db.close()
+    if extract_otp_code(str(form.get("Body") or "")):
+        otp_waiters.notify(canonical_phone_number(form.get("To")))
+
+    return Response(content=_EMPTY_TWIML, media_type="text/xml")
+
 
-    return Response(content="<?xml version=\"1.0\" encoding=\"UTF-8\"?><Response></Response>", media_type="text/xml")
+@router.get("/sms/webhook/stats")
+def webhook_stats(_: User = Depends(require_admin)) -> dict[str, int]:
+    return ingest_admission.snapshot()
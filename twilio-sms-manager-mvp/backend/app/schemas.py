@@ -29,12 +29,44 @@ class CreateUserRequest(BaseModel):
     role: str = "user"
 
 
+class UpdateUserRequest(BaseModel):
+    role: str | None = None
+    is_active: bool | None = None
+    password: str | None = None
+
+
+class BulkCreateUsersRequest(BaseModel):
+    users: list[CreateUserRequest]
+
+
+class BulkUserResult(BaseModel):
+    row: int
+    username: str
+    status: str  # created, exists, duplicate or invalid
+    id: int | None = None
+    detail: str | None = None
+
+
+class BulkCreateUsersOut(BaseModel):
+    created: int
+    skipped: int
+    results: list[BulkUserResult]
+
+
+class NumberStatsOut(BaseModel):
+    unread_count: int = 0
+    total_count: int = 0
+    last_received_at: datetime | None = None
+    last_otp_at: datetime | None = None
+
+
 class PhoneNumberOut(BaseModel):
     id: int
     twilio_number: str
     label: str | None
     status: str
     assigned_user_id: int | None
+    stats: NumberStatsOut | None = None
 
 
 class PhoneNumberUpdate(BaseModel):
@@ -54,6 +86,30 @@ class MessageOut(BaseModel):
     received_at: datetime
 
 
+class MessageRawOut(BaseModel):
+    id: int
+    provider_message_sid: str | None
+    raw_payload: str | None
+
+
+class MessagePreview(BaseModel):
+    id: int
+    from_number: str | None
+    preview: str | None
+    has_otp: bool
+    received_at: datetime
+
+
+class InboxNumberOut(PhoneNumberOut):
+    unread_count: int
+    latest_message: MessagePreview | None
+
+
+class InboxResponse(BaseModel):
+    numbers: list[InboxNumberOut]
+    feed: list[MessageOut]
+
+
 class MarkReadRequest(BaseModel):
     is_read: bool
 
@@ -71,3 +127,29 @@ class AuditLogOut(BaseModel):
     action: str
     timestamp: datetime
     meta_json: str | None
+
+
+class BackfillRequest(BaseModel):
+    number_ids: list[int] | None = None
+    restart: bool = False
+
+
+class BackfillStatusOut(BaseModel):
+    phone_number_id: int
+    twilio_number: str
+    status: str
+    pages: int
+    fetched: int
+    inserted: int
+    error: str | None
+    updated_at: datetime
+
+
+class BackfillProgress(BaseModel):
+    running: bool
+    numbers: list[BackfillStatusOut]
+
+
+class AuditActionCount(BaseModel):
+    action: str
+    count: int
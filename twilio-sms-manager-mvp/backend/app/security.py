@@ -1,57 +1,86 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
+from app.cache import token_cache, user_cache
 from app.config import ACCESS_TOKEN_EXPIRE_MINUTES, JWT_ALGORITHM, JWT_SECRET
-from app.database import get_db
+from app.database import get_read_db
 from app.models import User
+from app.passwords import hash_password, verify_password  # noqa: F401
 
 
-_pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
 _bearer = HTTPBearer(auto_error=False)
 
 
-def hash_password(password: str) -> str:
-    return _pwd_context.hash(password)
+def create_access_token(*, sub: str, token_version: int = 0, expires_minutes: int | None = None) -> str:
+    expire = datetime.utcnow() + timedelta(minutes=expires_minutes or ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {"sub": sub, "ver": int(token_version), "exp": expire}
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
 
+def _decode_token(token: str) -> tuple[int, int]:
+    """Return (user_id, token_version) for a token, memoizing successful decodes until expiry."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
 
-def verify_password(password: str, password_hash: str) -> bool:
-    return _pwd_context.verify(password, password_hash)
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        user_id = int(payload.get("sub") or 0)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+    decoded = (user_id, int(payload.get("ver") or 0))
+    remaining = float(payload.get("exp") or 0) - time.time()
+    if remaining > 0:
+        token_cache.set(token, decoded, ttl_seconds=min(remaining, token_cache.ttl_seconds))
+    return decoded
 
-def create_access_token(*, sub: str, expires_minutes: int | None = None) -> str:
-    expire = datetime.utcnow() + timedelta(minutes=expires_minutes or ACCESS_TOKEN_EXPIRE_MINUTES)
-    payload = {"sub": sub, "exp": expire}
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+def _user_snapshot(u: User) -> dict:
+    return {
+        "id": u.id,
+        "username": u.username,
+        "role": u.role,
+        "is_active": bool(u.is_active),
+        "token_version": u.token_version or 0,
+    }
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.invalidate(int(user_id))
 
 
 def get_current_user(
     creds: HTTPAuthorizationCredentials | None = Depends(_bearer),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> User:
     if creds is None or not creds.credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    token = creds.credentials
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user_id, token_version = _decode_token(creds.credentials)
 
-    sub = str(payload.get("sub") or "")
-    if not sub:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        u = db.query(User).filter(User.id == user_id).first()
+        if u is None or not bool(u.is_active):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive")
+        snapshot = _user_snapshot(u)
+        user_cache.set(user_id, snapshot)
 
-    u = db.query(User).filter(User.id == int(sub)).first()
-    if u is None or not bool(u.is_active):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive")
-    return u
+    if token_version != snapshot["token_version"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+
+    # Detached copy: routes only read these attributes, and the cached snapshot stays untouched.
+    return User(**snapshot)
 
 
 def require_admin(u: User = Depends(get_current_user)) -> User:
@@ -34,10 +34,20 @@ def normalize_phone_number(value: str | None) -> str:
     return ("+" if had_plus else "") + digits
 
 
+def canonical_phone_number(value: str | None) -> str:
+    """E.164-style key ("+" and digits) used for indexed number lookups."""
+    digits = normalize_phone_number(value).lstrip("+")
+    return "+" + digits if digits else ""
+
+
 def otp_is_visible(received_at: datetime) -> bool:
     return datetime.utcnow() - received_at <= timedelta(minutes=OTP_VISIBILITY_MINUTES)
 
 
+def otp_visibility_cutoff(now: datetime | None = None) -> datetime:
+    return (now or datetime.utcnow()) - timedelta(minutes=OTP_VISIBILITY_MINUTES)
+
+
 def safe_json_dumps(obj) -> str:
     try:
         return json.dumps(obj, ensure_ascii=False)
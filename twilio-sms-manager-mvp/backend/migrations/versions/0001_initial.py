@@ -0,0 +1,80 @@
+"""Initial schema (as created by the original create_all).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_login_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "phone_numbers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("twilio_number", sa.String(50), nullable=False),
+        sa.Column("label", sa.String(255), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("assigned_user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_phone_numbers_id", "phone_numbers", ["id"])
+    op.create_index("ix_phone_numbers_twilio_number", "phone_numbers", ["twilio_number"], unique=True)
+
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("phone_number_id", sa.Integer(), sa.ForeignKey("phone_numbers.id"), nullable=True),
+        sa.Column("to_number", sa.String(50), nullable=False),
+        sa.Column("from_number", sa.String(50), nullable=True),
+        sa.Column("message_body", sa.Text(), nullable=True),
+        sa.Column("otp_code", sa.String(20), nullable=True),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("provider_message_sid", sa.String(100), nullable=True),
+        sa.Column("raw_payload", sa.Text(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_messages_id", "messages", ["id"])
+    op.create_index("ix_messages_to_number", "messages", ["to_number"])
+    op.create_index("ix_messages_received_at", "messages", ["received_at"])
+    op.create_index("idx_messages_to_number", "messages", ["to_number"])
+    op.create_index("idx_messages_received_at", "messages", ["received_at"])
+
+    op.create_table(
+        "audit_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("action", sa.String(255), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("meta_json", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_audit_logs_id", "audit_logs", ["id"])
+    op.create_index("ix_audit_logs_timestamp", "audit_logs", ["timestamp"])
+
+
+def downgrade() -> None:
+    op.drop_table("audit_logs")
+    op.drop_table("messages")
+    op.drop_table("phone_numbers")
+    op.drop_table("users")
@@ -0,0 +1,80 @@
+"""Normalized phone columns, read_version and token_version.
+
+Databases that already received these columns from the pre-Alembic startup
+upgrade are left as they are.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.migrations import add_column_if_missing, create_index_if_missing
+from app.utils import canonical_phone_number
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    add_column_if_missing("phone_numbers", sa.Column("normalized_number", sa.String(50), nullable=True))
+    add_column_if_missing(
+        "phone_numbers", sa.Column("read_version", sa.Integer(), nullable=False, server_default="0")
+    )
+    add_column_if_missing("messages", sa.Column("to_number_normalized", sa.String(50), nullable=True))
+    add_column_if_missing("users", sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+    create_index_if_missing("ix_phone_numbers_normalized_number", "phone_numbers", ["normalized_number"])
+    create_index_if_missing("ix_messages_to_number_normalized", "messages", ["to_number_normalized"])
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, twilio_number FROM phone_numbers WHERE normalized_number IS NULL")
+    ).all()
+    for number_id, twilio_number in rows:
+        conn.execute(
+            sa.text("UPDATE phone_numbers SET normalized_number = :n WHERE id = :id"),
+            {"n": canonical_phone_number(twilio_number) or None, "id": number_id},
+        )
+
+    raw_numbers = conn.execute(
+        sa.text("SELECT DISTINCT to_number FROM messages WHERE to_number_normalized IS NULL")
+    ).scalars().all()
+    for raw in raw_numbers:
+        conn.execute(
+            sa.text(
+                "UPDATE messages SET to_number_normalized = :n "
+                "WHERE to_number = :raw AND to_number_normalized IS NULL"
+            ),
+            {"n": canonical_phone_number(raw) or None, "raw": raw},
+        )
+
+    conn.execute(
+        sa.text(
+            """
+            UPDATE messages
+            SET phone_number_id = (
+                SELECT p.id FROM phone_numbers p
+                WHERE p.normalized_number = messages.to_number_normalized
+            )
+            WHERE phone_number_id IS NULL AND to_number_normalized IS NOT NULL
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_to_number_normalized", table_name="messages")
+    op.drop_index("ix_phone_numbers_normalized_number", table_name="phone_numbers")
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("token_version")
+    with op.batch_alter_table("messages") as batch:
+        batch.drop_column("to_number_normalized")
+    with op.batch_alter_table("phone_numbers") as batch:
+        batch.drop_column("read_version")
+        batch.drop_column("normalized_number")
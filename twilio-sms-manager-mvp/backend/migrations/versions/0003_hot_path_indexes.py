@@ -0,0 +1,43 @@
+"""Composite indexes for the hot queries; drop duplicate single-column indexes.
+
+- messages (phone_number_id, received_at): per-number inbox pages, feed, today's count
+- messages (phone_number_id, is_read): unread counts per number
+- messages (provider_message_sid): webhook dedupe by SID
+- audit_logs (action, timestamp): audit by action over a time window
+
+idx_messages_to_number / idx_messages_received_at duplicated the ix_* indexes
+that index=True already creates, so every insert maintained both.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+
+from app.migrations import create_index_if_missing, drop_index_if_exists
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_if_missing("ix_messages_number_received", "messages", ["phone_number_id", "received_at"])
+    create_index_if_missing("ix_messages_number_unread", "messages", ["phone_number_id", "is_read"])
+    create_index_if_missing("ix_messages_provider_message_sid", "messages", ["provider_message_sid"])
+    create_index_if_missing("ix_audit_logs_action_timestamp", "audit_logs", ["action", "timestamp"])
+    drop_index_if_exists("idx_messages_to_number", "messages")
+    drop_index_if_exists("idx_messages_received_at", "messages")
+
+
+def downgrade() -> None:
+    op.create_index("idx_messages_received_at", "messages", ["received_at"])
+    op.create_index("idx_messages_to_number", "messages", ["to_number"])
+    op.drop_index("ix_audit_logs_action_timestamp", table_name="audit_logs")
+    op.drop_index("ix_messages_provider_message_sid", table_name="messages")
+    op.drop_index("ix_messages_number_unread", table_name="messages")
+    op.drop_index("ix_messages_number_received", table_name="messages")
@@ -0,0 +1,23 @@
+"""Index audit logs by user over time for the filtered /logs view.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_audit_logs_user_timestamp", "audit_logs", ["user_id", "timestamp"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_user_timestamp", table_name="audit_logs")
@@ -0,0 +1,46 @@
+"""Per-number message counters, backfilled from messages.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "phone_number_stats",
+        sa.Column("phone_number_id", sa.Integer(), sa.ForeignKey("phone_numbers.id"), primary_key=True),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_received_at", sa.DateTime(), nullable=True),
+        sa.Column("last_otp_at", sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        """
+        INSERT INTO phone_number_stats
+            (phone_number_id, unread_count, total_count, last_received_at, last_otp_at)
+        SELECT
+            p.id,
+            COALESCE(SUM(CASE WHEN m.id IS NOT NULL AND NOT m.is_read THEN 1 ELSE 0 END), 0),
+            COUNT(m.id),
+            MAX(m.received_at),
+            MAX(CASE WHEN m.otp_code IS NOT NULL THEN m.received_at END)
+        FROM phone_numbers p
+        LEFT JOIN messages m ON m.phone_number_id = p.id
+        GROUP BY p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("phone_number_stats")
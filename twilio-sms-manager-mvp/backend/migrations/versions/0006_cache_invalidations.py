@@ -0,0 +1,31 @@
+"""Change-sequence table for cross-worker cache invalidation.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_invalidations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("cache_name", sa.String(50), nullable=False),
+        sa.Column("cache_key", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_cache_invalidations_created_at", "cache_invalidations", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("cache_invalidations")
@@ -0,0 +1,65 @@
+"""Make provider_message_sid unique, collapsing duplicates from Twilio retries.
+
+For each duplicated SID the earliest message is kept (marked read if any copy was
+read); per-number counters are then rebuilt.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE messages
+        SET is_read = TRUE
+        WHERE NOT is_read
+          AND provider_message_sid IS NOT NULL
+          AND id = (SELECT MIN(d.id) FROM messages d WHERE d.provider_message_sid = messages.provider_message_sid)
+          AND EXISTS (
+              SELECT 1 FROM messages d
+              WHERE d.provider_message_sid = messages.provider_message_sid AND d.is_read
+          )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM messages
+        WHERE provider_message_sid IS NOT NULL
+          AND id > (SELECT MIN(d.id) FROM messages d WHERE d.provider_message_sid = messages.provider_message_sid)
+        """
+    )
+    op.drop_index("ix_messages_provider_message_sid", table_name="messages")
+    op.create_index("ix_messages_provider_message_sid", "messages", ["provider_message_sid"], unique=True)
+
+    op.execute("DELETE FROM phone_number_stats")
+    op.execute(
+        """
+        INSERT INTO phone_number_stats
+            (phone_number_id, unread_count, total_count, last_received_at, last_otp_at)
+        SELECT
+            p.id,
+            COALESCE(SUM(CASE WHEN m.id IS NOT NULL AND NOT m.is_read THEN 1 ELSE 0 END), 0),
+            COUNT(m.id),
+            MAX(m.received_at),
+            MAX(CASE WHEN m.otp_code IS NOT NULL THEN m.received_at END)
+        FROM phone_numbers p
+        LEFT JOIN messages m ON m.phone_number_id = p.id
+        GROUP BY p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_provider_message_sid", table_name="messages")
+    op.create_index("ix_messages_provider_message_sid", "messages", ["provider_message_sid"])
@@ -0,0 +1,34 @@
+"""Resumable per-number cursors for the Twilio history backfill.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_cursors",
+        sa.Column("phone_number_id", sa.Integer(), sa.ForeignKey("phone_numbers.id"), primary_key=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("next_page_uri", sa.Text(), nullable=True),
+        sa.Column("pages", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("fetched", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("inserted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("backfill_cursors")
@@ -0,0 +1,29 @@
+"""Leases that keep background jobs to one worker at a time.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_leases",
+        sa.Column("name", sa.String(50), primary_key=True),
+        sa.Column("owner", sa.String(100), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_leases")
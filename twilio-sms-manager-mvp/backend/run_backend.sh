@@ -1 +1,4 @@
-uvicorn app.main:app --host 0.0.0.0 --port 8000
+set -e
+# Migrate and bootstrap once, before uvicorn starts BACKEND_WORKERS processes.
+python -m app.prestart
+uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "${BACKEND_WORKERS:-1}"
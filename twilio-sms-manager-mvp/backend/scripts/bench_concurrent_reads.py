@@ -0,0 +1,165 @@
+"""Measure message-list read latency while an ingest writer is busy.
+
+Run from backend/:  python scripts/bench_concurrent_reads.py --readers 4 --seconds 5
+
+Each mode runs in a fresh interpreter against its own temporary SQLite file, seeded
+with --seed messages. Readers run the message-list query in a loop, first alone and
+then while a writer commits batches of messages as fast as it can.
+
+  tuned    the app's engines: WAL, busy_timeout and a separate query-only read pool
+  default  one plain engine in rollback-journal mode (the configuration before tuning)
+
+In rollback-journal mode readers are locked out while each write commits; under WAL
+they keep reading the last committed snapshot. The gap grows with commit cost, so it
+is small on a fast local disk and large on slow or network storage. The writer runs in
+its own process so it competes with the readers for the database, not for the GIL.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+_SETUP = """
+import json, os, statistics, subprocess, sys, threading, time
+from datetime import datetime
+
+mode, readers, seconds, batch, seed = sys.argv[1], int(sys.argv[2]), float(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5])
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+
+from app import database
+from app.models import Message, PhoneNumber
+from app.routers.messages import select_message_out
+from app.utils import otp_visibility_cutoff
+
+if mode == "tuned":
+    write_engine, read_engine = database.engine, database.read_engine
+else:
+    write_engine = read_engine = create_engine(os.environ["DATABASE_URL"], connect_args={"check_same_thread": False})
+
+def rows(start, n):
+    now = datetime.utcnow()
+    return [
+        {"phone_number_id": 1, "to_number": "+15550001111", "to_number_normalized": "15550001111",
+         "from_number": "+1999", "message_body": f"code {100000 + i % 900000}", "otp_code": str(100000 + i % 900000),
+         "is_read": False, "provider_message_sid": f"SMbench{i}", "raw_payload": "{}", "received_at": now}
+        for i in range(start, start + n)
+    ]
+"""
+
+_WRITER = _SETUP + """
+written, deadline = 0, time.monotonic() + seconds
+while time.monotonic() < deadline:
+    with write_engine.begin() as conn:
+        conn.execute(insert(Message), rows(seed + written, batch))
+    written += batch
+print(written)
+"""
+
+_CHILD = _SETUP + """
+from app.migrations import run_migrations
+
+run_migrations(database.engine)
+if mode == "default":
+    database.engine.dispose()
+    database.read_engine.dispose()
+    with write_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode = DELETE").scalar() == "delete"
+
+with write_engine.begin() as conn:
+    conn.execute(insert(PhoneNumber).values(id=1, twilio_number="+15550001111", normalized_number="15550001111"))
+    for start in range(0, seed, 1000):
+        conn.execute(insert(Message), rows(start, min(1000, seed - start)))
+write_engine.dispose()
+
+query = (
+    select_message_out(otp_visibility_cutoff())
+    .where(Message.phone_number_id == 1)
+    .order_by(Message.received_at.desc(), Message.id.desc())
+    .limit(200)
+)
+
+def read_loop(stop, latencies, errors):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with read_engine.connect() as conn:
+                conn.execute(query).all()
+        except OperationalError:
+            errors.append(1)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+def phase(with_writer):
+    stop, latencies, errors = threading.Event(), [], []
+    threads = [threading.Thread(target=read_loop, args=(stop, latencies, errors)) for _ in range(readers)]
+    writer = None
+    if with_writer:
+        writer = subprocess.Popen([sys.executable, "-c", os.environ["BENCH_WRITER"]] + sys.argv[1:], stdout=subprocess.PIPE, text=True)
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    written = int(writer.communicate()[0].strip().splitlines()[-1]) if writer else 0
+    latencies.sort()
+    return {
+        "reads_per_s": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "errors": len(errors),
+        "writes_per_s": written / seconds,
+    }
+
+print(json.dumps({"idle": phase(False), "writing": phase(True)}))
+"""
+
+
+def _run(mode: str, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-reads-") as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "JWT_SECRET": os.environ.get("JWT_SECRET", "bench"),
+            "BENCH_WRITER": _WRITER,
+        }
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD, mode, str(args.readers), str(args.seconds), str(args.batch), str(args.seed)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=4, help="concurrent reader threads")
+    parser.add_argument("--seconds", type=float, default=5, help="duration of each phase")
+    parser.add_argument("--batch", type=int, default=200, help="messages per write transaction")
+    parser.add_argument("--seed", type=int, default=20000, help="messages inserted before measuring")
+    parser.add_argument("--modes", nargs="+", default=["default", "tuned"], choices=["default", "tuned"])
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.seconds:g}s per phase, {args.batch} messages per write")
+    print(f"{'mode':<8} {'phase':<8} {'reads/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'errors':>6} {'writes/s':>9}")
+    for mode in args.modes:
+        result = _run(mode, args)
+        for phase, r in result.items():
+            print(
+                f"{mode:<8} {phase:<8} {r['reads_per_s']:>8.0f} {r['p50_ms']:>7.2f} {r['p95_ms']:>7.2f}"
+                f" {r['max_ms']:>7.1f} {r['errors']:>6} {r['writes_per_s']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Break down GET /messages/{number} into query, serialization and endpoint time.
+
+Run from backend/:  python scripts/bench_message_list.py --limit 200 --payload-bytes 2000
+
+Seeds a temporary SQLite database with --seed messages for one number, each carrying a
+--payload-bytes raw_payload like a real Twilio webhook, then times one page of --limit
+rows four ways:
+
+  orm load        full Message objects (raw_payload included) copied into MessageOut
+                  in a Python loop, with otp_is_visible per row (the route before projection)
+  projection      the select_message_out() Core query the route runs, rows only
+  serialize       TypeAdapter validate + dump_json of those rows
+  endpoint        the whole route through the ASGI app, auth and ETag included
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory(prefix="bench-list-")
+# app.config reads the environment at import time.
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{_tmp.name}/bench.db",
+        "ADMIN_USERNAME": "bench",
+        "ADMIN_PASSWORD": "bench-password",
+        "JWT_SECRET": "bench-secret",
+        "BACKEND_WORKERS": "1",
+        "NUMBER_STATS_RECONCILE_SECONDS": "0",
+    }
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.database import ReadSessionLocal, SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Message, PhoneNumber  # noqa: E402
+from app.number_stats import reconcile_number_stats  # noqa: E402
+from app.routers.messages import _MESSAGES, select_message_out  # noqa: E402
+from app.schemas import MessageOut  # noqa: E402
+from app.utils import canonical_phone_number, otp_is_visible, otp_visibility_cutoff  # noqa: E402
+
+_NUMBER = "+15550003333"
+
+
+def _seed(count: int, payload_bytes: int) -> int:
+    payload = "x" * payload_bytes
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        number = PhoneNumber(twilio_number=_NUMBER, normalized_number=canonical_phone_number(_NUMBER))
+        db.add(number)
+        db.flush()
+        for start in range(0, count, 1000):
+            db.execute(
+                insert(Message),
+                [
+                    {
+                        "phone_number_id": number.id,
+                        "to_number": _NUMBER,
+                        "to_number_normalized": number.normalized_number,
+                        "from_number": "+15559990000",
+                        "message_body": f"Your code is {100000 + i}",
+                        "otp_code": str(100000 + i),
+                        "is_read": i % 2 == 0,
+                        "provider_message_sid": f"SMlist{i}",
+                        "raw_payload": payload,
+                        "received_at": now - timedelta(seconds=count - i),
+                    }
+                    for i in range(start, min(count, start + 1000))
+                ],
+            )
+        reconcile_number_stats(db, [number.id])
+        db.commit()
+        return number.id
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=20000, help="messages stored for the number")
+    parser.add_argument("--limit", type=int, default=200, help="rows per page")
+    parser.add_argument("--payload-bytes", type=int, default=2000, help="raw_payload size per message")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per step")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        number_id = _seed(args.seed, args.payload_bytes)
+        r = client.post("/auth/login", json={"username": "bench", "password": "bench-password"})
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        order = (Message.received_at.desc(), Message.id.desc())
+
+        def orm_load() -> list[MessageOut]:
+            with ReadSessionLocal() as db:
+                rows = db.scalars(
+                    select(Message).where(Message.phone_number_id == number_id).order_by(*order).limit(args.limit)
+                ).all()
+                out = []
+                for m in rows:
+                    visible = otp_is_visible(m.received_at)
+                    out.append(
+                        MessageOut(
+                            id=m.id,
+                            to_number=m.to_number,
+                            from_number=m.from_number,
+                            message_body=m.message_body,
+                            otp_code=m.otp_code if visible else None,
+                            otp_expired=not visible,
+                            is_read=m.is_read,
+                            received_at=m.received_at,
+                        )
+                    )
+                return out
+
+        query = select_message_out(otp_visibility_cutoff()).where(Message.phone_number_id == number_id)
+        query = query.order_by(*order).limit(args.limit)
+
+        def projection() -> list:
+            with ReadSessionLocal() as db:
+                return db.execute(query).mappings().all()
+
+        rows = projection()
+
+        def endpoint() -> None:
+            client.get(f"/messages/{_NUMBER}", params={"limit": args.limit}, headers=headers).raise_for_status()
+
+        steps = {
+            "orm load": _time(orm_load, args.repeat),
+            "projection": _time(projection, args.repeat),
+            "serialize": _time(lambda: _MESSAGES.dump_json(_MESSAGES.validate_python(rows)), args.repeat),
+            "endpoint": _time(endpoint, args.repeat),
+        }
+
+    print(f"{args.limit} of {args.seed} rows, {args.payload_bytes}-byte raw_payload")
+    print(f"{'step':<12} {'ms':>8} {'us/row':>8}")
+    for label, ms in steps.items():
+        print(f"{label:<12} {ms:>8.2f} {ms * 1000 / args.limit:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Time bulk password hashing with 1..N worker processes.
+
+Run from backend/:  python scripts/bench_password_hashing.py --count 96 --workers 1 2 4 8
+
+Each run hashes the same passwords through app.passwords.hash_passwords with
+PASSWORD_HASH_WORKERS set to the given count, in a fresh interpreter so the pool
+size takes effect. Throughput should scale with workers up to the number of cores.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+_CHILD = """
+import sys, time
+from app.passwords import hash_passwords, shutdown_hash_pool
+count = int(sys.argv[1])
+hash_passwords(["warm-up"] * 2)
+passwords = [f"password-{i}" for i in range(count)]
+started = time.perf_counter()
+hash_passwords(passwords)
+print(time.perf_counter() - started)
+shutdown_hash_pool()
+"""
+
+
+def _run(workers: int, count: int) -> float:
+    env = {**os.environ, "PASSWORD_HASH_WORKERS": str(workers)}
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(count)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=96, help="passwords per run")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="pool sizes to try")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2, 4, cpus})
+    print(f"{args.count} passwords, {cpus} CPU(s)")
+    print(f"{'workers':>8} {'seconds':>9} {'hashes/s':>9} {'speedup':>8}")
+    baseline = None
+    for w in workers:
+        seconds = _run(w, args.count)
+        baseline = baseline or seconds
+        print(f"{w:>8} {seconds:>9.2f} {args.count / seconds:>9.1f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare JSON serialization time and payload size for large list responses.
+
+Run from backend/:  python scripts/bench_serialization.py --messages 1000 --logs 2000
+
+Serializes the same rows three ways: per-row pydantic models through FastAPI's
+jsonable_encoder and the stdlib json module (the default response path), orjson
+on plain dicts, and the TypeAdapter validate + dump_json used by the list routes.
+Sizes are reported raw, gzipped, and brotli-compressed when brotli is installed.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas import AuditLogOut, MessageOut  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _messages(count: int) -> list[dict]:
+    start = datetime(2026, 1, 1)
+    return [
+        {
+            "id": i,
+            "to_number": "+15550001111",
+            "from_number": "+15559990000",
+            "message_body": f"Your verification code is {100000 + i}. It expires in 10 minutes.",
+            "otp_code": str(100000 + i),
+            "otp_expired": i % 3 == 0,
+            "is_read": i % 2 == 0,
+            "received_at": start + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def _logs(count: int) -> list[dict]:
+    start = datetime(2026, 1, 1)
+    return [
+        {
+            "id": i,
+            "user_id": i % 7 or None,
+            "action": "mark_read" if i % 2 else "login",
+            "timestamp": start + timedelta(seconds=i),
+            "meta_json": json.dumps({"message_id": i, "ip": "10.0.0.1"}),
+        }
+        for i in range(count)
+    ]
+
+
+def _time(fn, repeat: int) -> tuple[float, bytes]:
+    out = fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000, out
+
+
+def _bench(name: str, model: type, rows: list[dict], repeat: int) -> None:
+    adapter = TypeAdapter(list[model])
+    strategies = {
+        "models + json": lambda: json.dumps(jsonable_encoder([model(**r) for r in rows])).encode(),
+        "orjson dicts": lambda: orjson.dumps(rows),
+        "TypeAdapter": lambda: adapter.dump_json(adapter.validate_python(rows)),
+    }
+    print(f"\n{name}: {len(rows)} rows")
+    header = f"{'strategy':<15} {'ms':>8} {'us/row':>7} {'bytes':>9} {'gzip':>8}"
+    print(header + (f" {'br':>8}" if brotli else ""))
+    for label, fn in strategies.items():
+        ms, body = _time(fn, repeat)
+        line = f"{label:<15} {ms:>8.2f} {ms * 1000 / len(rows):>7.2f} {len(body):>9} {len(gzip.compress(body, 6)):>8}"
+        if brotli:
+            line += f" {len(brotli.compress(body, quality=4)):>8}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000, help="rows in the message list")
+    parser.add_argument("--logs", type=int, default=2000, help="rows in the audit log list")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per strategy")
+    args = parser.parse_args()
+
+    _bench("GET /messages/{number}", MessageOut, _messages(args.messages), args.repeat)
+    _bench("GET /logs", AuditLogOut, _logs(args.logs), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
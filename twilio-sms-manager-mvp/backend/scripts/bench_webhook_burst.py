@@ -0,0 +1,156 @@
+"""Load test: inbox read latency while the webhook takes a burst of inbound SMS.
+
+Run from backend/:  python scripts/bench_webhook_burst.py --rate 500 --seconds 5
+
+Starts the backend with uvicorn on a temporary SQLite database (or targets --url), then
+polls GET /inbox back to back, first on an idle server and then while POST /sms/webhook
+is hit at --rate requests per second. Ingest runs on its own thread pool, so inbox
+latency should stay close to the idle figures until the server runs out of CPU; past
+that point both routes slow down together. Webhook responses are counted by status;
+503s are admission control shedding load. The load generator needs CPU too: on a small
+host, point --url at a server on another machine to keep the two apart.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_NUMBER = "+15550002222"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _summary(latencies: list[float]) -> str:
+    if not latencies:
+        return "no samples"
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95)]
+    return (
+        f"{len(latencies):>6} {statistics.median(latencies):>8.1f} {p95:>8.1f} {latencies[-1]:>8.1f}"
+    )
+
+
+async def _poll_inbox(client: httpx.AsyncClient, headers: dict[str, str], seconds: float) -> list[float]:
+    latencies = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        r = await client.get("/inbox", headers=headers)
+        r.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def _burst(client: httpx.AsyncClient, rate: int, seconds: float) -> tuple[Counter, list[float]]:
+    statuses: Counter = Counter()
+    latencies: list[float] = []
+
+    async def send(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            r = await client.post(
+                "/sms/webhook",
+                data={"To": _NUMBER, "From": "+15559990000", "Body": f"Code {100000 + i}", "MessageSid": f"SMburst{i}"},
+            )
+            statuses[r.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    tasks = []
+    start = time.monotonic()
+    for i in range(int(rate * seconds)):
+        delay = start + i / rate - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(i)))
+    await asyncio.gather(*tasks)
+    return statuses, latencies
+
+
+async def _run(base_url: str, args: argparse.Namespace) -> None:
+    # Separate clients, so inbox polls never wait for a connection held by the burst.
+    limits = httpx.Limits(max_connections=args.connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as reader, httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=limits
+    ) as sender:
+        r = await reader.post("/auth/login", json={"username": args.username, "password": args.password})
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        await reader.post("/numbers", params={"twilio_number": _NUMBER}, json={}, headers=headers)
+
+        idle = await _poll_inbox(reader, headers, args.seconds)
+        (statuses, webhook), busy = await asyncio.gather(
+            _burst(sender, args.rate, args.seconds), _poll_inbox(reader, headers, args.seconds)
+        )
+        admission = (await reader.get("/sms/webhook/stats", headers=headers)).json()
+
+    print(f"webhook: {args.rate} req/s for {args.seconds:g}s -> {dict(statuses)}")
+    print(f"admission: {admission}")
+    print(f"{'':<16} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    print(f"{'inbox idle':<16} {_summary(idle)}")
+    print(f"{'inbox in burst':<16} {_summary(busy)}")
+    print(f"{'webhook':<16} {_summary(webhook)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=500, help="webhook requests per second")
+    parser.add_argument("--seconds", type=float, default=5, help="duration of each phase")
+    parser.add_argument("--connections", type=int, default=200, help="client connection limit")
+    parser.add_argument("--url", help="existing server to target instead of starting one")
+    parser.add_argument("--username", default="bench", help="admin login for --url")
+    parser.add_argument("--password", default="bench-password", help="admin password for --url")
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(_run(args.url.rstrip("/"), args))
+        return
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-burst-") as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "ADMIN_USERNAME": args.username,
+            "ADMIN_PASSWORD": args.password,
+            "JWT_SECRET": "bench-secret",
+            "ENFORCE_TWILIO_SIGNATURE": "false",
+            "BACKEND_WORKERS": "1",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=_BACKEND_DIR,
+            env=env,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            for _ in range(100):
+                try:
+                    if httpx.get(f"{base_url}/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            asyncio.run(_run(base_url, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+import socket
+import tempfile
+
+# app.config reads the environment at import time, so this runs before any app import.
+_data_dir = tempfile.mkdtemp(prefix="sms-manager-tests-")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+TWILIO_STUB_PORT = _free_port()
+
+os.environ.update(
+    {
+        "DATABASE_URL": f"sqlite:///{_data_dir}/app.db",
+        "ADMIN_USERNAME": "admin",
+        "ADMIN_PASSWORD": "admin-password",
+        "JWT_SECRET": "test-secret",
+        "ENFORCE_TWILIO_SIGNATURE": "false",
+        "BACKEND_WORKERS": "1",
+        "NUMBER_STATS_RECONCILE_SECONDS": "0",
+        "TWILIO_ACCOUNT_SID": "ACtest",
+        "TWILIO_AUTH_TOKEN": "test-token",
+        "TWILIO_API_BASE_URL": f"http://127.0.0.1:{TWILIO_STUB_PORT}",
+        "BACKFILL_PAGE_SIZE": "50",
+    }
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client) -> dict[str, str]:
+    r = client.post("/auth/login", json={"username": "admin", "password": "admin-password"})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
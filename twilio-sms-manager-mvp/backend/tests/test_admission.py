@@ -0,0 +1,72 @@
+"""Webhook admission control sheds bursts with a retryable status."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.admission import AdmissionController, Overloaded
+from app.config import INGEST_MAX_CONCURRENT, INGEST_WORKERS
+from app.main import app
+from app.routers import webhook
+
+
+def test_concurrency_never_exceeds_ingest_threads():
+    assert INGEST_MAX_CONCURRENT <= INGEST_WORKERS
+
+
+def test_sheds_when_queue_is_full():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout_seconds=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        assert (admission.in_flight, admission.waiting) == (1, 1)
+        with pytest.raises(Overloaded):
+            async with admission.admit():
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return admission.snapshot()
+
+    snap = asyncio.run(scenario())
+    assert (snap["admitted"], snap["queued"], snap["shed_queue_full"], snap["in_flight"]) == (2, 1, 1, 0)
+
+
+def test_sheds_when_queue_wait_times_out():
+    async def scenario():
+        admission = AdmissionController(max_concurrent=1, max_queue=10, queue_timeout_seconds=0.05)
+        async with admission.admit():
+            with pytest.raises(Overloaded):
+                async with admission.admit():
+                    pass
+        return admission.snapshot()
+
+    snap = asyncio.run(scenario())
+    assert (snap["shed_timeout"], snap["waiting"], snap["in_flight"]) == (1, 0, 0)
+
+
+def test_webhook_returns_503_with_retry_after_when_saturated(client, monkeypatch):
+    saturated = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout_seconds=1)
+    monkeypatch.setattr(webhook, "ingest_admission", saturated)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+            async with saturated.admit():
+                return await c.post(
+                    "/sms/webhook",
+                    data={"To": "+15550006001", "From": "+1999", "Body": "hi", "MessageSid": "SMshed1"},
+                )
+
+    r = asyncio.run(scenario())
+    assert r.status_code == 503
+    assert int(r.headers["Retry-After"]) >= 1
+    assert saturated.snapshot()["shed_queue_full"] == 1
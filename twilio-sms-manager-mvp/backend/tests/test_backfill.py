@@ -0,0 +1,176 @@
+"""Backfill against a local stand-in for the Twilio Messages list API (TWILIO_API_BASE_URL)."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.models import Message
+from conftest import TWILIO_STUB_PORT
+
+
+NUMBER_A = "+15550007001"
+NUMBER_B = "+15550007002"
+HISTORY = {NUMBER_A: 230, NUMBER_B: 120}
+
+
+class _Stub:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str, int]] = []
+        self.throttle_next = True
+        self.fail_pages: set[tuple[str, int]] = set()
+
+
+stub = _Stub()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        to, page, size = q["To"], int(q.get("Page", 0)), int(q["PageSize"])
+        with stub.lock:
+            if stub.throttle_next:
+                stub.throttle_next = False
+                return self._send(429, {"code": 20429}, {"Retry-After": "0"})
+            if (to, page) in stub.fail_pages:
+                return self._send(400, {"code": 20005, "message": "stub failure"})
+            stub.requests.append((to, page))
+
+        start, total = page * size, HISTORY.get(to, 0)
+        messages = [
+            {
+                "sid": f"SM{to[-4:]}{i:06d}",
+                "to": to,
+                "from": "+15559990000",
+                "body": f"Your code is {100000 + i}",
+                # Every tenth message is outbound and must not be imported.
+                "direction": "outbound-api" if i % 10 == 0 else "inbound",
+                "date_sent": format_datetime(datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)),
+            }
+            for i in range(start, min(total, start + size))
+        ]
+        next_page_uri = None
+        if start + size < total:
+            next_page_uri = f"{url.path}?{urlencode({'To': to, 'PageSize': size, 'Page': page + 1})}"
+        self._send(200, {"messages": messages, "next_page_uri": next_page_uri, "page": page, "page_size": size})
+
+
+def _inbound(total: int) -> int:
+    return sum(1 for i in range(total) if i % 10)
+
+
+@pytest.fixture(scope="module")
+def twilio_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", TWILIO_STUB_PORT), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def number_ids(client, admin_headers) -> dict[str, int]:
+    ids = {}
+    for number in HISTORY:
+        r = client.post("/numbers", params={"twilio_number": number}, json={}, headers=admin_headers)
+        assert r.status_code == 200, r.text
+        ids[number] = r.json()["id"]
+    return ids
+
+
+def _run(client, admin_headers, **payload) -> dict[str, dict]:
+    r = client.post("/backfill", json=payload, headers=admin_headers)
+    assert r.status_code == 202, r.text
+    deadline = time.monotonic() + 30
+    while True:
+        progress = client.get("/backfill", headers=admin_headers).json()
+        if not progress["running"]:
+            return {n["twilio_number"]: n for n in progress["numbers"]}
+        assert time.monotonic() < deadline, "backfill did not finish"
+        time.sleep(0.05)
+
+
+def _stored(number_id: int) -> tuple[int, int]:
+    with SessionLocal() as db:
+        return db.execute(
+            select(func.count(), func.count(func.distinct(Message.provider_message_sid))).where(
+                Message.phone_number_id == number_id
+            )
+        ).one()
+
+
+def test_backfill_pages_resumes_after_error_and_restarts_without_duplicates(
+    client, admin_headers, twilio_stub, number_ids
+):
+    ids = [number_ids[NUMBER_A], number_ids[NUMBER_B]]
+    r = client.post(
+        "/sms/webhook", data={"To": NUMBER_A, "From": "+15559990001", "Body": "live 424242", "MessageSid": "SMlive1"}
+    )
+    assert r.status_code == 200, r.text
+    live_id = client.get(f"/messages/{NUMBER_A}", headers=admin_headers).json()[0]["id"]
+
+    # First run: A pages through completely (after one 429 retry); B fails on its second page.
+    twilio_stub.fail_pages = {(NUMBER_B, 1)}
+    status = _run(client, admin_headers, number_ids=ids)
+
+    assert not twilio_stub.throttle_next
+    a, b = status[NUMBER_A], status[NUMBER_B]
+    assert (a["status"], a["pages"], a["fetched"], a["inserted"]) == ("done", 5, 230, _inbound(230))
+    assert b["status"] == "error" and "400" in b["error"]
+    assert (b["pages"], b["fetched"], b["inserted"]) == (1, 50, _inbound(50))
+    assert _stored(number_ids[NUMBER_A]) == (_inbound(230) + 1, _inbound(230) + 1)
+    assert _stored(number_ids[NUMBER_B]) == (_inbound(50), _inbound(50))
+    # Counters follow each committed page, even for the number that then failed.
+    stats = {n["twilio_number"]: n["stats"] for n in client.get("/numbers", headers=admin_headers).json()}
+    assert stats[NUMBER_B]["total_count"] == _inbound(50)
+
+    # History has new ids but old timestamps: it is neither the latest message nor a delta.
+    inbox = {n["twilio_number"]: n for n in client.get("/inbox", headers=admin_headers).json()["numbers"]}
+    assert inbox[NUMBER_A]["latest_message"]["id"] == live_id
+    r = client.get(f"/messages/{NUMBER_A}", params={"since_id": live_id}, headers=admin_headers)
+    assert r.status_code == 200 and r.json() == []
+
+    # Resume: only B is queued, and it continues from the failed page instead of page 0.
+    twilio_stub.fail_pages = set()
+    twilio_stub.requests.clear()
+    status = _run(client, admin_headers, number_ids=ids)
+
+    b = status[NUMBER_B]
+    assert (b["status"], b["pages"], b["fetched"], b["inserted"], b["error"]) == ("done", 3, 120, _inbound(120), None)
+    assert sorted(twilio_stub.requests) == [(NUMBER_B, 1), (NUMBER_B, 2)]
+    assert _stored(number_ids[NUMBER_B]) == (_inbound(120), _inbound(120))
+
+    # Restart: everything is paged again from the top, but nothing is inserted twice.
+    twilio_stub.requests.clear()
+    status = _run(client, admin_headers, number_ids=ids, restart=True)
+
+    for number, total in HISTORY.items():
+        s = status[number]
+        assert (s["status"], s["fetched"], s["inserted"]) == ("done", total, 0)
+        live = 1 if number == NUMBER_A else 0
+        assert _stored(number_ids[number]) == (_inbound(total) + live, _inbound(total) + live)
+    assert len(twilio_stub.requests) == 5 + 3
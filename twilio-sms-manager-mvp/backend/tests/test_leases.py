@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app import backfill
+from app.database import SessionLocal
+from app.leases import acquire_lease, lease_held, release_lease
+from app.models import JobLease
+
+
+def _held_by(name: str, owner: str, expires_in: timedelta) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(JobLease).where(JobLease.name == name).values(owner=owner, expires_at=datetime.utcnow() + expires_in)
+        )
+        db.commit()
+
+
+def test_lease_is_exclusive_until_released_or_expired():
+    assert acquire_lease("test_job")
+    assert acquire_lease("test_job"), "the holder renews its own lease"
+
+    _held_by("test_job", "other-worker", timedelta(minutes=1))
+    assert not acquire_lease("test_job")
+    assert lease_held("test_job")
+    release_lease("test_job")
+    assert lease_held("test_job"), "only the holder can release"
+
+    _held_by("test_job", "other-worker", timedelta(seconds=-1))
+    assert not lease_held("test_job")
+    assert acquire_lease("test_job"), "an expired lease can be taken over"
+    release_lease("test_job")
+    assert not lease_held("test_job")
+
+
+def test_backfill_running_in_another_worker_blocks_start(client, admin_headers):
+    assert acquire_lease(backfill._LEASE)  # creates the row
+    release_lease(backfill._LEASE)
+    _held_by(backfill._LEASE, "other-worker", timedelta(minutes=1))
+    try:
+        assert client.get("/backfill", headers=admin_headers).json()["running"] is True
+        r = client.post("/backfill", json={}, headers=admin_headers)
+        assert r.status_code == 409, r.text
+    finally:
+        _held_by(backfill._LEASE, "other-worker", timedelta(seconds=-1))
+    assert client.get("/backfill", headers=admin_headers).json()["running"] is False
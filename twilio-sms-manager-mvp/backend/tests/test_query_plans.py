@@ -0,0 +1,85 @@
+"""The hot-path queries must be served by the composite indexes from revision 0003."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import engine
+from app.models import Message, PhoneNumber
+from app.routers.dashboard import _stats_query
+from app.routers.inbox import latest_message_ids
+from app.routers.messages import select_message_out
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _messages(client, admin_headers):
+    # A few numbers with some history, so the planner has real choices to make.
+    for n in range(3):
+        number = f"+1555000900{n}"
+        r = client.post("/numbers", params={"twilio_number": number}, json={}, headers=admin_headers)
+        assert r.status_code == 200, r.text
+        for i in range(20):
+            r = client.post(
+                "/sms/webhook",
+                data={"To": number, "From": "+1999", "Body": f"code {100000 + i}", "MessageSid": f"SMqp{n}{i}"},
+            )
+            assert r.status_code == 200, r.text
+
+
+def _plan(stmt) -> str:
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(
+        v.isoformat(" ") if isinstance(v, datetime) else v
+        for v in (compiled.params[name] for name in compiled.positiontup)
+    )
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_message_list_uses_number_received_index():
+    cutoff = datetime.utcnow() - timedelta(minutes=10)
+    plan = _plan(
+        select_message_out(cutoff)
+        .where(Message.phone_number_id == 1)
+        .order_by(Message.received_at.desc(), Message.id.desc())
+        .limit(200)
+    )
+    assert "USING INDEX ix_messages_number_received" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_inbox_latest_message_per_number_uses_number_index():
+    plan = _plan(latest_message_ids(select(PhoneNumber.id)))
+    assert "INDEX ix_messages_number_received (phone_number_id=?)" in plan
+    assert "SCAN messages" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_unread_count_uses_number_unread_index():
+    plan = _plan(select(func.count()).where(Message.phone_number_id == 1, Message.is_read.is_(False)))
+    assert "USING COVERING INDEX ix_messages_number_unread" in plan
+
+
+def test_visible_otp_window_uses_number_received_index():
+    cutoff = datetime.utcnow() - timedelta(minutes=10)
+    plan = _plan(
+        select(func.count()).where(
+            Message.phone_number_id == 1, Message.received_at >= cutoff, Message.otp_code.is_not(None)
+        )
+    )
+    assert "USING INDEX ix_messages_number_received (phone_number_id=? AND received_at>?)" in plan
+
+
+def test_message_sid_lookup_uses_unique_index():
+    plan = _plan(select(Message.id).where(Message.provider_message_sid == "SMqp00"))
+    assert "ix_messages_provider_message_sid" in plan
+
+
+@pytest.mark.parametrize("is_admin", [True, False])
+def test_dashboard_stats_never_scans_messages(is_admin):
+    plan = _plan(_stats_query(user_id=1, is_admin=is_admin))
+    assert "SCAN messages" not in plan
+    assert "SEARCH messages USING" in plan
@@ -1,38 +1,225 @@
 from __future__ import annotations
 
+import atexit
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 import streamlit as st
 
 API_BASE_URL = (os.getenv("API_BASE_URL") or "http://127.0.0.1:8000").strip().rstrip("/")
 
+
+def _env_float(name: str, default: float) -> float:
+    v = (os.getenv(name) or "").strip()
+    try:
+        return float(v) if v else default
+    except ValueError:
+        return default
+
+
+API_TIMEOUT_SECONDS = _env_float("API_TIMEOUT_SECONDS", 20)
+API_CONNECT_TIMEOUT_SECONDS = _env_float("API_CONNECT_TIMEOUT_SECONDS", 5)
+API_MAX_CONNECTIONS = int(_env_float("API_MAX_CONNECTIONS", 20))
+API_MAX_KEEPALIVE_CONNECTIONS = int(_env_float("API_MAX_KEEPALIVE_CONNECTIONS", 10))
+API_MAX_RETRIES = int(_env_float("API_MAX_RETRIES", 2))
+API_RETRY_BACKOFF_SECONDS = _env_float("API_RETRY_BACKOFF_SECONDS", 0.2)
+API_HTTP2 = (os.getenv("API_HTTP2") or "").strip().lower() in {"1", "true", "yes", "y"}
+API_ETAG_CACHE_SIZE = int(_env_float("API_ETAG_CACHE_SIZE", 32))
+
+_IDEMPOTENT_METHODS = {"GET", "PUT"}
+_RETRY_STATUS_CODES = {502, 503, 504}
+_PHONE_SEGMENT = re.compile(r"(?:\+|%2B)?[\d ().-]{7,}", re.IGNORECASE)
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_fanout = ThreadPoolExecutor(max_workers=8, thread_name_prefix="api-get")
+_metrics: dict[str, dict[str, float]] = {}
+_metrics_lock = threading.Lock()
+
+
+def _accept_encoding() -> str:
+    # httpx decodes gzip itself and br when a brotli package is installed.
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        return "br, gzip"
+    return "gzip"
+
+
+def _shared_client() -> httpx.Client:
+    """Process-wide keep-alive client; auth headers are passed per request, never stored on it."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http2 = API_HTTP2
+                if http2:
+                    try:
+                        import h2  # noqa: F401
+                    except ImportError:
+                        http2 = False
+                _client = httpx.Client(
+                    base_url=API_BASE_URL,
+                    http2=http2,
+                    headers={"Accept-Encoding": _accept_encoding()},
+                    timeout=httpx.Timeout(API_TIMEOUT_SECONDS, connect=API_CONNECT_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(
+                        max_connections=API_MAX_CONNECTIONS,
+                        max_keepalive_connections=API_MAX_KEEPALIVE_CONNECTIONS,
+                    ),
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+def _route_template(path: str) -> str:
+    """'/messages/+15550001234' -> '/messages/{number}', '/messages/42/read' -> '/messages/{id}/read'."""
+    segments = path.split("?", 1)[0].split("/")
+    for i, segment in enumerate(segments):
+        if _PHONE_SEGMENT.fullmatch(segment):
+            segments[i] = "{number}"
+        elif segment.isdigit():
+            segments[i] = "{id}"
+    return "/".join(segments)
+
+
+def _record(method: str, path: str, elapsed: float, failed: bool) -> None:
+    # Keyed by route so the table stays one row per endpoint however many numbers are opened.
+    key = f"{method} {_route_template(path)}"
+    with _metrics_lock:
+        m = _metrics.setdefault(key, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        ms = elapsed * 1000
+        m["count"] += 1
+        m["errors"] += 1 if failed else 0
+        m["total_ms"] += ms
+        m["max_ms"] = max(m["max_ms"], ms)
+
+
+def api_metrics() -> dict[str, dict[str, float]]:
+    """Per-route request latency for this process (count, errors, avg_ms, max_ms)."""
+    with _metrics_lock:
+        return {
+            key: {
+                "count": m["count"],
+                "errors": m["errors"],
+                "avg_ms": round(m["total_ms"] / m["count"], 2) if m["count"] else 0.0,
+                "max_ms": round(m["max_ms"], 2),
+            }
+            for key, m in _metrics.items()
+        }
+
+
+def _request(method: str, path: str, **kwargs) -> httpx.Response:
+    attempts = 1 + (max(0, API_MAX_RETRIES) if method in _IDEMPOTENT_METHODS else 0)
+    for attempt in range(attempts):
+        start = time.perf_counter()
+        try:
+            r = _shared_client().request(method, path, **kwargs)
+        except httpx.TransportError:
+            _record(method, path, time.perf_counter() - start, failed=True)
+            if attempt + 1 >= attempts:
+                raise
+        else:
+            retryable = r.status_code in _RETRY_STATUS_CODES
+            _record(method, path, time.perf_counter() - start, failed=r.status_code >= 500)
+            if not retryable or attempt + 1 >= attempts:
+                return r
+        time.sleep(API_RETRY_BACKOFF_SECONDS * (2**attempt))
+    raise RuntimeError("unreachable")
+
+
 def _auth_headers() -> dict[str, str]:
     token = st.session_state.get("access_token")
     if not token:
         return {}
     return {"Authorization": f"Bearer {token}"}
 
-def api_post(path: str, json_data: dict):
-    with httpx.Client(timeout=20) as client:
-        r = client.post(f"{API_BASE_URL}{path}", json=json_data, headers=_auth_headers())
-        r.raise_for_status()
-        return r.json()
+def api_post(path: str, json_data: dict, timeout_seconds: float | None = None):
+    kwargs = {}
+    if timeout_seconds is not None:
+        kwargs["timeout"] = httpx.Timeout(timeout_seconds, connect=API_CONNECT_TIMEOUT_SECONDS)
+    r = _request("POST", path, json=json_data, headers=_auth_headers(), **kwargs)
+    r.raise_for_status()
+    return r.json()
+
+def _conditional_get(path: str, params: dict | None, headers: dict[str, str], cached: tuple | None):
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+    r = _request("GET", path, headers=headers, params=params)
+    if r.status_code == 304 and cached is not None:
+        return cached[1], None
+    r.raise_for_status()
+    return r.json(), r.headers.get("ETag")
 
 def api_get(path: str, params: dict | None = None):
-    with httpx.Client(timeout=20) as client:
-        r = client.get(f"{API_BASE_URL}{path}", headers=_auth_headers(), params=params)
-        r.raise_for_status()
-        return r.json()
+    return api_get_many([(path, params)])[0]
+
+def api_get_many(requests: list[tuple[str, dict | None]], return_exceptions: bool = False) -> list:
+    """Issue several GETs concurrently; results come back in request order.
+
+    With return_exceptions, a failed request yields its exception in place of a result
+    instead of raising, so the other results are kept.
+    Session state is only touched on the calling (script) thread.
+    """
+    etag_cache = st.session_state.setdefault("api_etag_cache", {})
+    headers = _auth_headers()
+    keys = [(path, tuple(sorted((params or {}).items()))) for path, params in requests]
+
+    if len(requests) == 1:
+        path, params = requests[0]
+        futures = None
+    else:
+        futures = [
+            _fanout.submit(_conditional_get, path, params, headers, etag_cache.get(key))
+            for (path, params), key in zip(requests, keys)
+        ]
+
+    outcomes = []
+    for i, key in enumerate(keys):
+        try:
+            if futures is None:
+                outcomes.append(_conditional_get(path, params, headers, etag_cache.get(key)))
+            else:
+                outcomes.append(futures[i].result())
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            outcomes.append((e, None))
+
+    results = []
+    for key, (data, etag) in zip(keys, outcomes):
+        if etag:
+            # Most recently used last; the oldest entries go once the cache is full.
+            etag_cache.pop(key, None)
+            etag_cache[key] = (etag, data)
+            while len(etag_cache) > max(1, API_ETAG_CACHE_SIZE):
+                del etag_cache[next(iter(etag_cache))]
+        elif key in etag_cache:
+            etag_cache[key] = etag_cache.pop(key)
+        results.append(data)
+    return results
+
+def api_long_poll(path: str, params: dict | None, wait_seconds: float):
+    """GET that the server may hold for up to `wait_seconds`; returns None on 204."""
+    timeout = httpx.Timeout(wait_seconds + API_TIMEOUT_SECONDS, connect=API_CONNECT_TIMEOUT_SECONDS)
+    r = _request("GET", path, headers=_auth_headers(), params=params, timeout=timeout)
+    if r.status_code == 204:
+        return None
+    r.raise_for_status()
+    return r.json()
 
 def api_patch(path: str, json_data: dict):
-    with httpx.Client(timeout=20) as client:
-        r = client.patch(f"{API_BASE_URL}{path}", headers=_auth_headers(), json=json_data)
-        r.raise_for_status()
-        return r.json()
+    r = _request("PATCH", path, headers=_auth_headers(), json=json_data)
+    r.raise_for_status()
+    return r.json()
 
 def api_put(path: str, json_data: dict):
-    with httpx.Client(timeout=20) as client:
-        r = client.put(f"{API_BASE_URL}{path}", headers=_auth_headers(), json=json_data)
-        r.raise_for_status()
-        return r.json()
+    r = _request("PUT", path, headers=_auth_headers(), json=json_data)
+    r.raise_for_status()
+    return r.json()
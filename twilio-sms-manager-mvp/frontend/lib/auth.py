@@ -90,4 +90,5 @@ def sidebar() -> None:
         if st.button("Sign out"):
             st.session_state.pop("access_token", None)
             st.session_state.pop("user", None)
+            st.session_state.pop("api_etag_cache", None)
             st.rerun()
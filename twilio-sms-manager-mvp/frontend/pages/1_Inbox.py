@@ -3,7 +3,7 @@ from __future__ import annotations
 import pandas as pd
 import streamlit as st
 
-from lib.api_client import api_get, api_patch
+from lib.api_client import api_get, api_get_many, api_long_poll, api_patch
 from lib.auth import require_login, sidebar
 
 try:
@@ -18,7 +18,6 @@ sidebar()
 
 st.title("📩 Message Inbox")
 
-st.session_state.setdefault("selected_number", None)
 st.session_state.setdefault("selected_msg_id", None)
 
 with st.sidebar:
@@ -36,31 +35,94 @@ with top_left:
 with top_right:
     st.caption("Updates automatically; use Refresh now if you just received an SMS.")
 
+ALL_NUMBERS = "__all__"
+MESSAGE_LIMIT = 100
+OTP_WAIT_SECONDS = 25
+
+# The selection from the previous run is known up front, so the number list and that
+# number's messages are fetched concurrently instead of one after the other.
+previous = st.session_state.get("selected_number")
+msgs = None
 try:
-    numbers = api_get("/numbers")
+    if previous == ALL_NUMBERS:
+        inbox = api_get("/inbox", params={"feed_limit": MESSAGE_LIMIT})
+        msgs = inbox["feed"]
+    elif previous:
+        inbox, msgs = api_get_many(
+            [("/inbox", None), (f"/messages/{previous}", {"limit": MESSAGE_LIMIT})], return_exceptions=True
+        )
+        if isinstance(inbox, Exception):
+            raise inbox
+        if isinstance(msgs, Exception):
+            # e.g. 403 after the number was reassigned: keep the inbox, pick another number.
+            st.warning(f"Could not load messages for {previous}: {msgs}")
+            st.session_state.pop("selected_number", None)
+            previous = None
+            msgs = None
+    else:
+        inbox = api_get("/inbox")
 except Exception as e:
-    st.error(f"Failed to load numbers: {e}")
-    numbers = []
+    st.error(f"Failed to load inbox: {e}")
+    inbox = {"numbers": []}
+    msgs = None
+
+numbers = inbox["numbers"]
 
 if not numbers:
     st.info("You have no phone numbers assigned to you.")
     st.stop()
 
+number_labels = {ALL_NUMBERS: "All my numbers"}
+for n in numbers:
+    unread = int(n.get("unread_count") or 0)
+    number_labels[n["twilio_number"]] = f"{n['twilio_number']} ({n.get('label') or 'No label'})" + (
+        f" · {unread} unread" if unread else ""
+    )
+
+if previous not in number_labels:
+    st.session_state.pop("selected_number", None)
+    msgs = None
+
 selected_number = st.selectbox(
     "Select a phone number to view its inbox:",
-    options=[n["twilio_number"] for n in numbers],
-    format_func=lambda s: f"{s} ({next((n.get('label') for n in numbers if n['twilio_number'] == s), 'No label')})",
+    options=list(number_labels),
+    index=1,
+    format_func=number_labels.__getitem__,
     key="selected_number",
 )
 
 st.divider()
 
 if selected_number:
-    try:
-        msgs = api_get(f"/messages/{selected_number}", params={"limit": 100})
-    except Exception as e:
-        st.error(f"Failed to load messages: {e}")
-        msgs = []
+    if msgs is None:
+        try:
+            if selected_number == ALL_NUMBERS:
+                msgs = api_get("/inbox", params={"feed_limit": MESSAGE_LIMIT})["feed"]
+            else:
+                msgs = api_get(f"/messages/{selected_number}", params={"limit": MESSAGE_LIMIT})
+        except Exception as e:
+            st.error(f"Failed to load messages: {e}")
+            msgs = []
+
+    if selected_number != ALL_NUMBERS and st.button("⏳ Wait for next code"):
+        after_id = max((m["id"] for m in msgs), default=0)
+        with st.spinner(f"Waiting up to {OTP_WAIT_SECONDS} seconds for a new code..."):
+            try:
+                new_otp = api_long_poll(
+                    f"/messages/{selected_number}/next-otp",
+                    {"after_id": after_id, "timeout": OTP_WAIT_SECONDS},
+                    OTP_WAIT_SECONDS,
+                )
+            except Exception as e:
+                st.error(f"Failed while waiting for a code: {e}")
+                new_otp = None
+            else:
+                if new_otp is None:
+                    st.info("No new code arrived yet. Try again.")
+        if new_otp and new_otp.get("otp_code"):
+            st.success(f"New code from {new_otp.get('from_number') or '-'}")
+            st.code(new_otp["otp_code"], language="text")
+            msgs = [new_otp] + [m for m in msgs if m["id"] != new_otp["id"]]
 
     if not msgs:
         st.info("No messages found for this number.")
@@ -70,11 +132,16 @@ if selected_number:
 
     with left:
         st.subheader("Messages")
-        msg_ids = [m["id"] for m in msgs]
+        msgs_by_id = {m["id"]: m for m in msgs}
+        msg_labels = {
+            m["id"]: f"From: {m.get('from_number') or '-'} @ {pd.to_datetime(m.get('received_at')).strftime('%Y-%m-%d %H:%M')}"
+            + (f" → {m.get('to_number')}" if selected_number == ALL_NUMBERS else "")
+            for m in msgs
+        }
         selected_msg_id = st.radio(
             "Select a message to view",
-            msg_ids,
-            format_func=lambda mid: f"From: {next((m.get('from_number') for m in msgs if m['id'] == mid), '-')} @ {pd.to_datetime(next(m.get('received_at') for m in msgs if m['id'] == mid)).strftime('%Y-%m-%d %H:%M')}",
+            list(msg_labels),
+            format_func=msg_labels.__getitem__,
             label_visibility="collapsed",
             key="selected_msg_id",
         )
@@ -82,7 +149,7 @@ if selected_number:
     with right:
         st.subheader("Message Details")
         if selected_msg_id:
-            msg = next((m for m in msgs if m["id"] == selected_msg_id), None)
+            msg = msgs_by_id.get(selected_msg_id)
             if msg:
                 otp = msg.get("otp_code")
                 otp_expired = bool(msg.get("otp_expired"))
@@ -3,7 +3,7 @@ from __future__ import annotations
 import pandas as pd
 import streamlit as st
 
-from lib.api_client import api_get, api_post, api_put
+from lib.api_client import api_get_many, api_post, api_put
 from lib.auth import require_login, sidebar
 
 st.set_page_config(page_title="Manage Numbers - SMS Manager", page_icon="📱", layout="wide")
@@ -15,8 +15,7 @@ st.title("📱 Manage Phone Numbers")
 st.caption("Here you can add new Twilio numbers and assign them to users.")
 
 try:
-    numbers = api_get("/numbers")
-    users = api_get("/users")
+    numbers, users = api_get_many([("/numbers", None), ("/users", None)])
 except Exception as e:
     st.error(f"Failed to load data: {e}")
     numbers = []
@@ -55,7 +54,14 @@ if not numbers:
 else:
     df = pd.DataFrame(numbers)
     df["assigned_user"] = df["assigned_user_id"].apply(lambda x: next((u['username'] for u in users if u['id'] == x), "-") if x else "-")
-    st.dataframe(df[["twilio_number", "label", "status", "assigned_user"]], use_container_width=True, hide_index=True)
+    df["unread"] = [(n.get("stats") or {}).get("unread_count", 0) for n in numbers]
+    df["total"] = [(n.get("stats") or {}).get("total_count", 0) for n in numbers]
+    df["last_received_at"] = [(n.get("stats") or {}).get("last_received_at") for n in numbers]
+    st.dataframe(
+        df[["twilio_number", "label", "status", "assigned_user", "unread", "total", "last_received_at"]],
+        use_container_width=True,
+        hide_index=True,
+    )
 
     st.subheader("Edit a Number")
     number_to_edit = st.selectbox("Select a number to edit", options=[n['id'] for n in numbers], format_func=lambda x: next((n['twilio_number'] for n in numbers if n['id'] == x), "-"))
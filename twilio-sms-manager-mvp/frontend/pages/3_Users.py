@@ -28,13 +28,41 @@ with st.expander("➕ Create a New User", expanded=False):
                 try:
                     api_post(
                         "/users",
-                        json={"username": username, "password": password, "role": role},
+                        {"username": username, "password": password, "role": role},
                     )
                     st.success(f"User '{username}' created successfully!")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Failed to create user: {e}")
 
+with st.expander("📥 Bulk Create Users", expanded=False):
+    st.caption("Upload a CSV with a header row: username,password[,role]. Role defaults to user.")
+    upload = st.file_uploader("Users CSV", type=["csv"], key="bulk_users_csv")
+    if upload is not None:
+        bulk = pd.read_csv(upload, dtype=str, keep_default_na=False)
+        bulk.columns = [str(c).strip().lower() for c in bulk.columns]
+        missing = {"username", "password"} - set(bulk.columns)
+        if missing:
+            st.error(f"Missing column(s): {', '.join(sorted(missing))}")
+        else:
+            if "role" not in bulk.columns:
+                bulk["role"] = "user"
+            st.write(f"{len(bulk)} row(s)")
+            st.dataframe(bulk[["username", "role"]], use_container_width=True, hide_index=True)
+            if st.button("Create users", type="primary", key="bulk_users_submit"):
+                rows = bulk[["username", "password", "role"]].to_dict(orient="records")
+                try:
+                    with st.spinner(f"Creating {len(rows)} users..."):
+                        # Hashing is CPU-bound on the server; allow for large batches.
+                        result = api_post("/users/bulk", {"users": rows}, timeout_seconds=max(60.0, len(rows) * 0.5))
+                except Exception as e:
+                    st.error(f"Bulk create failed: {e}")
+                else:
+                    st.success(f"Created {result['created']} user(s); skipped {result['skipped']}.")
+                    skipped = [r for r in result["results"] if r["status"] != "created"]
+                    if skipped:
+                        st.dataframe(pd.DataFrame(skipped), use_container_width=True, hide_index=True)
+
 st.divider()
 
 st.subheader("Existing Users")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from datetime import date, datetime, time, timedelta
+
 import pandas as pd
 import streamlit as st
 
-from lib.api_client import api_get
+from lib.api_client import api_get_many, api_metrics
 from lib.auth import require_login, sidebar
 
 st.set_page_config(page_title="Audit Logs - SMS Manager", page_icon="📜", layout="wide")
@@ -14,13 +16,86 @@ sidebar()
 st.title("📜 Audit Logs")
 st.caption("A record of all actions taken within the system.")
 
+PAGE_SIZE = 100
+ALL = "__all__"
+
+today = date.today()
+f1, f2, f3 = st.columns([2, 1, 1])
+with f1:
+    window = st.date_input("Date range", value=(today - timedelta(days=7), today), max_value=today)
+start_day, end_day = (window[0], window[-1]) if isinstance(window, (tuple, list)) and window else (today, today)
+window_params = {
+    "since": datetime.combine(start_day, time.min).isoformat(),
+    "until": datetime.combine(end_day + timedelta(days=1), time.min).isoformat(),
+}
+
 try:
-    logs = api_get("/logs", params={"limit": 500})
-    if not logs:
-        st.info("No log entries found.")
-    else:
-        df = pd.DataFrame(logs)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        st.dataframe(df, use_container_width=True, hide_index=True)
+    summary, users = api_get_many([("/logs/summary", window_params), ("/users", None)])
 except Exception as e:
     st.error(f"Failed to load audit logs: {e}")
+    st.stop()
+
+user_labels = {ALL: "All users"}
+user_labels.update({u["id"]: u["username"] for u in users})
+with f3:
+    user_choice = st.selectbox("User", list(user_labels), format_func=user_labels.__getitem__)
+
+action_labels = {ALL: "All actions"}
+action_labels.update({row["action"]: f"{row['action']} ({row['count']})" for row in summary})
+with f2:
+    action_choice = st.selectbox("Action", list(action_labels), format_func=action_labels.__getitem__)
+
+if summary:
+    top = summary[:6]
+    for col, row in zip(st.columns(len(top)), top):
+        col.metric(row["action"], row["count"])
+
+params = dict(window_params, limit=PAGE_SIZE)
+if action_choice != ALL:
+    params["action"] = action_choice
+if user_choice != ALL:
+    params["user_id"] = user_choice
+
+# Pages are walked with a keyset cursor (the last id of the previous page); the stack
+# of cursors lets "Newer" go back without re-reading everything from the top.
+filter_key = tuple(sorted(params.items()))
+if st.session_state.get("logs_filter_key") != filter_key:
+    st.session_state["logs_filter_key"] = filter_key
+    st.session_state["logs_cursors"] = []
+cursors: list[int] = st.session_state["logs_cursors"]
+if cursors:
+    params["before"] = cursors[-1]
+
+try:
+    (logs,) = api_get_many([("/logs", params)])
+except Exception as e:
+    st.error(f"Failed to load audit logs: {e}")
+    logs = []
+
+if not logs:
+    st.info("No log entries found.")
+else:
+    st.dataframe(pd.DataFrame(logs), use_container_width=True, hide_index=True)
+
+nav_newer, nav_page, nav_older = st.columns([1, 2, 1])
+with nav_newer:
+    if st.button("← Newer", disabled=not cursors):
+        cursors.pop()
+        st.rerun()
+with nav_page:
+    st.caption(f"Page {len(cursors) + 1}")
+with nav_older:
+    if st.button("Older →", disabled=len(logs) < PAGE_SIZE):
+        cursors.append(logs[-1]["id"])
+        st.rerun()
+
+with st.expander("API client latency (this Streamlit process)", expanded=False):
+    metrics = api_metrics()
+    if metrics:
+        st.dataframe(
+            pd.DataFrame.from_dict(metrics, orient="index").rename_axis("request").reset_index(),
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.caption("No API calls recorded yet.")